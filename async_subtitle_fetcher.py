@@ -0,0 +1,316 @@
+import asyncio
+import time
+from metadata_cache import default_metadata_cache
+from network import RetryPolicy
+from youtube_subtitle_fetcher import YouTubeSubtitleFetcher, SubtitleResult
+from caption_formats import DEFAULT_FORMAT_PREFERENCE, parse_captions
+from rate_limit import FAILED, THROTTLED, ThrottledError, status_outcome
+from video_ids import extract_video_id
+
+
+class AsyncYouTubeSubtitleFetcher:
+    """
+    YouTubeSubtitleFetcher'ın asyncio tabanlı karşılığı.
+
+    Özellikler:
+    - yt_dlp çıkarımını (bloklayan) bir executor üzerinde çalıştırır
+    - VTT dosyalarını tek bir paylaşılan, kalıcı bağlantılı (keep-alive)
+      aiohttp oturumu üzerinden indirir
+    - Aynı anda yapılan indirme sayısını sınırlar
+
+    Örnek:
+        async with AsyncYouTubeSubtitleFetcher() as fetcher:
+            fetcher.set_video_url(url)
+            languages = await fetcher.get_available_languages()
+            text = await fetcher.get_subtitle_text('tr')
+    """
+
+    def __init__(self, metadata_cache=default_metadata_cache, disk_cache=None,
+                 max_connections=100, timeout=10, executor=None, dedupe_auto_captions=True,
+                 retry_policy=None, metrics=None, captions_only=True,
+                 formats=DEFAULT_FORMAT_PREFERENCE, negative_cache=None, rate_limiter=None,
+                 download_limiter=None):
+        """
+        Args:
+            metadata_cache (MetadataCache): Altyazı tablosu önbelleği; None ise önbellek kullanılmaz
+            disk_cache (SubtitleDiskCache): Kalıcı altyazı önbelleği (read-through)
+            max_connections (int): Aynı anda açık olabilecek en fazla indirme sayısı
+            timeout (float): Tek bir VTT indirmesi için zaman aşımı (saniye)
+            executor (Executor): yt_dlp çıkarımı için executor; None ise döngünün varsayılanı
+            dedupe_auto_captions (bool): Otomatik altyazılardaki kayan tekrarları ayıklar
+            retry_policy (RetryPolicy): İndirme yeniden deneme politikası; None ise varsayılan politika
+            metrics (MetricsCollector): Aşama süreleri, önbellek ve hata ölçümleri; None ise kapalı
+            captions_only (bool): Altyazı tabloları hafif çıkarımla alınır; False ise tam çıkarım yapılır
+            formats (tuple): Tercih sırasına göre altyazı biçimleri (örn. ('json3', 'srv3', 'vtt'));
+                             varsayılan ('vtt',)
+            negative_cache (NegativeCache): Altyazısı olmayan / hata veren videoların önbelleği
+            rate_limiter (RateLimiter): yt_dlp çıkarımları için hız ve eşzamanlılık sınırlayıcısı
+            download_limiter (RateLimiter): Altyazı indirmeleri için sınırlayıcı; None ise yalnızca
+                                            `max_connections` sınırı uygulanır
+        """
+        self.video_url = None
+        self.video_id = None
+        self.available_languages = {}
+        self.metadata_cache = metadata_cache
+        self.disk_cache = disk_cache
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.executor = executor
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.metrics = metrics
+        self.captions_only = captions_only
+        self.negative_cache = negative_cache
+        self.rate_limiter = rate_limiter
+        self.download_limiter = download_limiter
+        self._fetcher = YouTubeSubtitleFetcher(metadata_cache, disk_cache, dedupe_auto_captions,
+                                               metrics=metrics, captions_only=captions_only,
+                                               formats=formats, negative_cache=negative_cache,
+                                               rate_limiter=rate_limiter)
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Paylaşılan HTTP oturumunu kapatır."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def set_video_url(self, url):
+        """
+        Video URL'sini ayarlar ve video ID'sini çıkarır
+
+        Args:
+            url (str): YouTube video URL'si
+
+        Returns:
+            bool: URL geçerliyse True, değilse False
+        """
+        self.video_url = url
+        self.video_id = extract_video_id(url)
+        return self.video_id is not None
+
+    async def get_available_languages(self):
+        """
+        Videoda mevcut olan altyazı dillerini çeker
+
+        Returns:
+            dict: {dil_kodu: dil_adı} formatında sözlük
+                  Hata durumunda None döner
+        """
+        if not self.video_id:
+            return None
+
+        try:
+            all_langs = await self._run_in_executor(self._fetcher.list_languages, self.video_id)
+            self.available_languages = all_langs
+            return all_langs
+
+        except Exception as e:
+            print(f"Hata: {str(e)}")
+            return None
+
+    async def get_subtitle_text(self, language_code):
+        """
+        Belirtilen dildeki altyazı metnini çeker
+
+        Args:
+            language_code (str): Dil kodu (örn: 'en', 'tr')
+
+        Returns:
+            str: Altyazı metni veya None (hata durumunda)
+        """
+        if not self.video_id or not language_code:
+            return None
+
+        try:
+            return await self.fetch_subtitle(self.video_id, language_code)
+
+        except Exception as e:
+            print(f"Hata: {str(e)}")
+            return None
+
+    async def fetch_batch(self, urls, language_codes):
+        """
+        Birden fazla videonun altyazısını aynı olay döngüsünde eşzamanlı çeker
+
+        İndirme eşzamanlılığı `max_connections` ile, çıkarım eşzamanlılığı ise
+        executor'ın iş parçacığı sayısı ile sınırlanır. Biten sonuçlar,
+        girdinin sonraki öğesi beklenmeden hemen üretilir.
+
+        Args:
+            urls (iterable): YouTube URL'leri veya video ID'leri
+            language_codes (list): Tercih sırasına göre dil kodları
+
+        Yields:
+            SubtitleResult: Tamamlanma sırasına göre her videonun sonucu
+        """
+        if isinstance(language_codes, str):
+            language_codes = [language_codes]
+        language_codes = list(language_codes)
+
+        # Girdi (örn. stdin) bloklayabileceğinden sonraki öğe executor'da okunur;
+        # böylece biten sonuçlar yeni girdi beklenmeden üretilir
+        loop = asyncio.get_running_loop()
+        urls = iter(urls)
+        end = object()
+        max_pending = self.max_connections * 2
+        pending = set()
+        exhausted = False
+        reader = loop.run_in_executor(None, next, urls, end)
+        try:
+            while pending or reader is not None:
+                waiting = pending | {reader} if reader is not None else pending
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if reader in done:
+                    url = reader.result()
+                    reader = None
+                    if url is end:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(self._fetch_batch_item(url, language_codes)))
+                for task in done & pending:
+                    pending.discard(task)
+                    yield task.result()
+                if reader is None and not exhausted and len(pending) < max_pending:
+                    reader = loop.run_in_executor(None, next, urls, end)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _fetch_batch_item(self, url, language_codes):
+        """Toplu çekimdeki tek bir videoyu işler; hatalar sonuç nesnesine yazılır."""
+        video_id = extract_video_id(url)
+        if not video_id:
+            return SubtitleResult(url, None, None, error=ValueError(f"Geçersiz YouTube URL'si: {url}"))
+
+        try:
+            for language_code in language_codes:
+                text, is_auto = await self._fetch_text(video_id, language_code)
+                if text is not None:
+                    return SubtitleResult(url, video_id, language_code, text=text, is_auto=is_auto)
+
+            raise LookupError(f"İstenen dillerde altyazı bulunamadı: {', '.join(language_codes)}")
+
+        except Exception as e:
+            return SubtitleResult(url, video_id, None, error=e)
+
+    async def fetch_subtitle(self, video_id, language_code):
+        """
+        Verilen videonun altyazısını çeker; nesnenin durumunu değiştirmez
+
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+
+        Returns:
+            str: Altyazı metni veya None (bu dilde altyazı yoksa)
+        """
+        text, _ = await self._fetch_text(video_id, language_code)
+        return text
+
+    async def _fetch_text(self, video_id, language_code):
+        """`fetch_subtitle` gibi çalışır, ayrıca altyazının türünü döndürür: (metin, is_auto)."""
+        if self.disk_cache is not None:
+            cached = await self._run_in_executor(self._fetcher.read_disk_cache, video_id, language_code)
+            if cached is not None:
+                return cached.text, cached.is_auto
+
+        subtitle_url, is_auto, ext = await self._run_in_executor(
+            self._fetcher.find_subtitle_track, video_id, language_code)
+        if not subtitle_url:
+            return None, None
+
+        metrics = self.metrics
+        start = time.perf_counter() if metrics is not None else 0.0
+        try:
+            body, encoding = await self._download(subtitle_url)
+        except Exception as e:
+            if metrics is not None:
+                metrics.failure('download', e)
+            raise
+
+        if metrics is not None:
+            metrics.observe_phase('download', time.perf_counter() - start)
+            metrics.add_bytes(len(body))
+            start = time.perf_counter()
+
+        content = body.decode(encoding)
+        cues = parse_captions(content, ext, is_auto=is_auto)
+        text = self._fetcher.format_cues(cues)
+
+        if metrics is not None:
+            metrics.observe_phase('convert', time.perf_counter() - start)
+
+        if self.disk_cache is not None:
+            await self._run_in_executor(
+                self._fetcher.write_disk_cache, video_id, language_code, cues, content, text, ext)
+        return text, is_auto
+
+    async def _download(self, url):
+        """
+        Altyazı dosyasını paylaşılan oturum üzerinden indirir; geçici hatalarda yeniden dener
+
+        Returns:
+            tuple: (ham gövde baytları, karakter kodlaması)
+        """
+        import aiohttp
+
+        session = self._get_session()
+        policy = self.retry_policy
+        limiter = self.download_limiter
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    start = await limiter.acquire_async() if limiter is not None else None
+                    try:
+                        async with session.get(url) as response:
+                            if limiter is not None:
+                                limiter.release(start, status_outcome(response.status),
+                                                response.headers.get('Retry-After'))
+                                start = None
+                            if (response.status not in policy.retry_statuses
+                                    or attempt + 1 >= policy.max_attempts):
+                                if response.status == 429:
+                                    raise ThrottledError(f"İstek sınırına takıldı (HTTP 429): {url}",
+                                                         response.headers.get('Retry-After'))
+                                response.raise_for_status()
+                                return await response.read(), response.charset or 'utf-8'
+                            retry_after = response.headers.get('Retry-After')
+                    except BaseException as e:
+                        # Yanıt başlıkları gelmeden oluşan hatalar
+                        if start is not None:
+                            limiter.release(start, THROTTLED if isinstance(e, asyncio.TimeoutError) else FAILED)
+                        raise
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt + 1 >= policy.max_attempts:
+                    raise
+
+            await asyncio.sleep(policy.delay(attempt, retry_after))
+            attempt += 1
+
+    def _get_session(self):
+        """Paylaşılan aiohttp oturumunu ilk kullanımda oluşturur."""
+        # aiohttp yalnızca indirme gerektiğinde yüklenir; önbellekten yanıtlanan çağrılar onu beklemez
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        return self._session
+
+    async def _run_in_executor(self, func, *args):
+        """Bloklayan bir çağrıyı executor üzerinde çalıştırır."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
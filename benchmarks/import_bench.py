@@ -0,0 +1,130 @@
+"""
+Modüllerin açılış (import) süresini ve önbellekten yanıtlanan çağrıların
+ağır bağımlılıkları yükleyip yüklemediğini ölçer.
+
+Her ölçüm temiz bir Python sürecinde yapılır; süreler `--repeat` tekrarın
+ortancasıdır. Önbellek isabeti senaryoları (kalıcı altyazı önbelleği,
+altyazı tablosu önbelleği, olumsuz sonuç önbelleği) `yt_dlp`, `requests`
+veya `aiohttp` yüklerse ya da bir modülün açılışı `--max-ms` sınırını
+aşarsa betik sıfırdan farklı kodla çıkar; böylece CI'da gerilemelere karşı
+koruma olarak kullanılabilir:
+    python benchmarks/import_bench.py --max-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ('youtube_subtitle_fetcher', 'youtubesub', 'async_subtitle_fetcher', 'job_journal',
+           'work_queue', 'search_index', 'export_writer')
+
+# Yalnızca çıkarım veya indirme sırasında yüklenmesi gereken bağımlılıklar
+HEAVY_MODULES = ('yt_dlp', 'requests', 'urllib3', 'aiohttp')
+
+# Alt süreçte çalışan ölçüm kodu; `setup` ve `call` senaryoya göre değişir
+_CHILD = """
+import json, os, sys, tempfile, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+import_ms = (time.perf_counter() - start) * 1000
+tmp = tempfile.mkdtemp()
+{setup}
+start = time.perf_counter()
+{call}
+call_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{'import_ms': import_ms, 'call_ms': call_ms,
+                  'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+SCENARIOS = {
+    'disk_cache_hit': (
+        'youtube_subtitle_fetcher',
+        "from subtitle_store import SubtitleDiskCache\n"
+        "cache = SubtitleDiskCache(os.path.join(tmp, 'cache.sqlite3'))\n"
+        "cache.put('dQw4w9WgXcQ', 'en', False, 'WEBVTT', 'merhaba')\n"
+        "fetcher = youtube_subtitle_fetcher.YouTubeSubtitleFetcher(disk_cache=cache)",
+        "assert fetcher.fetch_subtitle('dQw4w9WgXcQ', 'en') == 'merhaba'",
+    ),
+    'disk_cache_hit_multi': (
+        'youtube_subtitle_fetcher',
+        "from subtitle_store import SubtitleDiskCache\n"
+        "cache = SubtitleDiskCache(os.path.join(tmp, 'cache.sqlite3'))\n"
+        "cache.put('dQw4w9WgXcQ', 'en', False, 'WEBVTT', 'merhaba')\n"
+        "cache.put('dQw4w9WgXcQ', 'tr', False, 'WEBVTT', 'merhaba')\n"
+        "fetcher = youtube_subtitle_fetcher.YouTubeSubtitleFetcher(disk_cache=cache)",
+        "assert all(result.ok for result in fetcher.fetch_subtitles('dQw4w9WgXcQ', ['en', 'tr']).values())",
+    ),
+    'metadata_cache_hit': (
+        'youtube_subtitle_fetcher',
+        "from metadata_cache import MetadataCache\n"
+        "cache = MetadataCache()\n"
+        "cache.put('dQw4w9WgXcQ', {'en': [{'ext': 'vtt', 'url': 'https://example.com/en.vtt'}]}, {})",
+        "assert youtube_subtitle_fetcher.extract_caption_tracks('dQw4w9WgXcQ', cache)[0]",
+    ),
+    'negative_cache_hit': (
+        'youtube_subtitle_fetcher',
+        "from negative_cache import NO_CAPTIONS, NegativeCache\n"
+        "cache = NegativeCache(os.path.join(tmp, 'negative.sqlite3'))\n"
+        "cache.put('dQw4w9WgXcQ', NO_CAPTIONS)",
+        "assert youtube_subtitle_fetcher.extract_caption_tracks("
+        "'dQw4w9WgXcQ', None, negative_cache=cache) == ({}, {})",
+    ),
+}
+
+
+def run_child(module, setup='pass', call='pass'):
+    """Kodu temiz bir süreçte çalıştırır ve ölçümleri döndürür."""
+    code = _CHILD.format(root=ROOT, module=module, setup=setup, call=call, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                            text=True, cwd=ROOT).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def measure(repeat, module, setup='pass', call='pass'):
+    """Ölçümü `repeat` kez tekrarlar; ortanca süreleri ve yüklenen ağır modülleri döndürür."""
+    runs = [run_child(module, setup, call) for _ in range(repeat)]
+    result = {'import_ms': statistics.median(run['import_ms'] for run in runs)}
+    if call != 'pass':
+        result['call_ms'] = statistics.median(run['call_ms'] for run in runs)
+    result['loaded'] = sorted({name for run in runs for name in run['loaded']})
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Açılış süresi ve önbellek isabeti yolunun ölçümü")
+    parser.add_argument('--repeat', type=int, default=5, help="Her ölçümün tekrar sayısı")
+    parser.add_argument('--max-ms', type=float, default=200.0,
+                        help="Bir modülün açılışı için izin verilen en uzun süre (ms)")
+    parser.add_argument('--output', help="JSON sonucun yazılacağı dosya (varsayılan: stdout)")
+    args = parser.parse_args(argv)
+
+    imports = {module: measure(args.repeat, module) for module in MODULES}
+    scenarios = {name: measure(args.repeat, module, setup, call)
+                 for name, (module, setup, call) in SCENARIOS.items()}
+
+    failures = [f"{module}: açılış {result['import_ms']:.1f} ms > {args.max_ms:.0f} ms"
+                for module, result in imports.items() if result['import_ms'] > args.max_ms]
+    failures += [f"{name}: {', '.join(result['loaded'])} yüklendi"
+                 for name, result in scenarios.items() if result['loaded']]
+    report = {'max_ms': args.max_ms, 'imports': imports, 'cache_hits': scenarios, 'failures': failures}
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if failures:
+        for failure in failures:
+            print(f"Hata: {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+İş günlüğünün (JobJournal) yazma maliyetini ve yeniden başlatma hızını ölçer.
+
+- Yazma: her öğe bekliyor olarak eklenip tamamlandı işaretlenir; farklı
+  `commit_every` değerlerinde öğe başına süre, günlüksüz döngüyle karşılaştırılır.
+- Yeniden başlatma: günlükteki tüm öğeler tamamlanmışken bitmiş öğe kümesinin
+  yüklenmesi ve her öğenin atlanması ölçülür.
+
+    python benchmarks/journal_bench.py --items 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from job_journal import JobJournal
+
+LANGUAGES = ('tr', 'en')
+
+
+def video_ids(count):
+    return [f"v{i:010d}" for i in range(count)]
+
+
+def bench_writes(directory, items, commit_every):
+    """Öğe başına ekleme + tamamlama maliyetini ölçer."""
+    path = os.path.join(directory, f"write-{commit_every}.sqlite3")
+    ids = video_ids(items // len(LANGUAGES))
+    journal = JobJournal(path, commit_every=commit_every)
+    start = time.perf_counter()
+    for video_id in ids:
+        journal.add(video_id, LANGUAGES)
+        for language_code in LANGUAGES:
+            journal.mark_done(video_id, language_code)
+    journal.close()
+    elapsed = time.perf_counter() - start
+    count = len(ids) * len(LANGUAGES)
+    return {'items': count, 'seconds': elapsed, 'us_per_item': elapsed / count * 1e6,
+            'file_bytes': os.path.getsize(path)}
+
+
+def bench_baseline(items):
+    """Günlük olmadan aynı döngünün maliyeti (karşılaştırma için)."""
+    ids = video_ids(items // len(LANGUAGES))
+    done = []
+    start = time.perf_counter()
+    for video_id in ids:
+        for language_code in LANGUAGES:
+            done.append((video_id, language_code))
+    elapsed = time.perf_counter() - start
+    return {'items': len(done), 'seconds': elapsed, 'us_per_item': elapsed / len(done) * 1e6}
+
+
+def bench_restart(directory, items):
+    """Tamamlanmış bir işin yeniden başlatılmasında atlama maliyetini ölçer."""
+    path = os.path.join(directory, 'restart.sqlite3')
+    ids = video_ids(items // len(LANGUAGES))
+    with JobJournal(path, commit_every=10000) as journal:
+        for video_id in ids:
+            for language_code in LANGUAGES:
+                journal.mark_done(video_id, language_code)
+
+    start = time.perf_counter()
+    with JobJournal(path) as journal:
+        finished = journal.finished_keys()
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    remaining = 0
+    for video_id in ids:
+        remaining += sum((video_id, language_code) not in finished for language_code in LANGUAGES)
+    skip = time.perf_counter() - start
+    count = len(ids) * len(LANGUAGES)
+    return {'items': count, 'remaining': remaining, 'load_seconds': load,
+            'skip_us_per_item': skip / count * 1e6}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="İş günlüğü yazma ve yeniden başlatma ölçümü")
+    parser.add_argument('--items', type=int, default=100000, help="(video, dil) öğe sayısı")
+    parser.add_argument('--commit-every', default='1,64,256,4096',
+                        help="Virgülle ayrılmış grup yazma boyutları")
+    parser.add_argument('--output', help="JSON sonucun yazılacağı dosya (varsayılan: stdout)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = {
+            'baseline': bench_baseline(args.items),
+            'writes': {level: bench_writes(directory, args.items if int(level) > 1 else min(args.items, 5000),
+                                           int(level))
+                       for level in args.commit_every.split(',')},
+            'restart': bench_restart(directory, args.items),
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
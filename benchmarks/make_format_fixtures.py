@@ -0,0 +1,150 @@
+"""
+VTT fixture'larından json3, srv3 ve TTML karşılıklarını üretir.
+
+Otomatik altyazı fixture'ındaki kayan (rolling) VTT ipuçlarından satırlar ve
+kelime zamanlamaları çıkarılır; çıktılar YouTube'un aynı video için sunduğu
+biçimlerin yapısını (pencere olayları, kelime parçaları, satır sonu ekleri)
+izler. Böylece biçimler aynı içerik üzerinde karşılaştırılabilir. Üretilen
+dosyalar gerçek YouTube yüklerinin yerini tutmaz; ayrıştırıcıların gerçek
+json3/srv3 örnekleriyle denkliği bu fixture'larla doğrulanamaz:
+    python benchmarks/make_format_fixtures.py
+"""
+import json
+import os
+import re
+from xml.sax.saxutils import escape, quoteattr
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+_TIMING_PATTERN = re.compile(r'(\S+)\s+-->\s+(\S+)')
+_WORD_PATTERN = re.compile(r'<(\d{2}:\d{2}:\d{2}\.\d{3})><c>([^<]*)</c>')
+
+
+def parse_time_ms(value):
+    hours, minutes, seconds = value.split(':')
+    return round((int(hours) * 3600 + int(minutes) * 60 + float(seconds)) * 1000)
+
+
+def format_time(ms):
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}.{ms % 1000:03d}"
+
+
+def read_blocks(name):
+    """VTT dosyasını (başlangıç_ms, bitiş_ms, satırlar) bloklarına ayırır."""
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        content = f.read()
+    blocks = []
+    for block in content.split('\n\n'):
+        lines = block.split('\n')
+        for i, line in enumerate(lines):
+            match = _TIMING_PATTERN.match(line)
+            if match:
+                blocks.append((parse_time_ms(match.group(1)), parse_time_ms(match.group(2)), lines[i + 1:]))
+                break
+    return blocks
+
+
+def auto_lines(blocks):
+    """Kayan VTT'den kelime zamanlamalı satırları çıkarır: (başlangıç_ms, [(ofset_ms, kelime)])."""
+    lines = []
+    for start, _, text_lines in blocks:
+        last = text_lines[-1] if text_lines else ''
+        if '<c>' not in last:
+            continue
+        first_word = last.split('<', 1)[0]
+        words = [(0, first_word)]
+        for timestamp, word in _WORD_PATTERN.findall(last):
+            words.append((parse_time_ms(timestamp) - start, word))
+        lines.append((start, words))
+    return lines
+
+
+def build_auto(blocks):
+    lines = auto_lines(blocks)
+    end_ms = blocks[-1][1]
+    # Her satır, iki satır sonrası görünene kadar ekranda kalır
+    durations = []
+    for i, (start, _) in enumerate(lines):
+        until = lines[i + 2][0] if i + 2 < len(lines) else end_ms
+        durations.append(until - start)
+
+    events = [{'tStartMs': 0, 'dDurationMs': end_ms, 'id': 1, 'wpWinPosId': 1, 'wsWinStyleId': 1}]
+    srv3 = []
+    ttml = []
+    for i, ((start, words), duration) in enumerate(zip(lines, durations)):
+        segs = [{'utf8': words[0][1], 'acAsrConf': 0}]
+        segs.extend({'utf8': word, 'tOffsetMs': offset, 'acAsrConf': 0} for offset, word in words[1:])
+        events.append({'tStartMs': start, 'dDurationMs': duration, 'wWinId': 1, 'segs': segs})
+
+        spans = [f'<s ac="0">{escape(words[0][1])}</s>']
+        spans.extend(f'<s t="{offset}" ac="0">{escape(word)}</s>' for offset, word in words[1:])
+        srv3.append(f'<p t="{start}" d="{duration}" w="1">{"".join(spans)}</p>')
+
+        text = ''.join(word for _, word in words)
+        line_end = lines[i + 1][0] if i + 1 < len(lines) else end_ms
+        ttml.append(f'<p begin="{format_time(start)}" end="{format_time(line_end)}" style="s2">'
+                    f'{escape(text)}</p>')
+
+        # Sonraki satırın başlangıcında satır sonu eklenir
+        if i + 1 < len(lines):
+            next_start = lines[i + 1][0]
+            events.append({'tStartMs': next_start - 10, 'dDurationMs': duration - (next_start - 10 - start),
+                           'wWinId': 1, 'aAppend': 1, 'segs': [{'utf8': '\n'}]})
+            srv3.append(f'<p t="{next_start - 10}" d="{duration - (next_start - 10 - start)}" w="1" a="1">\n</p>')
+
+    json3 = {
+        'wireMagic': 'pb3',
+        'pens': [{}],
+        'wsWinStyles': [{}, {'mhModeHint': 2, 'juJustifCode': 0, 'sdScrollDir': 3}],
+        'wpWinPositions': [{}, {'apPoint': 6, 'ahHorPos': 20, 'avVerPos': 100, 'rcRows': 2, 'ccCols': 40}],
+        'events': events,
+    }
+    srv3_head = ('<head><ws id="0"/><ws id="1" mh="2" ju="0" sd="3"/><wp id="0"/>'
+                 '<wp id="1" ap="6" ah="20" av="100" rc="2" cc="40"/></head>')
+    srv3_body = [f'<w t="0" id="1" wp="1" ws="1"/>'] + srv3
+    return json3, srv3_head, srv3_body, ttml
+
+
+def build_manual(blocks):
+    events = []
+    srv3 = []
+    ttml = []
+    for start, end, text_lines in blocks:
+        text = '\n'.join(text_lines).strip()
+        if not text:
+            continue
+        events.append({'tStartMs': start, 'dDurationMs': end - start, 'segs': [{'utf8': text}]})
+        srv3.append(f'<p t="{start}" d="{end - start}">{escape(text)}</p>')
+        ttml.append(f'<p begin="{format_time(start)}" end="{format_time(end)}" style="s2">'
+                    f'{"<br />".join(escape(line) for line in text.split(chr(10)))}</p>')
+
+    json3 = {'wireMagic': 'pb3', 'pens': [{}], 'wsWinStyles': [{}], 'wpWinPositions': [{}], 'events': events}
+    srv3_head = '<head><ws id="0"/><wp id="0"/></head>'
+    return json3, srv3_head, srv3, ttml
+
+
+def write(stem, json3, srv3_head, srv3_body, ttml_body, lang='en'):
+    with open(os.path.join(FIXTURES, f'{stem}.json3'), 'w', encoding='utf-8') as f:
+        json.dump(json3, f, ensure_ascii=False, separators=(',', ':'))
+
+    with open(os.path.join(FIXTURES, f'{stem}.srv3'), 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8" ?><timedtext format="3">\n')
+        f.write(srv3_head + '\n<body>\n' + '\n'.join(srv3_body) + '\n</body>\n</timedtext>\n')
+
+    with open(os.path.join(FIXTURES, f'{stem}.ttml'), 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8" ?>\n'
+                f'<tt xml:lang={quoteattr(lang)} xmlns="http://www.w3.org/ns/ttml" '
+                'xmlns:ttp="http://www.w3.org/ns/ttml#parameter" '
+                'xmlns:tts="http://www.w3.org/ns/ttml#styling" ttp:timeBase="media">\n'
+                '<head><styling><style xml:id="s1" tts:textAlign="center"/>'
+                '<style xml:id="s2" tts:fontSize="100%"/></styling></head>\n'
+                '<body><div>\n' + '\n'.join(ttml_body) + '\n</div></body>\n</tt>\n')
+
+
+def main():
+    write('auto_typical', *build_auto(read_blocks('auto_typical.vtt')))
+    write('manual_small', *build_manual(read_blocks('manual_small.vtt')))
+
+
+if __name__ == '__main__':
+    main()
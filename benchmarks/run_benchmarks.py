@@ -0,0 +1,424 @@
+"""
+Çevrimdışı performans ölçüm takımı.
+
+Kaydedilmiş `extract_info` sonuçlarını sahte bir `yt_dlp.YoutubeDL` üzerinden
+yeniden oynatır ve VTT dosyalarını yerel bir HTTP sunucusundan sunar; böylece
+ölçümler ağa ve YouTube'a bağlı olmadan tekrarlanabilir.
+
+Ölçülenler:
+- Aşama bazında gecikme: çıkarım, VTT indirme, metne dönüştürme
+- Tam çıkarım ile yalnızca altyazıya yönelik hafif çıkarımın karşılaştırması
+- Farklı eşzamanlılık düzeylerinde saniyede işlenen video sayısı
+- Küçük, tipik ve 10 saatlik girdilerde dönüştürmenin tepe bellek kullanımı
+- Altyazı biçimlerinin (vtt, json3, srv3, ttml) ayrıştırma hızı ve yük boyutu
+
+Ölçümlerden önce tekrar ayıklamanın doğruluğu denetlenir: `fixtures/` altındaki
+`<ad>.vtt` dosyalarından üretilen metin `<ad>.expected.txt` ile birebir
+aynı olmalıdır. Uyuşmazlık varsa betik rapordan sonra hata koduyla çıkar.
+
+Sonuçlar sürümler arası gerilemeleri yakalamak için JSON olarak yazılır:
+    python benchmarks/run_benchmarks.py --output sonuc.json
+"""
+import argparse
+import copy
+import gzip
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, ROOT)
+
+import yt_dlp
+from caption_formats import parse_captions, supported_formats
+from network import HttpClient
+from youtube_subtitle_fetcher import YouTubeSubtitleFetcher, build_language_map, extract_caption_tracks
+from vtt_parser import convert_vtt_to_text, iter_timed_text, iter_vtt_text
+
+_TIMESTAMP_PATTERN = re.compile(r'(\d{2}):(\d{2}):(\d{2}\.\d{3})')
+
+# Beklenen metni bilinen tekrar ayıklama fixture'ları: (ad, otomatik mi)
+#   auto_rolling: kayan otomatik altyazı; ipucu sınırlarını aşan örtüşmeler
+#       atılmalı, ancak konuşmada gerçekten tekrar eden ifadeler korunmalıdır
+#   manual_repeats: manuel altyazı; sınırlarda tekrar eden ifadeler olduğu
+#       gibi kalmalıdır
+DEDUP_FIXTURES = (('auto_rolling', True), ('manual_repeats', False))
+
+
+def load_fixture(name):
+    """Fixture dosyasını metin olarak okur."""
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class ReplayYoutubeDL(yt_dlp.YoutubeDL):
+    """
+    Kaydedilmiş `extract_info` sonucunu döndüren YoutubeDL.
+
+    Ağ üzerinden çıkarım yapılmaz; fixture'daki `{base_url}` yer tutucuları
+    yerel sunucunun adresiyle değiştirilir ve isteğe bağlı gecikme gerçek
+    çıkarım süresini taklit eder. `process=True` ile çağrıldığında sonuç,
+    yt_dlp'nin gerçek format işleme ve seçim adımından geçirilir.
+    """
+
+    info = None
+    latency = 0.0
+
+    def extract_info(self, url, download=False, ie_key=None, extra_info=None, process=True, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        info = copy.deepcopy(self.info)
+        info['webpage_url'] = url
+        if process:
+            return self.process_ie_result(info, download=False)
+        return info
+
+    @classmethod
+    def install(cls, info_template, base_url, latency=0.0):
+        """Fixture'ı yükler ve `yt_dlp.YoutubeDL` yerine bu sınıfı yerleştirir."""
+        cls.info = json.loads(info_template.replace('{base_url}', base_url))
+        cls.latency = latency
+        yt_dlp.YoutubeDL = cls
+
+
+class FixtureServer:
+    """
+    Fixture VTT dosyalarını kalıcı bağlantı (keep-alive) ile sunan yerel HTTP sunucusu.
+
+    `/manual_<dil>.<ext>` istekleri `manual_small.<ext>`, `/auto_<dil>.<ext>`
+    istekleri `auto_typical.<ext>` dosyasıyla yanıtlanır.
+    """
+
+    def __init__(self):
+        bodies = {}
+        for kind, fixture in (('manual', 'manual_small'), ('auto', 'auto_typical')):
+            for name in os.listdir(FIXTURES):
+                stem, ext = os.path.splitext(name)
+                if stem == fixture:
+                    with open(os.path.join(FIXTURES, name), 'rb') as f:
+                        bodies[(kind, ext)] = f.read()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Başlık ve gövdeyi tek seferde gönder; Nagle gecikmesi ölçümleri bozmasın
+            wbufsize = 1 << 16
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                name = self.path.split('?', 1)[0].lstrip('/')
+                kind = name.split('_', 1)[0]
+                body = bodies.get((kind, os.path.splitext(name)[1]))
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/vtt; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def summarize(samples):
+    """Süre örneklerinden (saniye) milisaniye cinsinden özet istatistik üretir."""
+    ordered = sorted(samples)
+    return {
+        'count': len(ordered),
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'p50_ms': ordered[len(ordered) // 2] * 1000,
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        'min_ms': ordered[0] * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def bench_phases(base_url, iterations):
+    """Çıkarım, indirme ve dönüştürme aşamalarının gecikmesini ayrı ayrı ölçer."""
+    client = HttpClient()
+    subtitle_url = f"{base_url}/auto_en.vtt"
+    extract, download, convert = [], [], []
+    downloaded = 0
+
+    for i in range(iterations):
+        start = time.perf_counter()
+        extract_caption_tracks(f"bench{i:06d}", metadata_cache=None)
+        extract.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        response = client.get(subtitle_url)
+        response.raise_for_status()
+        body = response.text
+        download.append(time.perf_counter() - start)
+        downloaded += len(response.content)
+
+        start = time.perf_counter()
+        convert_vtt_to_text(body, rolling=True)
+        convert.append(time.perf_counter() - start)
+
+    client.close()
+    total_download = sum(download)
+    return {
+        'extract': summarize(extract),
+        'download': dict(summarize(download),
+                         throughput_mb_s=downloaded / total_download / 1e6 if total_download else None),
+        'convert': summarize(convert),
+    }
+
+
+def bench_extraction_modes(iterations):
+    """
+    Tam çıkarım ile yalnızca altyazıya yönelik hafif çıkarımı karşılaştırır
+
+    Kaydedilmiş yanıt her iki modda da aynıdır; fark yt_dlp'nin format işleme
+    adımından gelir. Gerçek ağda hafif modun atladığı oynatıcı JS'i ve
+    manifesto indirmeleri bu ölçüme dahil değildir.
+    """
+    results = {}
+    languages = {}
+    for name, captions_only in (('full', False), ('captions_only', True)):
+        samples = []
+        for i in range(iterations):
+            start = time.perf_counter()
+            tracks = extract_caption_tracks(f"mode{i:07d}", metadata_cache=None, captions_only=captions_only)
+            samples.append(time.perf_counter() - start)
+        results[name] = summarize(samples)
+        languages[name] = build_language_map(*tracks)
+
+    results['speedup'] = results['full']['mean_ms'] / results['captions_only']['mean_ms']
+    results['same_languages'] = languages['full'] == languages['captions_only']
+    return results
+
+
+def bench_throughput(base_url, levels, videos):
+    """Toplu çekimin farklı eşzamanlılık düzeylerinde saniyede işlediği video sayısını ölçer."""
+    results = []
+    for level in levels:
+        client = HttpClient(pool_maxsize=max(level, 1))
+        fetcher = YouTubeSubtitleFetcher(metadata_cache=None, http_client=client)
+        ids = (f"t{level:03d}{i:07d}" for i in range(videos))
+
+        start = time.perf_counter()
+        errors = sum(1 for result in fetcher.fetch_batch(ids, ['en'], max_workers=level) if not result.ok)
+        elapsed = time.perf_counter() - start
+        client.close()
+
+        results.append({
+            'concurrency': level,
+            'videos': videos,
+            'errors': errors,
+            'seconds': elapsed,
+            'videos_per_sec': videos / elapsed if elapsed else None,
+        })
+    return results
+
+
+def check_dedup():
+    """
+    Tekrar ayıklamanın fixture'larda beklenen metni verdiğini denetler
+
+    Metin üç yoldan üretilir: ipucu listesi, akış halinde VTT okuma ve
+    zaman damgalı satırlar. Tekrar ayıklaması açık bir fetcher'ın
+    `format_cues` sonucu da karşılaştırılır.
+
+    Returns:
+        list: Uyuşmayan (fixture, yol) kayıtları; hepsi doğruysa boş liste
+    """
+    fetcher = YouTubeSubtitleFetcher()
+    mismatches = []
+    for stem, is_auto in DEDUP_FIXTURES:
+        content = load_fixture(f'{stem}.vtt')
+        expected = load_fixture(f'{stem}.expected.txt').rstrip('\n')
+        cues = parse_captions(content, 'vtt', is_auto=is_auto)
+        outputs = {
+            'cue_list': cues.to_text(rolling=cues.rolling),
+            'stream': '\n'.join(iter_vtt_text(content.splitlines(), rolling=cues.rolling)),
+            'timed': '\n'.join(line for _, line in iter_timed_text(cues, rolling=cues.rolling)),
+            'format_cues': fetcher.format_cues(cues),
+        }
+        for path, text in outputs.items():
+            if text != expected:
+                mismatches.append({'fixture': stem, 'path': path, 'expected': expected, 'got': text})
+    return mismatches
+
+
+def bench_formats(iterations):
+    """
+    Her altyazı biçiminin ayrıştırma + metne dönüştürme hızını ve yük boyutunu ölçer
+
+    json3/srv3/ttml fixture'ları `make_format_fixtures.py` ile VTT
+    fixture'larından üretilir. `same_text_as_vtt` bu yüzden yalnızca
+    ayrıştırıcıların birbiriyle tutarlı olduğunu gösterir; gerçek YouTube
+    yüklerinin VTT ile denkliğini kanıtlamaz.
+    """
+    results = []
+    for stem, is_auto in (('manual_small', False), ('auto_typical', True)):
+        reference = None
+        for ext in supported_formats():
+            path = os.path.join(FIXTURES, f'{stem}.{ext}')
+            if not os.path.exists(path):
+                continue
+            content = load_fixture(f'{stem}.{ext}')
+            payload = content.encode('utf-8')
+
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                cues = parse_captions(content, ext, is_auto=is_auto)
+                text = cues.to_text(rolling=cues.rolling)
+                samples.append(time.perf_counter() - start)
+
+            if ext == 'vtt':
+                reference = text
+            mean = statistics.fmean(samples)
+            results.append({
+                'input': stem,
+                'format': ext,
+                'payload_bytes': len(payload),
+                'gzip_bytes': len(gzip.compress(payload)),
+                'cues': len(cues),
+                'parse': summarize(samples),
+                'throughput_mb_s': len(payload) / mean / 1e6 if mean else None,
+                'same_text_as_vtt': None if reference is None else text == reference,
+            })
+    return results
+
+
+def build_long_vtt(template, hours):
+    """Tipik VTT'yi zaman damgalarını kaydırarak istenen süreye kadar tekrarlar."""
+    header, _, body = template.partition('\n\n')
+    last = _TIMESTAMP_PATTERN.findall(body)[-1]
+    period = int(last[0]) * 3600 + int(last[1]) * 60 + float(last[2])
+
+    def shift(offset):
+        def replace(match):
+            t = int(match.group(1)) * 3600 + int(match.group(2)) * 60 + float(match.group(3)) + offset
+            return f"{int(t // 3600):02d}:{int(t % 3600 // 60):02d}:{t % 60:06.3f}"
+        return replace
+
+    parts = [header, '']
+    repeats = int(hours * 3600 // period) + 1
+    for k in range(repeats):
+        parts.append(_TIMESTAMP_PATTERN.sub(shift(k * period), body))
+    return '\n'.join(parts)
+
+
+def measure_peak(func):
+    """Fonksiyonun çalışması sırasında ayrılan tepe belleği (bayt) ve süresini döndürür."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, elapsed
+
+
+def bench_memory(long_hours):
+    """Dönüştürmenin tepe bellek kullanımını girdi boyutuna göre ölçer."""
+    typical = load_fixture('auto_typical.vtt')
+    inputs = [
+        ('small', load_fixture('manual_small.vtt'), False),
+        ('typical', typical, True),
+        (f'{long_hours:g}h', build_long_vtt(typical, long_hours), True),
+    ]
+
+    results = []
+    for name, content, rolling in inputs:
+        peak, elapsed = measure_peak(lambda: convert_vtt_to_text(content, rolling=rolling))
+
+        # Aynı girdiyi diskten akış halinde okuyup doğrudan dosyaya yazarak dönüştür
+        with tempfile.NamedTemporaryFile('w', suffix='.vtt', encoding='utf-8', delete=False) as f:
+            f.write(content)
+            path = f.name
+        try:
+            def stream():
+                with open(path, encoding='utf-8') as source, open(os.devnull, 'w') as sink:
+                    for line in iter_vtt_text(source, rolling=rolling):
+                        sink.write(line)
+                        sink.write('\n')
+            stream_peak, stream_elapsed = measure_peak(stream)
+        finally:
+            os.unlink(path)
+
+        results.append({
+            'input': name,
+            'input_bytes': len(content.encode('utf-8')),
+            'output_bytes': len(convert_vtt_to_text(content, rolling=rolling).encode('utf-8')),
+            'convert_peak_bytes': peak,
+            'convert_seconds': elapsed,
+            'stream_peak_bytes': stream_peak,
+            'stream_seconds': stream_elapsed,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Altyazı çekici için çevrimdışı performans ölçümleri")
+    parser.add_argument('--output', help="JSON sonucun yazılacağı dosya (varsayılan: stdout)")
+    parser.add_argument('--iterations', type=int, default=50, help="Aşama ölçümü tekrar sayısı")
+    parser.add_argument('--videos', type=int, default=200, help="Eşzamanlılık ölçümündeki video sayısı")
+    parser.add_argument('--concurrency', default='1,4,16', help="Virgülle ayrılmış eşzamanlılık düzeyleri")
+    parser.add_argument('--extract-latency', type=float, default=0.0,
+                        help="Sahte çıkarıma eklenecek gecikme (saniye)")
+    parser.add_argument('--long-hours', type=float, default=10, help="Uzun girdinin süresi (saat)")
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(',') if level]
+    mismatches = check_dedup()
+
+    with FixtureServer() as server:
+        ReplayYoutubeDL.install(load_fixture('info.json'), server.base_url, args.extract_latency)
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'parameters': vars(args),
+            'dedup_mismatches': mismatches,
+            'phases': bench_phases(server.base_url, args.iterations),
+            'extraction_modes': bench_extraction_modes(args.iterations),
+            'throughput': bench_throughput(server.base_url, levels, args.videos),
+            'memory': bench_memory(args.long_hours),
+            'formats': bench_formats(args.iterations),
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if mismatches:
+        print(f"Hata: tekrar ayıklama {len(mismatches)} yolda beklenen metni vermedi", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
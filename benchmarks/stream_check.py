@@ -0,0 +1,112 @@
+"""
+`youtubesub.py` NDJSON modunun girdi yavaş geldiğinde de sonuçları hemen
+yazdığını doğrular.
+
+Kalıcı önbellek geçici bir dosyada önceden doldurulur (ağ erişimi gerekmez),
+CLI `-i -` ile alt süreçte başlatılır ve stdin açık tutularak satırlar
+`--delay` aralıklarla yazılır. Her satırın sonucunun, sonraki girdi
+beklenmeden `--max-ms` içinde stdout'a düşmesi beklenir; aşılırsa betik
+sıfırdan farklı kodla çıkar:
+    python benchmarks/stream_check.py --lines 5 --delay 1.0 --max-ms 1000
+"""
+import argparse
+import json
+import os
+import random
+import select
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from subtitle_store import SubtitleDiskCache
+
+ID_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+
+
+def make_cache(path, count, seed=0):
+    """Önbelleği rastgele ID'lerle doldurur ve ID'leri döndürür."""
+    rng = random.Random(seed)
+    video_ids = [''.join(rng.choice(ID_ALPHABET) for _ in range(11)) for _ in range(count)]
+    cache = SubtitleDiskCache(path)
+    try:
+        for video_id in video_ids:
+            cache.put(video_id, 'en', False, 'WEBVTT', f'merhaba {video_id}')
+    finally:
+        cache.close()
+    return video_ids
+
+
+def measure(video_ids, cache_path, delay, jobs, timeout):
+    """
+    Satırları aralıklarla yazar; her satırın sonucuna kadar geçen süreyi (ms) döndürür
+
+    Sonuç `timeout` saniye içinde gelmezse ölçüm durur (eski davranışta CLI
+    sonraki girdiyi beklerken sonsuza dek takılır).
+    """
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'youtubesub.py'), '-i', '-', '-l', 'en', '-j', str(jobs),
+         '--cache', cache_path, '--no-text'],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1, cwd=ROOT)
+    latencies = []
+    try:
+        for video_id in video_ids:
+            start = time.perf_counter()
+            process.stdin.write(video_id + '\n')
+            process.stdin.flush()
+            if not select.select([process.stdout], [], [], timeout)[0]:
+                latencies.append(timeout * 1000)
+                break
+            record = json.loads(process.stdout.readline())
+            latencies.append((time.perf_counter() - start) * 1000)
+            if record.get('video_id') != video_id:
+                raise RuntimeError(f"Beklenmeyen kayıt: {record}")
+            time.sleep(delay)
+        process.stdin.close()
+        process.wait(timeout=30)
+    finally:
+        if process.poll() is None:
+            process.kill()
+    return latencies, process.returncode
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CLI akış modunun yavaş girdide gecikme kontrolü")
+    parser.add_argument('--lines', type=int, default=5, help="Yazılacak satır sayısı")
+    parser.add_argument('--delay', type=float, default=1.0, help="Satırlar arasındaki bekleme (s)")
+    parser.add_argument('--jobs', type=int, default=8, help="CLI'ye verilecek eşzamanlı iş sayısı")
+    parser.add_argument('--max-ms', type=float, default=1000.0,
+                        help="Bir satırın sonucu için izin verilen en uzun süre (ms)")
+    parser.add_argument('--output', help="JSON sonucun yazılacağı dosya (varsayılan: stdout)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'cache.sqlite3')
+        video_ids = make_cache(cache_path, args.lines)
+        latencies, returncode = measure(video_ids, cache_path, args.delay, args.jobs,
+                                        max(5.0, args.max_ms / 1000 * 10))
+
+    failures = [f"satır {index + 1}: {latency:.0f} ms > {args.max_ms:.0f} ms"
+                for index, latency in enumerate(latencies) if latency > args.max_ms]
+    if returncode != 0:
+        failures.append(f"CLI {returncode} koduyla çıktı")
+    report = {'config': vars(args), 'latency_ms': latencies, 'returncode': returncode, 'failures': failures}
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if failures:
+        for failure in failures:
+            print(f"Hata: {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Hız sınırlayıcısını, sınırlama uygulayan yerel bir sunucuya karşı ölçer.
+
+Sunucu YouTube'un timedtext uç noktasını taklit eder: aynı anda en fazla
+`--capacity` isteği ve saniyede en fazla `--server-rate` isteği kabul eder,
+fazlasına `429 Too Many Requests` döner. Yanıt süresi süren istek sayısıyla
+birlikte artar. Aynı indirme listesi sınırlayıcısız ve `RateLimiter` ile
+çekilir; süre, 429 sayısı ve AIMD'nin ulaştığı eşzamanlılık karşılaştırılır:
+    python benchmarks/throttle_bench.py --requests 400 --workers 32 --capacity 8
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, ROOT)
+
+from network import HttpClient, RetryPolicy
+from rate_limit import RateLimiter, ThrottledError, raise_for_status
+
+
+class ThrottlingServer:
+    """
+    Eşzamanlılık ve hız sınırını aşan isteklere 429 döndüren yerel HTTP sunucusu.
+    """
+
+    def __init__(self, capacity, rate, base_latency, retry_after=None):
+        with open(os.path.join(FIXTURES, 'auto_typical.vtt'), 'rb') as f:
+            body = f.read()
+
+        state = {'in_flight': 0, 'window_start': time.monotonic(), 'window_count': 0,
+                 'ok': 0, 'throttled': 0, 'peak': 0}
+        lock = threading.Lock()
+        self.state = state
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            wbufsize = 1 << 16
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with lock:
+                    now = time.monotonic()
+                    if now - state['window_start'] >= 1.0:
+                        state['window_start'] = now
+                        state['window_count'] = 0
+                    state['window_count'] += 1
+                    throttled = state['in_flight'] >= capacity or state['window_count'] > rate
+                    if throttled:
+                        state['throttled'] += 1
+                    else:
+                        state['in_flight'] += 1
+                        state['peak'] = max(state['peak'], state['in_flight'])
+                        load = state['in_flight']
+
+                if throttled:
+                    self.send_response(429)
+                    if retry_after is not None:
+                        self.send_header('Retry-After', str(retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                try:
+                    # Yük arttıkça yanıt yavaşlar
+                    time.sleep(base_latency * (1 + load / capacity))
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/vtt; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with lock:
+                        state['in_flight'] -= 1
+                        state['ok'] += 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/api/timedtext"
+
+    def reset(self):
+        self.state.update(ok=0, throttled=0, peak=0, window_count=0, window_start=time.monotonic())
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def run(server, requests, workers, limiter):
+    """Aynı indirme listesini verilen sınırlayıcıyla çeker ve sonuçları özetler."""
+    server.reset()
+    client = HttpClient(RetryPolicy(max_attempts=6, backoff_base=0.05, backoff_max=1.0),
+                        pool_maxsize=workers, rate_limiter=limiter)
+    failures = {'throttled': 0, 'other': 0}
+
+    def download(i):
+        try:
+            raise_for_status(client.get(f"{server.url}?v={i:011d}"))
+        except ThrottledError:
+            failures['throttled'] += 1
+        except Exception:
+            failures['other'] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(download, range(requests)))
+    elapsed = time.perf_counter() - start
+    client.close()
+
+    result = {
+        'seconds': elapsed,
+        'completed_per_second': (requests - failures['throttled'] - failures['other']) / elapsed,
+        'server_429': server.state['throttled'],
+        'server_peak_in_flight': server.state['peak'],
+        'failed_throttled': failures['throttled'],
+        'failed_other': failures['other'],
+    }
+    if limiter is not None:
+        result['limiter'] = limiter.stats()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hız sınırlayıcısının sınırlama yapan sunucuya karşı ölçümü")
+    parser.add_argument('--requests', type=int, default=400, help="İndirme sayısı")
+    parser.add_argument('--workers', type=int, default=32, help="İstemci iş parçacığı sayısı")
+    parser.add_argument('--capacity', type=int, default=8, help="Sunucunun kabul ettiği eşzamanlı istek")
+    parser.add_argument('--server-rate', type=float, default=200, help="Sunucunun saniyede kabul ettiği istek")
+    parser.add_argument('--latency', type=float, default=0.02, help="Boş sunucudaki yanıt süresi (saniye)")
+    parser.add_argument('--retry-after', type=float, help="429 yanıtlarına eklenecek Retry-After değeri")
+    parser.add_argument('--output', help="JSON sonucun yazılacağı dosya (varsayılan: stdout)")
+    args = parser.parse_args(argv)
+
+    with ThrottlingServer(args.capacity, args.server_rate, args.latency, args.retry_after) as server:
+        report = {
+            'config': vars(args),
+            'unlimited': run(server, args.requests, args.workers, None),
+            'adaptive': run(server, args.requests, args.workers,
+                            RateLimiter(rate=args.server_rate, burst=args.capacity,
+                                        max_concurrency=args.workers)),
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
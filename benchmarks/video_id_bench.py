@@ -0,0 +1,149 @@
+"""
+Video ID çıkarıcısını URL tablosuyla doğrular ve toplu çıkarım hızını ölçer.
+
+Önce `fixtures/video_urls.tsv` tablosundaki her URL için beklenen ID
+kontrol edilir; uyuşmazlık varsa betik hata koduyla çıkar. Ardından rastgele
+ID'lerle üretilmiş erişim kaydı satırları üzerinde eski `urlparse` +
+`parse_qs` yöntemi, `extract_video_id` ve toplu `iter_video_ids`
+karşılaştırılır. İki karışım ölçülür: `typical` gerçek kayıtlardaki yaygın
+biçimleri, `table` ise tablodaki tüm biçimleri (büyük harfli, portlu vb.
+yavaş yola düşenler dahil) eşit ağırlıkla içerir:
+    python benchmarks/video_id_bench.py --lines 1000000 --unique 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlparse, parse_qs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, ROOT)
+
+from video_ids import extract_video_id, iter_video_ids, normalize_urls
+
+ID_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+
+# Erişim kayıtlarında en sık görülen biçimler
+TYPICAL_TEMPLATES = (
+    'https://www.youtube.com/watch?v={}',
+    'https://www.youtube.com/watch?v={}&t=42s',
+    'https://www.youtube.com/watch?v={}&list=PLx0sYbCqOb8TBPRdmBHs5Iftvv9TPboYG&index=3',
+    'https://youtu.be/{}',
+    'https://youtu.be/{}?si=AbCdEfGhIjKl',
+    'https://m.youtube.com/watch?v={}&feature=youtu.be',
+    'https://www.youtube.com/shorts/{}',
+    'https://music.youtube.com/watch?v={}&list=RDAMVM',
+    'https://www.youtube.com/embed/{}?start=30',
+    'https://www.youtube.com/live/{}?si=AbCdEfGhIjKl',
+)
+
+# Erişim kayıtlarında YouTube dışı satırlar
+NOISE = ('https://example.com/index.html', 'https://www.google.com/search?q=altyazi',
+         'https://www.youtube.com/@GoogleDevelopers', 'GET /favicon.ico HTTP/1.1')
+
+
+def legacy_extract_video_id(url):
+    """Fetcher'ın eski `_extract_video_id` uygulaması (karşılaştırma için)."""
+    parsed_url = urlparse(url)
+    if parsed_url.netloc in ['www.youtube.com', 'youtube.com'] and parsed_url.path == '/watch':
+        query_params = parse_qs(parsed_url.query)
+        return query_params.get('v', [None])[0]
+    elif parsed_url.netloc == 'youtu.be':
+        return parsed_url.path[1:]
+    return None
+
+
+def load_table():
+    """URL tablosunu (url, beklenen ID veya None) çiftleri olarak okur."""
+    rows = []
+    with open(os.path.join(FIXTURES, 'video_urls.tsv'), encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#'):
+                continue
+            url, expected = line.rstrip('\n').split('\t')
+            rows.append((url, expected or None))
+    return rows
+
+
+def check_table(rows):
+    """Tablodaki her URL'yi tekli ve toplu API ile kontrol eder; uyuşmazlıkları döndürür."""
+    mismatches = [{'url': url, 'expected': expected, 'got': extract_video_id(url)}
+                  for url, expected in rows if extract_video_id(url) != expected]
+    expected_ids = [expected for _, expected in rows if expected is not None]
+    if list(iter_video_ids((url for url, _ in rows), unique=False)) != expected_ids:
+        mismatches.append({'url': '<iter_video_ids>', 'expected': len(expected_ids), 'got': None})
+    legacy = sum(legacy_extract_video_id(url) == expected for url, expected in rows if expected is not None)
+    return mismatches, {'rows': len(rows), 'video_urls': len(expected_ids), 'legacy_recognised': legacy}
+
+
+def table_templates(rows):
+    """Tablodaki video URL'lerini ID yerine `{}` içeren şablonlara çevirir."""
+    return [url.replace(expected, '{}') for url, expected in rows
+            if expected is not None and url.count(expected) == 1]
+
+
+def make_lines(templates, count, unique, noise, seed=0):
+    """Şablonları rastgele ID'lerle doldurarak erişim kaydı satırları üretir."""
+    rng = random.Random(seed)
+    ids = [''.join(rng.choice(ID_ALPHABET) for _ in range(11)) for _ in range(unique)]
+    lines = []
+    for _ in range(count):
+        if rng.random() < noise:
+            lines.append(rng.choice(NOISE) + '\n')
+        else:
+            lines.append(rng.choice(templates).format(rng.choice(ids)) + '\n')
+    return lines
+
+
+def bench_mix(lines):
+    """Aynı satırlar üzerinde eski yöntemi, tekli ve toplu çıkarımı ölçer."""
+    return {
+        'legacy_per_line': timed(lambda lines: sum(legacy_extract_video_id(line.strip()) is not None
+                                                   for line in lines), lines),
+        'extract_per_line': timed(lambda lines: sum(extract_video_id(line) is not None for line in lines), lines),
+        'iter_video_ids': timed(lambda lines: sum(1 for _ in iter_video_ids(lines, unique=False)), lines),
+        'iter_video_ids_unique': timed(lambda lines: sum(1 for _ in iter_video_ids(lines)), lines),
+        'normalize_urls_unique': timed(lambda lines: sum(1 for _ in normalize_urls(lines)), lines),
+    }
+
+
+def timed(func, lines):
+    start = time.perf_counter()
+    found = func(lines)
+    elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'lines_per_second': len(lines) / elapsed,
+            'ns_per_line': elapsed / len(lines) * 1e9, 'ids': found}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Video ID çıkarımı doğrulaması ve hız ölçümü")
+    parser.add_argument('--lines', type=int, default=1000000, help="Üretilecek kayıt satırı sayısı")
+    parser.add_argument('--unique', type=int, default=100000, help="Farklı video sayısı")
+    parser.add_argument('--noise', type=float, default=0.2, help="YouTube dışı satırların oranı")
+    parser.add_argument('--output', help="JSON sonucun yazılacağı dosya (varsayılan: stdout)")
+    args = parser.parse_args(argv)
+
+    rows = load_table()
+    mismatches, table = check_table(rows)
+
+    report = {'config': vars(args), 'url_table': table, 'mismatches': mismatches}
+    for name, templates in (('typical', TYPICAL_TEMPLATES), ('table', table_templates(rows))):
+        report[name] = bench_mix(make_lines(templates, args.lines, args.unique, args.noise))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if mismatches:
+        print(f"Hata: URL tablosunda {len(mismatches)} uyuşmazlık var", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+import json
+import xml.etree.ElementTree as ElementTree
+from vtt_parser import Cue, build_cue_list, parse_timestamp, parse_vtt
+
+# Varsayılan biçim tercihi. json3/srv3/ttml ayrıştırıcıları yalnızca VTT fixture'larından
+# üretilmiş örneklerle denendi; kaydedilmiş gerçek YouTube yükleriyle VTT'ye denkliği
+# doğrulanana kadar varsayılan VTT'dir, diğer biçimler `formats` ile açıkça seçilir.
+DEFAULT_FORMAT_PREFERENCE = ('vtt',)
+
+# Uzantı -> ayrıştırıcı; ayrıştırıcılar `parser(içerik, is_auto)` imzasıyla CueList döndürür
+_PARSERS = {}
+
+
+def register_parser(ext, parser):
+    """
+    Bir altyazı biçimi için ayrıştırıcı kaydeder
+
+    Args:
+        ext (str): yt_dlp'nin altyazı formatı uzantısı (örn: 'json3')
+        parser (callable): `parser(içerik, is_auto)` ile çağrılıp CueList döndüren fonksiyon
+    """
+    _PARSERS[ext] = parser
+
+
+def get_parser(ext):
+    """
+    Biçim için kayıtlı ayrıştırıcıyı döndürür
+
+    Args:
+        ext (str): Altyazı formatı uzantısı
+
+    Returns:
+        callable: Ayrıştırıcı veya None (biçim desteklenmiyorsa)
+    """
+    return _PARSERS.get(ext)
+
+
+def supported_formats():
+    """Ayrıştırıcısı kayıtlı biçimlerin listesini döndürür."""
+    return list(_PARSERS)
+
+
+def parse_captions(content, ext, is_auto=False):
+    """
+    Altyazı içeriğini biçimine uygun ayrıştırıcıyla ipucu listesine dönüştürür
+
+    Args:
+        content (str): Ham altyazı içeriği
+        ext (str): Altyazı formatı uzantısı
+        is_auto (bool): Otomatik altyazı ise True
+
+    Returns:
+        CueList: Ayrıştırılmış ipuçları
+    """
+    parser = _PARSERS.get(ext)
+    if parser is None:
+        raise ValueError(f"Desteklenmeyen altyazı biçimi: {ext}")
+    return parser(content, is_auto)
+
+
+def _clean_lines(text):
+    """Satırların baş/son boşluklarını atar ve boş satırları çıkarır."""
+    return '\n'.join(line for line in (part.strip() for part in text.split('\n')) if line)
+
+
+def parse_json3(content, is_auto=False):
+    """
+    YouTube json3 altyazısını ipucu listesine dönüştürür
+
+    Her olay (event) bir satırdır; kelime parçaları (`segs`) birleştirilir.
+    Otomatik altyazılarda satırlar birbirini tekrar etmez, bu nedenle kayan
+    tekrar ayıklamaya gerek kalmaz. Yalnızca satır sonu ekleyen olaylar
+    (`aAppend`) atlanır.
+
+    Args:
+        content (str): json3 içeriği
+        is_auto (bool): Otomatik altyazı ise True
+
+    Returns:
+        CueList: Ayrıştırılmış ipuçları
+    """
+    events = json.loads(content).get('events') or ()
+
+    def iter_event_cues():
+        for event in events:
+            segs = event.get('segs')
+            if not segs or event.get('aAppend'):
+                continue
+            text = _clean_lines(''.join(seg.get('utf8', '') for seg in segs))
+            if text:
+                start = event.get('tStartMs', 0) / 1000
+                yield Cue(start, start + event.get('dDurationMs', 0) / 1000, text)
+
+    return build_cue_list(iter_event_cues(), is_auto=is_auto, rolling=False)
+
+
+def parse_srv3(content, is_auto=False):
+    """
+    YouTube srv3 (timedtext format 3) XML altyazısını ipucu listesine dönüştürür
+
+    Args:
+        content (str): srv3 içeriği
+        is_auto (bool): Otomatik altyazı ise True
+
+    Returns:
+        CueList: Ayrıştırılmış ipuçları
+    """
+    root = ElementTree.fromstring(content.encode('utf-8'))
+
+    def iter_paragraph_cues():
+        for paragraph in root.iter('p'):
+            # Yalnızca satır sonu ekleyen paragraflar
+            if paragraph.get('a'):
+                continue
+            text = _clean_lines(''.join(paragraph.itertext()))
+            if text:
+                start = int(paragraph.get('t', 0)) / 1000
+                yield Cue(start, start + int(paragraph.get('d', 0)) / 1000, text)
+
+    return build_cue_list(iter_paragraph_cues(), is_auto=is_auto, rolling=False)
+
+
+def _ttml_time(value):
+    """TTML zaman ifadesini ('SS:DD:ss.mmm', '12.5s', '1500ms') saniyeye çevirir."""
+    if value.endswith('ms'):
+        return float(value[:-2]) / 1000
+    if value.endswith('s'):
+        return float(value[:-1])
+    return parse_timestamp(value)
+
+
+def _ttml_text(element):
+    """TTML paragrafının metnini `<br/>` etiketlerini satır sonuna çevirerek toplar."""
+    parts = [element.text or '']
+    for child in element:
+        if child.tag.rpartition('}')[2] == 'br':
+            parts.append('\n')
+        else:
+            parts.append(_ttml_text(child))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+
+def parse_ttml(content, is_auto=False):
+    """
+    TTML altyazısını ipucu listesine dönüştürür
+
+    Args:
+        content (str): TTML içeriği
+        is_auto (bool): Otomatik altyazı ise True
+
+    Returns:
+        CueList: Ayrıştırılmış ipuçları
+    """
+    root = ElementTree.fromstring(content.encode('utf-8'))
+
+    def iter_paragraph_cues():
+        for element in root.iter():
+            if element.tag.rpartition('}')[2] != 'p':
+                continue
+            text = _clean_lines(_ttml_text(element))
+            begin = element.get('begin')
+            if text and begin:
+                start = _ttml_time(begin)
+                end = element.get('end')
+                if end:
+                    end = _ttml_time(end)
+                else:
+                    end = start + _ttml_time(element.get('dur', '0s'))
+                yield Cue(start, end, text)
+
+    return build_cue_list(iter_paragraph_cues(), is_auto=is_auto, rolling=False)
+
+
+register_parser('vtt', parse_vtt)
+register_parser('json3', parse_json3)
+register_parser('srv3', parse_srv3)
+register_parser('ttml', parse_ttml)
@@ -0,0 +1,265 @@
+import glob
+import gzip
+import io
+import json
+import os
+import re
+import threading
+
+# Sıkıştırma türü -> parça dosyası uzantısı
+_EXTENSIONS = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst', None: '.jsonl'}
+
+_SHARD_PATTERN = re.compile(r'-(\d{5})\.jsonl(?:\.gz|\.zst)?$')
+
+
+def _import_zstd():
+    """zstd desteğini yükler; önce standart kütüphane (Python 3.14+), sonra `zstandard` paketi denenir."""
+    try:
+        from compression import zstd
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        raise ImportError("zstd sıkıştırması için 'zstandard' paketi gerekli: pip install zstandard")
+
+
+def _open_compressed_writer(raw, compression, level):
+    """Ham dosya nesnesini sıkıştıran yazma akışı döndürür."""
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=level or 6)
+    if compression == 'zstd':
+        zstd = _import_zstd()
+        if hasattr(zstd, 'ZstdCompressor') and hasattr(zstd.ZstdCompressor, 'stream_writer'):
+            return zstd.ZstdCompressor(level=level or 3).stream_writer(raw, closefd=False)
+        return zstd.ZstdFile(raw, mode='wb', level=level or 3)
+    if compression is None:
+        return raw
+    raise ValueError(f"Desteklenmeyen sıkıştırma türü: {compression}")
+
+
+def _open_shard_reader(path):
+    """Parça dosyasını uzantısına göre açıp satır satır okunabilen ikili akış döndürür."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.zst'):
+        zstd = _import_zstd()
+        raw = open(path, 'rb')
+        if hasattr(zstd, 'ZstdDecompressor') and hasattr(zstd.ZstdDecompressor, 'stream_reader'):
+            return io.BufferedReader(zstd.ZstdDecompressor().stream_reader(raw, closefd=True))
+        return zstd.ZstdFile(raw, mode='rb')
+    return open(path, 'rb')
+
+
+class ShardedJsonlWriter:
+    """
+    Altyazı sonuçlarını sıkıştırılmış, boyuta göre bölünmüş JSONL parçalarına yazar.
+
+    Her video/dil için ayrı .txt dosyası yerine kayıtlar satır satır
+    `<prefix>-00000.jsonl.gz` gibi parçalara eklenir. Kayıtlar bellekte
+    biriktirilip toplu yazılır; parçaya yazılan sıkıştırılmamış JSONL verisi
+    `max_shard_bytes` boyutuna ulaştığında parça kapatılır ve yenisine geçilir.
+    Sıkıştırıcılar veriyi kendi içlerinde tuttuğundan diskteki boyut yazma
+    sırasında güvenilir bir ölçü değildir; parçanın diskteki boyutu kabaca
+    `max_shard_bytes` / sıkıştırma oranı kadar olur. Yazılmakta olan parça
+    `.part` uzantısıyla tutulur, tamamlanınca yeniden adlandırılır; böylece
+    okuyucular yarım parçaları görmez. Aynı nesne birden fazla iş
+    parçacığından kullanılabilir.
+
+    Örnek:
+        with ShardedJsonlWriter('cikti/') as writer:
+            for result in fetcher.fetch_batch(urls, ['tr', 'en']):
+                writer.write_result(result)
+    """
+
+    def __init__(self, directory, prefix='subtitles', compression='gzip', level=None,
+                 max_shard_bytes=256 * 1024 * 1024, buffer_size=1024 * 1024):
+        """
+        Args:
+            directory (str): Parçaların yazılacağı dizin
+            prefix (str): Parça dosya adlarının öneki
+            compression (str): 'gzip', 'zstd' veya None (sıkıştırmasız)
+            level (int): Sıkıştırma düzeyi; None ise türün varsayılanı
+            max_shard_bytes (int): Bir parçaya yazılacak sıkıştırılmamış JSONL verisinin boyutu;
+                                   son toplu yazma bu sınırı bir arabellek kadar aşabilir
+            buffer_size (int): Toplu yazmadan önce bellekte biriktirilecek bayt sayısı
+        """
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"Desteklenmeyen sıkıştırma türü: {compression}")
+        if compression == 'zstd':
+            _import_zstd()
+
+        self.directory = directory
+        self.prefix = prefix
+        self.compression = compression
+        self.level = level
+        self.max_shard_bytes = max_shard_bytes
+        self.buffer_size = buffer_size
+        self.records_written = 0
+        self.shards = []
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffered = 0
+        self._raw = None
+        self._stream = None
+        self._part_path = None
+        self._shard_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        # Aynı dizine daha önce yazılmışsa numaralandırma kaldığı yerden devam eder
+        self._next_index = self._find_next_index()
+
+    def write_result(self, result, cues=None):
+        """
+        Başarılı bir `SubtitleResult` nesnesini yazar; hatalı sonuçlar atlanır
+
+        Args:
+            result (SubtitleResult): Çekim sonucu
+            cues (CueList): İsteğe bağlı zaman damgalı ipuçları
+
+        Returns:
+            bool: Kayıt yazıldıysa True
+        """
+        if not result.ok or result.text is None:
+            return False
+        self.write_subtitle(result.video_id, result.language_code, result.is_auto, result.text, cues)
+        return True
+
+    def write_subtitle(self, video_id, language_code, is_auto, text, cues=None):
+        """
+        Tek bir altyazıyı kayıt olarak yazar
+
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+            is_auto (bool): Otomatik altyazı ise True (bilinmiyorsa None)
+            text (str): Altyazı metni
+            cues (CueList): İsteğe bağlı ipuçları; [başlangıç, bitiş, metin] listeleri ve
+                            `rolling` bayrağıyla yazılır
+        """
+        record = {
+            'video_id': video_id,
+            'language': language_code,
+            'is_auto': is_auto,
+            'text': text,
+        }
+        if cues is not None:
+            record['cues'] = [[cue.start, cue.end, cue.text] for cue in cues]
+            # Kayan (önceki satırı tekrar eden) ipuçları okunurken ayıklanabilsin
+            record['rolling'] = cues.rolling
+        self.write(record)
+
+    def write(self, record):
+        """
+        Sözlüğü bir JSON satırı olarak arabelleğe ekler
+
+        Args:
+            record (dict): JSON'a dönüştürülebilir kayıt
+        """
+        line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with self._lock:
+            self._buffer.append(line)
+            self._buffered += len(line)
+            self.records_written += 1
+            if self._buffered >= self.buffer_size:
+                self._flush_buffer()
+
+    def flush(self):
+        """Arabellekteki kayıtları parçaya yazar."""
+        with self._lock:
+            self._flush_buffer()
+
+    def close(self):
+        """Arabelleği yazar ve açık parçayı tamamlar."""
+        with self._lock:
+            self._flush_buffer()
+            self._finish_shard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _flush_buffer(self):
+        if not self._buffer:
+            return
+        if self._stream is None:
+            self._open_shard()
+
+        self._stream.write(b''.join(self._buffer))
+        self._shard_bytes += self._buffered
+        self._buffer = []
+        self._buffered = 0
+
+        # Sıkıştırıcı veriyi kendi içinde tuttuğundan ham dosyanın boyutu geride kalır;
+        # parça, yazılan sıkıştırılmamış veri miktarına göre değiştirilir
+        if self._shard_bytes >= self.max_shard_bytes:
+            self._finish_shard()
+
+    def _open_shard(self):
+        name = f"{self.prefix}-{self._next_index:05d}{_EXTENSIONS[self.compression]}"
+        self._next_index += 1
+        self._part_path = os.path.join(self.directory, name + '.part')
+        self._raw = open(self._part_path, 'wb')
+        self._stream = _open_compressed_writer(self._raw, self.compression, self.level)
+        self._shard_bytes = 0
+
+    def _finish_shard(self):
+        if self._stream is None:
+            return
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+
+        path = self._part_path[:-len('.part')]
+        os.replace(self._part_path, path)
+        self.shards.append(path)
+        self._stream = self._raw = self._part_path = None
+
+    def _find_next_index(self):
+        indexes = [int(match.group(1))
+                   for match in map(_SHARD_PATTERN.search, os.listdir(self.directory))
+                   if match and os.path.basename(match.string).startswith(self.prefix + '-')]
+        return max(indexes) + 1 if indexes else 0
+
+
+def list_shards(path, prefix='subtitles'):
+    """
+    Dizindeki tamamlanmış parçaları sırasıyla döndürür
+
+    Args:
+        path (str): Parça dizini veya tek bir parça dosyası
+        prefix (str): Parça dosya adlarının öneki
+
+    Returns:
+        list: Parça dosya yolları
+    """
+    if os.path.isfile(path):
+        return [path]
+    pattern = os.path.join(glob.escape(path), f"{glob.escape(prefix)}-*.jsonl*")
+    return sorted(p for p in glob.glob(pattern) if _SHARD_PATTERN.search(p))
+
+
+def iter_export_records(path, prefix='subtitles'):
+    """
+    Dışa aktarılmış kayıtları akış halinde okur
+
+    Parçalar sırayla açılır ve satır satır çözülür; bellek kullanımı parça
+    boyutundan bağımsızdır.
+
+    Args:
+        path (str): Parça dizini veya tek bir parça dosyası
+        prefix (str): Parça dosya adlarının öneki
+
+    Yields:
+        dict: Kayıt (video_id, language, is_auto, text ve varsa cues)
+    """
+    for shard in list_shards(path, prefix):
+        with _open_shard_reader(shard) as stream:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
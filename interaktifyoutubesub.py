@@ -1,30 +1,62 @@
 import sys
-import threading
-from urllib.parse import urlparse, parse_qs
-import yt_dlp
-import requests
-import re
-from PySide6.QtCore import QUrl, QObject, Signal, Qt
-from PySide6.QtWidgets import QApplication, QMainWindow, QLineEdit, QToolBar, QMessageBox, QDockWidget, QTextEdit, QLabel, QVBoxLayout, QWidget, QComboBox, QHBoxLayout
-from PySide6.QtGui import QAction
+import itertools
+from bisect import bisect_right
+from PySide6.QtCore import QUrl, QObject, QRunnable, QThreadPool, QTimer, Signal, Qt
+from PySide6.QtWidgets import QApplication, QMainWindow, QLineEdit, QToolBar, QMessageBox, QDockWidget, QTextEdit, QLabel, QVBoxLayout, QWidget, QComboBox, QHBoxLayout, QPushButton
+from PySide6.QtGui import QAction, QTextCursor
 from PySide6.QtWebEngineWidgets import QWebEngineView
+from youtube_subtitle_fetcher import YouTubeSubtitleFetcher as SubtitleFetcher
+from subtitle_store import SubtitleDiskCache
+from video_ids import extract_video_id
+
+# Video açılır açılmaz arka planda önceden çekilecek diller (tercih sırasıyla)
+DEFAULT_PREFERRED_LANGUAGES = ('tr', 'en')
+# Metin kutusuna tek seferde eklenecek yaklaşık karakter sayısı
+RENDER_CHUNK_CHARS = 32 * 1024
 
 class WorkerSignals(QObject):
     """
     Arka plan iş parçacığından (thread) ana GUI iş parçacığına sinyal göndermek için kullanılır.
     """
-    subtitle_list_result = Signal(dict)
-    subtitle_result = Signal(str)
+    subtitle_list_result = Signal(int, dict)
+    subtitle_result = Signal(int, str, str, object)
     progress_update = Signal(str)
     finished = Signal()
-    error = Signal(str)
+    error = Signal(int, str)
+
+class FetchTask(QRunnable):
+    """
+    İş parçacığı havuzunda çalışan tek bir arka plan işi.
+    Her iş bir istek numarası taşır; sinyaller bu numarayla gönderilir ve
+    yerine yenisi başlatılmış (iptal edilmiş) işlerin sonuçları yok sayılır.
+    """
+    def __init__(self, request_id, func, *args):
+        super().__init__()
+        # Nesneyi Python tarafı tutar; kuyruktan geri almak (tryTake) için gerekli
+        self.setAutoDelete(False)
+        self.request_id = request_id
+        self.func = func
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """İşi iptal edildi olarak işaretler; sonucu yayınlanmaz."""
+        self.cancelled = True
+
+    def run(self):
+        if not self.cancelled:
+            self.func(self, *self.args)
 
 class YouTubeSubtitleFetcher(QMainWindow):
     """
     YouTube altyazı çekme özelliğine sahip bir web tarayıcısı uygulaması.
     PySide6 kütüphanesi kullanılarak geliştirilmiştir.
     """
-    def __init__(self):
+    def __init__(self, preferred_languages=DEFAULT_PREFERRED_LANGUAGES):
+        """
+        Args:
+            preferred_languages (iterable): Dil listesi gelir gelmez önceden çekilecek dil kodları
+        """
         super().__init__()
         self.setWindowTitle("YouTube Altyazı Seçici")
         self.setGeometry(100, 100, 1024, 768)
@@ -34,7 +66,35 @@ class YouTubeSubtitleFetcher(QMainWindow):
         self.signals.subtitle_result.connect(self.update_subtitle_text)
         self.signals.progress_update.connect(self.update_progress_text)
         self.signals.finished.connect(self.fetching_finished)
-        self.signals.error.connect(self.show_error)
+        self.signals.error.connect(self.on_task_error)
+
+        # Sınırlı sayıda iş parçacığı; hızlı gezinmede işler birikmez
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(2)
+        self._request_ids = itertools.count(1)
+        self._list_task = None
+        # Geçerli videonun dil koduna göre altyazı işleri ve tamamlanan sonuçları
+        self._subtitle_tasks = {}
+        self._subtitles = {}
+        # Dil listesi çekilen (veya çekilmekte olan) video
+        self._list_video_id = None
+        # Kullanıcının seçtiği, sonucu gelince gösterilecek dil
+        self._selected_lang = None
+
+        self.preferred_languages = list(preferred_languages)
+
+        # Uzun metinler parça parça eklenir; arayüz donmaz
+        self._render_text = None
+        self._render_pos = 0
+        self.render_timer = QTimer(self)
+        self.render_timer.setInterval(0)
+        self.render_timer.timeout.connect(self.render_next_chunk)
+
+        # Daha önce çekilen altyazılar diskteki önbellekten okunur
+        self.subtitle_fetcher = SubtitleFetcher(disk_cache=SubtitleDiskCache())
+        # Gösterilen altyazının her satırının (metin bloğunun) başlangıç zamanı;
+        # oynatma konumundaki satır bu listede ikili aramayla bulunur
+        self.current_line_starts = None
 
         self.browser = QWebEngineView()
         self.browser.setUrl(QUrl("https://www.youtube.com"))
@@ -92,6 +152,11 @@ class YouTubeSubtitleFetcher(QMainWindow):
         self.status_label = QLabel("YouTube videosu açın, mevcut altyazılar yüklenecektir.")
         layout.addWidget(self.status_label)
 
+        self.jump_btn = QPushButton("Oynatma Konumuna Git")
+        self.jump_btn.clicked.connect(self.jump_to_playback_position)
+        self.jump_btn.setEnabled(False)
+        layout.addWidget(self.jump_btn)
+
         self.subtitle_text = QTextEdit()
         self.subtitle_text.setReadOnly(True)
         self.subtitle_text.setStyleSheet("background-color: white; padding: 10px; color: black;")
@@ -106,45 +171,78 @@ class YouTubeSubtitleFetcher(QMainWindow):
         """URL değiştiğinde altyazı dillerini çekme işlemini başlatır."""
         video_id = self.get_video_id_from_url(url.toString())
         if video_id:
+            # YouTube'un sayfa içi gezinmesi aynı video için sinyali birkaç kez tetikler
+            if video_id == self._list_video_id:
+                return
+            self._list_video_id = video_id
+
+            # Önceki videoya ait işler iptal edilir; sonuçları ekrana gelmez
+            self.reset_subtitles()
+
             self.status_label.setText("Altyazı dilleri aranıyor...")
             self.lang_combo.clear()
             self.lang_label.show()
             self.lang_combo.show()
-            threading.Thread(target=self.fetch_subtitle_list_thread, args=(video_id,), daemon=True).start()
+            self._list_task = self.start_task(self._list_task, self.fetch_subtitle_list_thread, video_id)
         else:
+            self._list_video_id = None
+            self.cancel_task(self._list_task)
+            self._list_task = None
+            self.reset_subtitles()
             self.status_label.setText("YouTube videosu açın, mevcut altyazılar yüklenecektir.")
             self.lang_combo.clear()
             self.lang_label.hide()
             self.lang_combo.hide()
 
-    def fetch_subtitle_list_thread(self, video_id):
+    def reset_subtitles(self):
+        """Geçerli videoya ait altyazı işlerini iptal eder ve gösterimi temizler."""
+        for task in self._subtitle_tasks.values():
+            self.cancel_task(task)
+        self._subtitle_tasks = {}
+        self._subtitles = {}
+        self._selected_lang = None
+        self.render_timer.stop()
+        self._render_text = None
+        self.subtitle_text.clear()
+        self.current_line_starts = None
+        self.jump_btn.setEnabled(False)
+
+    def start_task(self, previous_task, func, *args):
+        """Önceki işi iptal eder ve yeni işi havuza gönderir."""
+        self.cancel_task(previous_task)
+        task = FetchTask(next(self._request_ids), func, *args)
+        self.thread_pool.start(task)
+        return task
+
+    def cancel_task(self, task):
+        """İşi iptal eder; henüz başlamadıysa havuz kuyruğundan çıkarır."""
+        if task is not None:
+            task.cancel()
+            self.thread_pool.tryTake(task)
+
+    def is_current(self, task, request_id):
+        """İstek numarasının hâlâ güncel olan işe ait olup olmadığını kontrol eder."""
+        return task is not None and not task.cancelled and task.request_id == request_id
+
+    def fetch_subtitle_list_thread(self, task, video_id):
         """Arka planda altyazı dillerini çeker."""
         try:
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            ydl_opts = {'skip_download': True, 'quiet': True, 'no_warnings': True}
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                subtitles = info.get('subtitles', {})
-                auto_subtitles = info.get('automatic_captions', {})
-
-                all_langs = {}
-                for lang_code, lang_list in subtitles.items():
-                    all_langs[lang_code] = lang_list[0]['name']
-                for lang_code, lang_list in auto_subtitles.items():
-                    # Check if the language is already in the list from manual subtitles to avoid duplicates
-                    if lang_code not in all_langs:
-                        all_langs[lang_code] = lang_list[0]['name'] + " (Oto)"
-                
-                self.signals.subtitle_list_result.emit(all_langs)
+            all_langs = self.subtitle_fetcher.list_languages(video_id)
+
+            if not task.cancelled:
+                self.signals.subtitle_list_result.emit(task.request_id, all_langs)
 
         except Exception as e:
-            self.signals.error.emit(f"Altyazı dillerini çekme hatası: {str(e)}")
+            if not task.cancelled:
+                self.signals.error.emit(task.request_id, f"Altyazı dillerini çekme hatası: {str(e)}")
         finally:
             self.signals.finished.emit()
 
-    def populate_subtitle_languages(self, languages):
+    def populate_subtitle_languages(self, request_id, languages):
         """Çekilen altyazı dillerini ComboBox'a ekler."""
+        if not self.is_current(self._list_task, request_id):
+            return
+
         if not languages:
             self.status_label.setText("Bu videoda altyazı bulunamadı.")
             self.lang_combo.hide()
@@ -160,65 +258,62 @@ class YouTubeSubtitleFetcher(QMainWindow):
         self.lang_combo.show()
         self.lang_label.show()
 
+        # Tercih edilen diller kullanıcı seçmeden önce arka planda çekilir
+        for lang_code in self.preferred_languages:
+            if lang_code in languages:
+                self.start_subtitle_fetch(lang_code)
+
+    def start_subtitle_fetch(self, lang_code):
+        """Dilin altyazısı henüz çekilmediyse veya çekilmiyorsa arka planda çekmeye başlar."""
+        if lang_code in self._subtitles or lang_code in self._subtitle_tasks:
+            return
+        self._subtitle_tasks[lang_code] = self.start_task(
+            None, self.fetch_subtitle_content_thread, self._list_video_id, lang_code)
+
     def fetch_selected_subtitle(self):
         """Kullanıcının seçtiği dilin altyazısını çeker."""
         lang_code = self.lang_combo.currentData()
         if not lang_code:
             return
         
-        self.status_label.setText(f"'{self.lang_combo.currentText()}' altyazıları çekiliyor...")
-        self.subtitle_text.setPlainText("")
-        
-        url = self.browser.url().toString()
-        video_id = self.get_video_id_from_url(url)
-
-        if not video_id:
+        if not self._list_video_id:
             self.show_error("Geçersiz URL: Video kimliği bulunamadı.")
             return
 
-        threading.Thread(target=self.fetch_subtitle_content_thread, args=(video_id, lang_code,), daemon=True).start()
+        self._selected_lang = lang_code
+        self.render_timer.stop()
+        self.subtitle_text.clear()
+        self.current_line_starts = None
+        self.jump_btn.setEnabled(False)
+
+        # Önceden çekildiyse hemen gösterilir; çekilmekteyse sonucu beklenir
+        if lang_code in self._subtitles:
+            self.show_subtitle(*self._subtitles[lang_code])
+            return
+
+        self.status_label.setText(f"'{self.lang_combo.currentText()}' altyazıları çekiliyor...")
+        self.start_subtitle_fetch(lang_code)
 
-    def fetch_subtitle_content_thread(self, video_id, lang_code):
+    def fetch_subtitle_content_thread(self, task, video_id, lang_code):
         """Arka planda seçilen dilin altyazı içeriğini çeker."""
         try:
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            ydl_opts = {'writesubtitles': True, 'subtitleslangs': [lang_code], 'skip_download': True, 'quiet': True, 'no_warnings': True}
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                # Altyazı dosyalarını manuel ve otomatik altyazılar olarak ayırıyoruz.
-                manual_subtitles = info.get('subtitles', {}).get(lang_code, [])
-                auto_subtitles = info.get('automatic_captions', {}).get(lang_code, [])
-
-                # Sadece bir adet altyazı dosyasını işlemek için bir URL bulmaya çalışalım.
-                subtitle_url = None
-                
-                # Önce manuel altyazılara bakalım.
-                for sub in manual_subtitles:
-                    if sub.get('ext') == 'vtt':
-                        subtitle_url = sub['url']
-                        break
-                
-                # Manuel altyazı bulunamazsa otomatik altyazılara bakalım.
-                if not subtitle_url:
-                    for sub in auto_subtitles:
-                        if sub.get('ext') == 'vtt':
-                            subtitle_url = sub['url']
-                            break
-
-                transcript = None
-                if subtitle_url:
-                    response = requests.get(subtitle_url, timeout=10)
-                    if response.status_code == 200:
-                        transcript = self.convert_vtt_to_text(response.text)
-                
+            # Önce diskteki önbelleğe bakılır; dil listesi çekilirken alınan tablolar yeniden kullanılır.
+            cues = self.subtitle_fetcher.fetch_subtitle_cues(video_id, lang_code)
+            # Metin zaman damgalı satırlardan kurulur; böylece satır numarası metin bloğu numarasıyla aynıdır
+            timed_lines = list(self.subtitle_fetcher.iter_timed_lines(cues)) if cues else []
+            transcript = '\n'.join(line for _, line in timed_lines)
+            line_starts = [start for start, _ in timed_lines]
+
+            if task.cancelled:
+                return
             if transcript:
-                self.signals.subtitle_result.emit(transcript)
+                self.signals.subtitle_result.emit(task.request_id, lang_code, transcript, line_starts)
             else:
-                self.signals.error.emit(f"'{lang_code}' dilinde altyazı bulunamadı.")
+                self.signals.error.emit(task.request_id, f"'{lang_code}' dilinde altyazı bulunamadı.")
                 
         except Exception as e:
-            self.signals.error.emit(f"Altyazı çekme hatası: {str(e)}")
+            if not task.cancelled:
+                self.signals.error.emit(task.request_id, f"Altyazı çekme hatası: {str(e)}")
         finally:
             self.signals.finished.emit()
 
@@ -239,47 +334,107 @@ class YouTubeSubtitleFetcher(QMainWindow):
 
     def get_video_id_from_url(self, url):
         """URL'den video ID'sini bulur ve döndürür."""
-        parsed_url = urlparse(url)
-        
-        if parsed_url.netloc in ['www.youtube.com', 'youtube.com'] and parsed_url.path == '/watch':
-            query_params = parse_qs(parsed_url.query)
-            return query_params.get('v', [None])[0]
-        
-        elif parsed_url.netloc == 'youtu.be':
-            return parsed_url.path[1:]
-            
-        return None
-
-    def convert_vtt_to_text(self, vtt_content):
-        """VTT formatını temiz metne dönüştürür ve ardışık tekrarları filtreler."""
-        lines = vtt_content.split('\n')
-        text_lines = []
-        previous_line = None
-        for line in lines:
-            if '-->' in line or line.strip() == '' or line.startswith('WEBVTT'):
-                continue
-            line = re.sub(r'<.*?>', '', line)
-            line = line.strip()
-            
-            # Aynı satır ardışık olarak geliyorsa, eklemiyoruz
-            if line and line != previous_line:
-                text_lines.append(line)
-                previous_line = line
-        return '\n'.join(text_lines)
+        return extract_video_id(url)
 
     def update_progress_text(self, text):
         """İşlem durumu mesajını günceller."""
         self.status_label.setText(text)
 
-    def update_subtitle_text(self, text):
-        """Altyazıları metin kutusuna yazar."""
-        self.subtitle_text.setPlainText(text)
+    def update_subtitle_text(self, request_id, lang_code, text, line_starts):
+        """Çekilen altyazıyı saklar; seçili dile aitse metin kutusuna yazar."""
+        task = self._subtitle_tasks.get(lang_code)
+        if not self.is_current(task, request_id):
+            return
+
+        del self._subtitle_tasks[lang_code]
+        self._subtitles[lang_code] = (text, line_starts)
+        if lang_code == self._selected_lang:
+            self.show_subtitle(text, line_starts)
+
+    def show_subtitle(self, text, line_starts):
+        """Altyazıyı metin kutusuna parça parça yazmaya başlar."""
+        self.current_line_starts = line_starts
+        self.jump_btn.setEnabled(True)
         self.status_label.setText("Altyazı başarıyla çekildi.")
 
+        self.subtitle_text.clear()
+        self._render_text = text
+        self._render_pos = 0
+        # İlk parça hemen, kalanlar olay döngüsü boşaldıkça eklenir
+        self.render_next_chunk()
+        if self._render_text is not None:
+            self.render_timer.start()
+
+    def render_next_chunk(self):
+        """Bekleyen metnin bir sonraki parçasını metin kutusunun sonuna ekler."""
+        text = self._render_text
+        if text is None:
+            self.render_timer.stop()
+            return
+
+        # Parçayı satır sonunda bitir
+        end = text.find('\n', self._render_pos + RENDER_CHUNK_CHARS)
+        end = len(text) if end == -1 else end + 1
+
+        cursor = QTextCursor(self.subtitle_text.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text[self._render_pos:end])
+        self._render_pos = end
+
+        if end >= len(text):
+            self._render_text = None
+            self.render_timer.stop()
+
+    def jump_to_playback_position(self):
+        """Videonun oynatma konumunu sayfadan okur ve altyazıda o ana gider."""
+        script = "(function() { var v = document.querySelector('video'); return v ? v.currentTime : null; })()"
+        self.browser.page().runJavaScript(script, 0, self.highlight_cue_at)
+
+    def highlight_cue_at(self, position):
+        """Verilen anda başlamış en son satırı metin kutusunda seçer."""
+        if position is None or not self.current_line_starts:
+            return
+
+        # Aynı metin tekrar etse bile satır, metin aramasıyla değil zamanla bulunur
+        line = bisect_right(self.current_line_starts, position) - 1
+        if line < 0:
+            return
+
+        # Satır henüz eklenmediyse metnin kalanı hemen yazılır; yazım sürerken
+        # son blok, parçanın sonundaki satır sonundan kalan boş bloktur
+        document = self.subtitle_text.document()
+        while self._render_text is not None and document.blockCount() - 1 <= line:
+            self.render_next_chunk()
+        block = document.findBlockByNumber(line)
+        if not block.isValid():
+            return
+
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+        self.subtitle_text.setTextCursor(cursor)
+        self.subtitle_text.ensureCursorVisible()
+
     def fetching_finished(self):
         """İşlem bittiğinde butonları tekrar etkinleştirir."""
         pass
 
+    def on_task_error(self, request_id, message):
+        """Güncel işten gelen hatayı gösterir; iptal edilmiş işlerin hataları yok sayılır."""
+        if self.is_current(self._list_task, request_id):
+            # Aynı videoya tekrar gidildiğinde dil listesi yeniden denenebilsin
+            self._list_video_id = None
+            self.show_error(message)
+            return
+
+        for lang_code, task in list(self._subtitle_tasks.items()):
+            if self.is_current(task, request_id):
+                # Başarısız iş kaldırılır; dil yeniden seçilirse tekrar denenir
+                del self._subtitle_tasks[lang_code]
+                # Önceden çekme hataları yalnızca o dil seçiliyse gösterilir
+                if lang_code == self._selected_lang:
+                    self.show_error(message)
+                return
+
     def show_error(self, message):
         """Hata mesajını gösterir."""
         self.status_label.setText(f"Hata: {message}")
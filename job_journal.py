@@ -0,0 +1,321 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from negative_cache import TRANSIENT, CachedFailureError, classify_error
+from video_ids import extract_video_id
+from youtube_subtitle_fetcher import SubtitleResult, iter_completed
+
+# İş öğesi durumları
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def is_retryable(error):
+    """
+    Hatanın yeniden denemeye değer olup olmadığını döndürür
+
+    İstenen dilde altyazı olmaması ve özel/silinmiş/coğrafi kısıtlı videolar
+    kalıcı sayılır; ağ hataları, hız sınırı ve tanınmayan hatalar yeniden denenir.
+
+    Args:
+        error (Exception): Yakalanan istisna
+
+    Returns:
+        bool: Yeniden denenebiliyorsa True
+    """
+    if isinstance(error, LookupError):
+        return False
+    if isinstance(error, CachedFailureError):
+        return error.outcome == TRANSIENT
+    # Hız sınırı ve tanınmayan hatalar sınıflandırılmaz (None) ve yeniden denenir
+    return classify_error(error) in (TRANSIENT, None)
+
+
+class JobJournal:
+    """
+    Toplu işlerin (video_id, dil) öğelerinin durumunu tutan SQLite günlüğü.
+
+    Her öğe bekliyor, tamamlandı veya başarısız durumundadır; başarısız
+    öğeler deneme sayısı ve yeniden denenebilirlik bilgisiyle saklanır.
+    Yazmalar bellekte biriktirilip `commit_every` öğede veya
+    `commit_interval` saniyede bir tek işlemle (transaction) diske yazılır.
+    Süreç çökerse yalnızca son, henüz yazılmamış grup kaybolur; bu öğeler
+    yeniden çalıştırmada tekrar işlenir.
+
+    Örnek:
+        with JobJournal('is.sqlite3') as journal:
+            for result in BulkJob(fetcher, journal, ['tr', 'en']).run(urls):
+                ...
+    """
+
+    def __init__(self, path, commit_every=256, commit_interval=1.0):
+        """
+        Args:
+            path (str): SQLite dosya yolu
+            commit_every (int): Diske yazmadan önce biriktirilecek en fazla güncelleme sayısı
+            commit_interval (float): İki yazma arasındaki en uzun süre (saniye)
+        """
+        self.path = path
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._lock = threading.Lock()
+        self._pending_rows = []
+        self._updates = []
+        self._last_commit = time.monotonic()
+
+        if self.path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_items (
+                video_id TEXT NOT NULL,
+                language_code TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                retryable INTEGER NOT NULL DEFAULT 1,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (video_id, language_code)
+            ) WITHOUT ROWID
+        """)
+
+    def add(self, video_id, language_codes):
+        """
+        Videonun dillerini bekleyen öğe olarak kaydeder; zaten kayıtlı öğeler değişmez
+
+        Args:
+            video_id (str): Video ID'si
+            language_codes (list): Dil kodları
+        """
+        now = time.time()
+        with self._lock:
+            self._pending_rows.extend((video_id, language_code, PENDING, now) for language_code in language_codes)
+            self._maybe_commit()
+
+    def mark_done(self, video_id, language_code):
+        """
+        Öğeyi tamamlandı olarak işaretler
+
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+        """
+        with self._lock:
+            self._updates.append((video_id, language_code, DONE, 0, 1, None, time.time()))
+            self._maybe_commit()
+
+    def mark_failed(self, video_id, language_code, error, retryable):
+        """
+        Öğeyi başarısız olarak işaretler ve deneme sayısını artırır
+
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+            error (Exception): Yakalanan istisna
+            retryable (bool): Sonraki çalıştırmada yeniden denenebilirse True
+        """
+        with self._lock:
+            self._updates.append(
+                (video_id, language_code, FAILED, 1, int(retryable), str(error), time.time()))
+            self._maybe_commit()
+
+    def commit(self):
+        """Biriken güncellemeleri tek işlemle diske yazar."""
+        with self._lock:
+            self._commit()
+
+    def _maybe_commit(self):
+        if (len(self._pending_rows) + len(self._updates) >= self.commit_every
+                or time.monotonic() - self._last_commit >= self.commit_interval):
+            self._commit()
+
+    def _commit(self):
+        self._last_commit = time.monotonic()
+        if not self._pending_rows and not self._updates:
+            return
+
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            if self._pending_rows:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO job_items (video_id, language_code, status, updated_at) '
+                    'VALUES (?, ?, ?, ?)', self._pending_rows)
+            if self._updates:
+                self._conn.executemany(
+                    'INSERT INTO job_items '
+                    '(video_id, language_code, status, attempts, retryable, error, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (video_id, language_code) DO UPDATE SET '
+                    'status = excluded.status, attempts = attempts + excluded.attempts, '
+                    'retryable = excluded.retryable, error = excluded.error, '
+                    'updated_at = excluded.updated_at', self._updates)
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._pending_rows = []
+        self._updates = []
+
+    def finished_keys(self, max_attempts=3):
+        """
+        Yeniden çalıştırmada atlanacak öğeleri döndürür
+
+        Tamamlanan öğeler, kalıcı hatayla başarısız olanlar ve deneme sınırına
+        ulaşanlar atlanır. Sonuç bir küme olduğundan öğe başına kontrol O(1)'dir.
+
+        Args:
+            max_attempts (int): Yeniden denenebilir hatalar için en fazla deneme sayısı
+
+        Returns:
+            set: (video_id, dil) çiftleri
+        """
+        with self._lock:
+            self._commit()
+            rows = self._conn.execute(
+                'SELECT video_id, language_code FROM job_items '
+                'WHERE status = ? OR (status = ? AND (retryable = 0 OR attempts >= ?))',
+                (DONE, FAILED, max_attempts))
+            return {(video_id, language_code) for video_id, language_code in rows}
+
+    def iter_items(self, status=None):
+        """
+        Kayıtlı öğeleri okur
+
+        Args:
+            status (str): Yalnızca bu durumdaki öğeler (PENDING, DONE, FAILED); None ise tümü
+
+        Yields:
+            tuple: (video_id, dil, durum, deneme sayısı, hata mesajı)
+        """
+        query = 'SELECT video_id, language_code, status, attempts, error FROM job_items'
+        params = ()
+        if status is not None:
+            query += ' WHERE status = ?'
+            params = (status,)
+        with self._lock:
+            self._commit()
+            rows = self._conn.execute(query, params).fetchall()
+        yield from rows
+
+    def counts(self):
+        """
+        Durum bazında öğe sayılarını döndürür
+
+        Returns:
+            dict: {durum: öğe sayısı}
+        """
+        with self._lock:
+            self._commit()
+            rows = self._conn.execute('SELECT status, COUNT(*) FROM job_items GROUP BY status').fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Biriken güncellemeleri yazar ve veritabanı bağlantısını kapatır."""
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BulkJob:
+    """
+    Kaldığı yerden devam edebilen toplu altyazı çekme işi.
+
+    Her video için istenen dillerden günlükte tamamlanmamış olanlar tek
+    çıkarımla çekilir (`fetch_subtitles`) ve sonuçları günlüğe yazılır.
+    Yeniden başlatıldığında tamamlanan ve kalıcı olarak başarısız olan öğeler
+    atlanır, yalnızca yeniden denenebilir hatalar tekrar denenir. Metinlerin
+    de çökmeye dayanıklı saklanması için fetcher'a `disk_cache` verilmesi
+    önerilir; tamamlanan her öğe günlüğe yazılmadan önce önbelleğe yazılmış olur.
+    """
+
+    def __init__(self, fetcher, journal, language_codes, max_workers=8, max_attempts=3):
+        """
+        Args:
+            fetcher (YouTubeSubtitleFetcher): Altyazıları çekecek nesne
+            journal (JobJournal): İş günlüğü
+            language_codes (list): Her video için çekilecek dil kodları
+            max_workers (int): Havuzdaki iş parçacığı sayısı
+            max_attempts (int): Yeniden denenebilir hatalar için en fazla deneme sayısı
+        """
+        if isinstance(language_codes, str):
+            language_codes = [language_codes]
+        self.fetcher = fetcher
+        self.journal = journal
+        self.language_codes = list(dict.fromkeys(language_codes))
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.skipped = 0
+
+    def run(self, urls):
+        """
+        İşi çalıştırır; günlükte bitmiş öğeler atlanır
+
+        Args:
+            urls (iterable): YouTube URL'leri veya video ID'leri
+
+        Yields:
+            SubtitleResult: Bu çalıştırmada işlenen her (video, dil) öğesinin sonucu
+        """
+        finished = self.journal.finished_keys(self.max_attempts)
+        self.skipped = 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for results in iter_completed(executor, self._run_item, self._iter_work(urls, finished),
+                                              self.max_workers * 2):
+                    yield from results
+        finally:
+            self.journal.commit()
+
+    def _iter_work(self, urls, finished):
+        """
+        Günlükte bitmemiş öğeleri (url, video_id, diller) olarak üretir
+
+        `iter_completed`'ın besleyici iş parçacığında çalışır; `skipped`
+        yalnızca burada güncellenir.
+        """
+        for url in urls:
+            video_id = extract_video_id(url)
+            if not video_id:
+                yield url, None, None
+                continue
+
+            language_codes = [code for code in self.language_codes if (video_id, code) not in finished]
+            self.skipped += len(self.language_codes) - len(language_codes)
+            if not language_codes:
+                continue
+
+            self.journal.add(video_id, language_codes)
+            yield url, video_id, language_codes
+
+    def _run_item(self, item):
+        """Tek bir videonun dillerini çeker ve sonuçları günlüğe yazar."""
+        url, video_id, language_codes = item
+        if video_id is None:
+            return [SubtitleResult(url, None, None, error=ValueError(f"Geçersiz YouTube URL'si: {url}"))]
+
+        try:
+            results = list(self.fetcher.fetch_subtitles(video_id, language_codes).values())
+        except Exception as e:
+            results = [SubtitleResult(url, video_id, language_code, error=e) for language_code in language_codes]
+
+        for result in results:
+            result.url = url
+            if result.ok:
+                self.journal.mark_done(video_id, result.language_code)
+            else:
+                self.journal.mark_failed(video_id, result.language_code, result.error, is_retryable(result.error))
+        return results
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+
+class MetadataCache:
+    """
+    Video ID'sine göre anahtarlanan, bellek içi altyazı izi önbelleği.
+
+    yt_dlp'nin `extract_info` çağrısından dönen `subtitles` ve
+    `automatic_captions` tablolarını saklar; böylece dil listeleme ve
+    altyazı indirme aynı video için tek bir çıkarım ile yapılabilir.
+
+    Özellikler:
+    - LRU (en uzun süre kullanılmayan önce atılır) boyut sınırı
+    - TTL; altyazı URL'lerindeki imzalı `expire` süresinden her zaman kısa
+    - İş parçacığı (thread) güvenli
+    """
+
+    def __init__(self, max_entries=256, ttl=1800, expiry_margin=300):
+        """
+        Args:
+            max_entries (int): Önbellekte tutulacak en fazla video sayısı
+            ttl (float): Bir kaydın geçerli kalacağı en uzun süre (saniye)
+            expiry_margin (float): İmzalı URL'nin bitişinden önce bırakılacak pay (saniye)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.expiry_margin = expiry_margin
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, video_id):
+        """
+        Önbellekteki altyazı tablolarını döndürür
+
+        Args:
+            video_id (str): Video ID'si
+
+        Returns:
+            tuple: (subtitles, automatic_captions) veya None (kayıt yoksa / süresi dolmuşsa)
+        """
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                return None
+
+            deadline, tracks = entry
+            if deadline <= time.monotonic():
+                del self._entries[video_id]
+                return None
+
+            self._entries.move_to_end(video_id)
+            return tracks
+
+    def put(self, video_id, subtitles, automatic_captions):
+        """
+        Bir videonun altyazı tablolarını önbelleğe ekler
+
+        Args:
+            video_id (str): Video ID'si
+            subtitles (dict): Manuel altyazı tablosu
+            automatic_captions (dict): Otomatik altyazı tablosu
+        """
+        now = time.monotonic()
+        deadline = now + self.ttl
+
+        # İmzalı URL'ler süresi dolmadan önce önbellekten düşmeli
+        expire = self._find_url_expiry(subtitles) or self._find_url_expiry(automatic_captions)
+        if expire is not None:
+            deadline = min(deadline, now + (expire - time.time()) - self.expiry_margin)
+
+        if deadline <= now:
+            return
+
+        with self._lock:
+            self._entries[video_id] = (deadline, (subtitles, automatic_captions))
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, video_id=None):
+        """
+        Önbellekten kayıt siler
+
+        Args:
+            video_id (str): Silinecek video ID'si; None ise tüm önbellek temizlenir
+        """
+        with self._lock:
+            if video_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(video_id, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    @staticmethod
+    def _find_url_expiry(tracks):
+        """Tablodaki ilk altyazı URL'sinin `expire` zaman damgasını döndürür."""
+        for track_list in tracks.values():
+            for track in track_list:
+                url = track.get('url')
+                if not url:
+                    continue
+                expire = parse_qs(urlparse(url).query).get('expire')
+                if expire:
+                    try:
+                        return float(expire[0])
+                    except ValueError:
+                        return None
+                # Aynı çıkarımdaki tüm URL'ler aynı süreyle imzalanır
+                return None
+        return None
+
+
+# Modüller arasında paylaşılan varsayılan önbellek
+default_metadata_cache = MetadataCache()
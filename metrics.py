@@ -0,0 +1,236 @@
+import json
+import os
+import sys
+import threading
+import time
+
+
+class MetricsCollector:
+    """
+    Altyazı çekicisinin aşama bazlı ölçümlerini toplayan nesne.
+
+    Fetcher'a `metrics=MetricsCollector()` olarak verildiğinde şunları kaydeder:
+    - Her aşamanın (extract, download, convert) süresi
+    - İndirilen bayt sayısı
+    - Önbellek isabet / ıskalama sayıları (metadata, disk)
+    - Aşama ve istisna türüne göre hatalar
+
+    `metrics` verilmediğinde fetcher yalnızca `None` kontrolü yapar; ölçüm
+    kapalıyken zaman ölçümü dahil hiçbir ek iş yapılmaz. İsteğe bağlı
+    `callback` her olayı sözlük olarak alır.
+    """
+
+    def __init__(self, callback=None):
+        """
+        Args:
+            callback (callable): Her olayda `callback(event)` ile çağrılır; event bir sözlüktür
+        """
+        self.callback = callback
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Tüm sayaçları sıfırlar."""
+        with self._lock:
+            self.started_at = time.time()
+            self.phases = {}
+            self.bytes_downloaded = 0
+            self.cache_hits = {}
+            self.cache_misses = {}
+            self.failures = {}
+
+    def observe_phase(self, phase, seconds):
+        """
+        Bir aşamanın süresini kaydeder
+
+        Args:
+            phase (str): Aşama adı ('extract', 'download', 'convert')
+            seconds (float): Geçen süre (saniye)
+        """
+        with self._lock:
+            stats = self.phases.get(phase)
+            if stats is None:
+                stats = self.phases[phase] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += seconds
+            if seconds > stats[2]:
+                stats[2] = seconds
+        if self.callback is not None:
+            self.callback({'event': 'phase', 'phase': phase, 'seconds': seconds})
+
+    def add_bytes(self, count):
+        """İndirilen bayt sayısını ekler."""
+        with self._lock:
+            self.bytes_downloaded += count
+        if self.callback is not None:
+            self.callback({'event': 'bytes', 'bytes': count})
+
+    def cache_hit(self, cache):
+        """Önbellek isabetini kaydeder ('metadata' veya 'disk')."""
+        with self._lock:
+            self.cache_hits[cache] = self.cache_hits.get(cache, 0) + 1
+        if self.callback is not None:
+            self.callback({'event': 'cache_hit', 'cache': cache})
+
+    def cache_miss(self, cache):
+        """Önbellek ıskalamasını kaydeder ('metadata' veya 'disk')."""
+        with self._lock:
+            self.cache_misses[cache] = self.cache_misses.get(cache, 0) + 1
+        if self.callback is not None:
+            self.callback({'event': 'cache_miss', 'cache': cache})
+
+    def failure(self, phase, exc):
+        """
+        Bir aşamada oluşan hatayı istisna türüne göre kaydeder
+
+        Args:
+            phase (str): Hatanın oluştuğu aşama
+            exc (BaseException): Yakalanan istisna
+        """
+        key = (phase, type(exc).__name__)
+        with self._lock:
+            self.failures[key] = self.failures.get(key, 0) + 1
+        if self.callback is not None:
+            self.callback({'event': 'failure', 'phase': phase, 'exception': key[1], 'message': str(exc)})
+
+    def summary(self):
+        """
+        Toplanan ölçümlerin JSON'a uygun özetini döndürür
+
+        Returns:
+            dict: Aşama süreleri, bayt, önbellek ve hata sayaçları
+        """
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'uptime_seconds': time.time() - self.started_at,
+                'phases': {
+                    phase: {
+                        'count': count,
+                        'total_seconds': total,
+                        'mean_seconds': total / count if count else 0.0,
+                        'max_seconds': maximum,
+                    }
+                    for phase, (count, total, maximum) in self.phases.items()
+                },
+                'bytes_downloaded': self.bytes_downloaded,
+                'cache_hits': dict(self.cache_hits),
+                'cache_misses': dict(self.cache_misses),
+                'failures': [
+                    {'phase': phase, 'exception': name, 'count': count}
+                    for (phase, name), count in self.failures.items()
+                ],
+            }
+
+    def to_prometheus(self, prefix='subtitle_fetch'):
+        """
+        Ölçümleri Prometheus metin biçiminde döndürür
+
+        Args:
+            prefix (str): Metrik adlarının öneki
+
+        Returns:
+            str: Prometheus exposition formatında metin
+        """
+        with self._lock:
+            lines = [
+                f'# HELP {prefix}_phase_seconds Aşama süreleri',
+                f'# TYPE {prefix}_phase_seconds summary',
+            ]
+            for phase, (count, total, _) in sorted(self.phases.items()):
+                lines.append(f'{prefix}_phase_seconds_sum{{phase="{phase}"}} {total}')
+                lines.append(f'{prefix}_phase_seconds_count{{phase="{phase}"}} {count}')
+
+            lines.append(f'# HELP {prefix}_phase_max_seconds En uzun aşama süresi')
+            lines.append(f'# TYPE {prefix}_phase_max_seconds gauge')
+            for phase, (_, _, maximum) in sorted(self.phases.items()):
+                lines.append(f'{prefix}_phase_max_seconds{{phase="{phase}"}} {maximum}')
+
+            lines.append(f'# HELP {prefix}_downloaded_bytes_total İndirilen altyazı baytları')
+            lines.append(f'# TYPE {prefix}_downloaded_bytes_total counter')
+            lines.append(f'{prefix}_downloaded_bytes_total {self.bytes_downloaded}')
+
+            for name, help_text, counters in (('cache_hits', 'Önbellek isabetleri', self.cache_hits),
+                                              ('cache_misses', 'Önbellek ıskalamaları', self.cache_misses)):
+                lines.append(f'# HELP {prefix}_{name}_total {help_text}')
+                lines.append(f'# TYPE {prefix}_{name}_total counter')
+                for cache, count in sorted(counters.items()):
+                    lines.append(f'{prefix}_{name}_total{{cache="{cache}"}} {count}')
+
+            lines.append(f'# HELP {prefix}_failures_total Aşama ve istisna türüne göre hatalar')
+            lines.append(f'# TYPE {prefix}_failures_total counter')
+            for (phase, name), count in sorted(self.failures.items()):
+                lines.append(f'{prefix}_failures_total{{phase="{phase}",exception="{name}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path, prefix='subtitle_fetch'):
+        """
+        Ölçümleri Prometheus metin dosyasına atomik olarak yazar
+
+        node_exporter'ın textfile toplayıcısı ile kullanılabilir.
+
+        Args:
+            path (str): Hedef dosya yolu
+            prefix (str): Metrik adlarının öneki
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(tmp_path, path)
+
+
+class JsonSummaryExporter:
+    """
+    Ölçüm özetini belirli aralıklarla JSON satırı olarak yazan arka plan iş parçacığı.
+
+    Örnek:
+        metrics = MetricsCollector()
+        with JsonSummaryExporter(metrics, interval=30):
+            for result in YouTubeSubtitleFetcher(metrics=metrics).fetch_batch(urls, ['tr']):
+                ...
+    """
+
+    def __init__(self, collector, stream=None, interval=60.0):
+        """
+        Args:
+            collector (MetricsCollector): Özeti yazılacak ölçüm nesnesi
+            stream: `write` metodu olan metin akışı; None ise sys.stderr
+            interval (float): Yazma aralığı (saniye)
+        """
+        self.collector = collector
+        self.stream = stream
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Periyodik yazmayı başlatır."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Periyodik yazmayı durdurur ve son özeti yazar."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def write(self):
+        """Güncel özeti bir JSON satırı olarak yazar."""
+        stream = self.stream or sys.stderr
+        stream.write(json.dumps(self.collector.summary()) + '\n')
+        stream.flush()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
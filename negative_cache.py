@@ -0,0 +1,275 @@
+import os
+import sqlite3
+import threading
+import time
+from rate_limit import is_throttle_error
+from subtitle_store import default_cache_path
+
+# Olumsuz sonuç sınıfları
+NO_CAPTIONS = 'no_captions'
+UNAVAILABLE = 'unavailable'
+GEO_BLOCKED = 'geo_blocked'
+TRANSIENT = 'transient'
+
+# Sınıf -> kaydın geçerli kalacağı süre (saniye). Otomatik altyazılar yüklemeden
+# saatler sonra oluşabildiği için "altyazı yok" sonucu bir günle sınırlıdır;
+# geçici hatalar yalnızca aynı çalıştırmadaki tekrarları önleyecek kadar tutulur.
+DEFAULT_TTLS = {
+    NO_CAPTIONS: 24 * 3600,
+    UNAVAILABLE: 7 * 24 * 3600,
+    GEO_BLOCKED: 3 * 24 * 3600,
+    TRANSIENT: 300,
+}
+
+# yt_dlp'nin "beklenen" hata mesajlarında coğrafi kısıtlamayı gösteren ifadeler
+_GEO_MARKERS = ('in your country', 'from your location', 'geo restrict', 'geo-restrict')
+
+
+def default_negative_cache_path():
+    """
+    Olumsuz sonuç önbelleği dosyasının varsayılan konumunu döndürür
+
+    Returns:
+        str: Altyazı önbelleğiyle aynı dizindeki SQLite dosya yolu
+    """
+    return os.path.join(os.path.dirname(default_cache_path()), 'negative.sqlite3')
+
+
+def classify_error(error):
+    """
+    Çıkarım hatasını olumsuz sonuç sınıfına ayırır
+
+    yt_dlp'nin `DownloadError` sarmalayıcısı açılır; coğrafi kısıtlamalar,
+    özel/silinmiş/erişilemeyen videolar ve geçici ağ/sunucu hataları ayrılır.
+    Hız sınırı ve bot kontrolü videoya değil isteğe bağlı olduğundan, tanınmayan
+    hatalar da videoyla ilgili bir şey söylemediğinden sınıflandırılmaz; bu
+    hatalar olumsuz önbelleğe yazılmaz, geri çekilme hız sınırlayıcıya bırakılır.
+
+    Args:
+        error (Exception): Yakalanan istisna
+
+    Returns:
+        str: NO_CAPTIONS dışındaki sınıflardan biri veya None (hız sınırı ya da tanınmayan hata)
+    """
+    from yt_dlp.utils import DownloadError, ExtractorError, GeoRestrictedError, network_exceptions
+
+    if isinstance(error, DownloadError) and error.exc_info and error.exc_info[1] is not None:
+        error = error.exc_info[1]
+
+    if isinstance(error, GeoRestrictedError):
+        return GEO_BLOCKED
+    if is_throttle_error(error):
+        return None
+
+    if isinstance(error, ExtractorError):
+        cause = error.exc_info[1] if error.exc_info else None
+        if isinstance(cause, network_exceptions):
+            error = cause
+        else:
+            message = error.orig_msg.lower()
+            if any(marker in message for marker in _GEO_MARKERS):
+                return GEO_BLOCKED
+            # Beklenen hatalar videonun kendisiyle ilgilidir (özel, silinmiş, üyelere özel...)
+            return UNAVAILABLE if error.expected else None
+
+    # Sayfa hiç yoksa video kalıcı olarak erişilemez; diğer HTTP/ağ hataları geçicidir
+    if getattr(error, 'status', None) in (404, 410):
+        return UNAVAILABLE
+    if isinstance(error, network_exceptions + (OSError,)):
+        return TRANSIENT
+    return None
+
+
+class NegativeResult:
+    """
+    Olumsuz önbellekteki tek bir kayıt.
+    """
+
+    __slots__ = ('video_id', 'outcome', 'message', 'expires_at')
+
+    def __init__(self, video_id, outcome, message, expires_at):
+        self.video_id = video_id
+        self.outcome = outcome
+        self.message = message
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        return f"NegativeResult({self.video_id!r}, {self.outcome!r})"
+
+
+class CachedFailureError(Exception):
+    """
+    Video için önbellekte geçerli bir hata kaydı bulunduğunda, yt_dlp
+    çağrılmadan yükseltilen istisna.
+    """
+
+    def __init__(self, result):
+        super().__init__(f"{result.message or result.outcome} (önbellekten: {result.outcome})")
+        self.video_id = result.video_id
+        self.outcome = result.outcome
+        self.expires_at = result.expires_at
+
+
+class NegativeCache:
+    """
+    Altyazısı olmayan veya kalıcı hata veren videoları hatırlayan SQLite tabanlı önbellek.
+
+    Her sonuç sınıfının (altyazı yok, erişilemiyor, coğrafi kısıtlı, geçici
+    hata) kendi geçerlilik süresi vardır. Kayıtlar diskte tutulduğundan
+    tekrarlanan işler aynı videoları her çalıştırmada yeniden çıkarmaz.
+    İş parçacığı güvenlidir; aynı dosya birden fazla süreçten kullanılabilir.
+
+    Örnek:
+        fetcher = YouTubeSubtitleFetcher(negative_cache=NegativeCache())
+    """
+
+    def __init__(self, path=None, ttls=None):
+        """
+        Args:
+            path (str): SQLite dosya yolu; None ise `default_negative_cache_path()` kullanılır
+            ttls (dict): Sınıf bazında geçerlilik süreleri (saniye); verilmeyen sınıflar için
+                         `DEFAULT_TTLS` kullanılır. Süresi 0 olan sınıflar kaydedilmez
+        """
+        self.path = path or default_negative_cache_path()
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS negative_results (
+                video_id TEXT PRIMARY KEY,
+                outcome TEXT NOT NULL,
+                message TEXT NOT NULL,
+                recorded_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+    def get(self, video_id):
+        """
+        Videonun geçerli olumsuz kaydını döndürür
+
+        Args:
+            video_id (str): Video ID'si
+
+        Returns:
+            NegativeResult: Kayıt veya None (kayıt yoksa / süresi dolmuşsa)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT outcome, message, expires_at FROM negative_results WHERE video_id = ?',
+                (video_id,)).fetchone()
+            if row is None:
+                return None
+            if row[2] <= time.time():
+                self._conn.execute(
+                    'DELETE FROM negative_results WHERE video_id = ? AND expires_at = ?', (video_id, row[2]))
+                return None
+        return NegativeResult(video_id, row[0], row[1], row[2])
+
+    def put(self, video_id, outcome, message=''):
+        """
+        Videonun olumsuz sonucunu sınıfının süresiyle kaydeder
+
+        Args:
+            video_id (str): Video ID'si
+            outcome (str): Sonuç sınıfı (NO_CAPTIONS, UNAVAILABLE, GEO_BLOCKED, TRANSIENT)
+            message (str): Hata mesajı
+        """
+        if outcome not in self.ttls:
+            raise ValueError(f"Bilinmeyen sonuç sınıfı: {outcome}")
+        ttl = self.ttls[outcome]
+        if ttl <= 0:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO negative_results '
+                '(video_id, outcome, message, recorded_at, expires_at) VALUES (?, ?, ?, ?, ?)',
+                (video_id, outcome, message, now, now + ttl))
+
+    def record_error(self, video_id, error):
+        """
+        Çıkarım hatasını sınıflandırıp kaydeder; hız sınırı ve tanınmayan hatalar kaydedilmez
+
+        Args:
+            video_id (str): Video ID'si
+            error (Exception): Yakalanan istisna
+
+        Returns:
+            str: Kaydedilen sınıf veya None (kaydedilmediyse)
+        """
+        outcome = classify_error(error)
+        if outcome is not None:
+            self.put(video_id, outcome, str(error))
+        return outcome
+
+    def invalidate(self, video_id=None, outcome=None):
+        """
+        Kayıtları siler
+
+        Args:
+            video_id (str): Kaydı silinecek video ID'si; None ise tüm videolar
+            outcome (str): Yalnızca bu sınıftaki kayıtları sil; None ise tüm sınıflar
+        """
+        query = 'DELETE FROM negative_results'
+        conditions = []
+        params = []
+        if video_id is not None:
+            conditions.append('video_id = ?')
+            params.append(video_id)
+        if outcome is not None:
+            conditions.append('outcome = ?')
+            params.append(outcome)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+
+        with self._lock:
+            self._conn.execute(query, params)
+
+    def purge_expired(self):
+        """
+        Süresi dolmuş kayıtları siler
+
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        with self._lock:
+            return self._conn.execute(
+                'DELETE FROM negative_results WHERE expires_at <= ?', (time.time(),)).rowcount
+
+    def counts(self):
+        """
+        Geçerli kayıtların sınıf bazında sayısını döndürür
+
+        Returns:
+            dict: {sınıf: kayıt sayısı}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT outcome, COUNT(*) FROM negative_results WHERE expires_at > ? GROUP BY outcome',
+                (time.time(),)).fetchall()
+        return dict(rows)
+
+    def __len__(self):
+        return sum(self.counts().values())
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
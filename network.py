@@ -0,0 +1,189 @@
+import random
+import threading
+import time
+from rate_limit import FAILED, THROTTLED, status_outcome
+
+# `requests` ve `yt_dlp` yüklenmesi yüzlerce milisaniye sürer; ilk istekte içe aktarılırlar
+
+
+class RetryPolicy:
+    """
+    Geçici hatalarda yeniden deneme politikası.
+
+    Bekleme süresi her denemede iki katına çıkar (üstel geri çekilme) ve
+    aynı anda başarısız olan isteklerin sunucuya birlikte dönmemesi için
+    rastgele dağıtılır (full jitter).
+    """
+
+    def __init__(self, max_attempts=3, backoff_base=0.5, backoff_max=8.0,
+                 retry_statuses=(429, 500, 502, 503, 504)):
+        """
+        Args:
+            max_attempts (int): İlk deneme dahil en fazla deneme sayısı
+            backoff_base (float): İlk yeniden denemeden önceki en uzun bekleme (saniye)
+            backoff_max (float): Tek bir bekleme için üst sınır (saniye)
+            retry_statuses (tuple): Yeniden denenecek HTTP durum kodları
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Verilen denemeden sonra beklenecek süreyi hesaplar
+
+        Args:
+            attempt (int): Başarısız olan denemenin sırası (0'dan başlar)
+            retry_after (str): Sunucunun `Retry-After` başlığı (varsa)
+
+        Returns:
+            float: Bekleme süresi (saniye)
+        """
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class HttpClient:
+    """
+    Uzun ömürlü `requests.Session` ile yeniden denemeli HTTP istemcisi.
+
+    Oturum bağlantı havuzunu ve TLS bağlantılarını istekler arasında yeniden
+    kullanır. Havuz boyutu iş parçacığı sayısına göre ayarlanabilir; aynı
+    nesne birden fazla iş parçacığından kullanılabilir.
+    """
+
+    def __init__(self, retry_policy=None, pool_maxsize=32, timeout=10, rate_limiter=None):
+        """
+        Args:
+            retry_policy (RetryPolicy): Yeniden deneme politikası; None ise varsayılan politika
+            pool_maxsize (int): Sunucu başına açık tutulacak en fazla bağlantı sayısı
+            timeout (float): İstek zaman aşımı (saniye)
+            rate_limiter (RateLimiter): Her denemeden önce yuva ve jeton alınacak sınırlayıcı;
+                                        None ise sınırlama yapılmaz
+        """
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Paylaşılan `requests.Session`; ilk kullanımda oluşturulur."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    # Yeniden denemeyi urllib3 yerine kendimiz yönetiyoruz
+                    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=self.pool_maxsize, max_retries=0)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+
+    def get(self, url, stream=False):
+        """
+        GET isteği gönderir; bağlantı hatalarında ve geçici durum kodlarında yeniden dener
+
+        Args:
+            url (str): İstek adresi
+            stream (bool): True ise gövde akış halinde okunur
+
+        Returns:
+            requests.Response: Son denemenin yanıtı (durum kodu çağıran tarafından kontrol edilir)
+        """
+        import requests
+
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = self._send(url, stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt + 1 >= policy.max_attempts:
+                    raise
+            else:
+                if response.status_code not in policy.retry_statuses or attempt + 1 >= policy.max_attempts:
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+
+            time.sleep(policy.delay(attempt, retry_after))
+            attempt += 1
+
+    def _send(self, url, stream):
+        """Tek bir isteği gönderir; sınırlayıcı varsa yuva alır ve sonucu bildirir."""
+        import requests
+
+        limiter = self.rate_limiter
+        if limiter is None:
+            return self.session.get(url, timeout=self.timeout, stream=stream)
+
+        start = limiter.acquire()
+        try:
+            response = self.session.get(url, timeout=self.timeout, stream=stream)
+        except requests.Timeout:
+            limiter.release(start, THROTTLED)
+            raise
+        except Exception:
+            limiter.release(start, FAILED)
+            raise
+        # Akış halindeki yanıtlarda gecikme başlıkların gelişine kadar ölçülür
+        limiter.release(start, status_outcome(response.status_code), response.headers.get('Retry-After'))
+        return response
+
+    def close(self):
+        """Oturumu ve bağlantı havuzunu kapatır."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+class YoutubeDLPool:
+    """
+    Her seçenek seti için uzun ömürlü `yt_dlp.YoutubeDL` nesneleri sağlar.
+
+    YoutubeDL nesneleri iş parçacığı güvenli olmadığından her iş parçacığı
+    kendi örneğini alır; örnekler aynı iş parçacığında sonraki çıkarımlar için
+    saklanır. Böylece çıkarıcı (extractor) başlatma ve çerez kabı kurulumu her
+    çağrıda tekrarlanmaz.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self, ydl_opts):
+        """
+        Seçenek setine ait YoutubeDL nesnesini döndürür
+
+        Args:
+            ydl_opts (dict): yt_dlp seçenekleri
+
+        Returns:
+            yt_dlp.YoutubeDL: Bu iş parçacığına ait örnek
+        """
+        instances = getattr(self._local, 'instances', None)
+        if instances is None:
+            instances = self._local.instances = {}
+
+        key = repr(sorted(ydl_opts.items()))
+        ydl = instances.get(key)
+        if ydl is None:
+            import yt_dlp
+            ydl = instances[key] = yt_dlp.YoutubeDL(dict(ydl_opts))
+        return ydl
+
+
+# Modüller arasında paylaşılan varsayılan istemci ve YoutubeDL havuzu
+default_http_client = HttpClient()
+default_ydl_pool = YoutubeDLPool()
@@ -0,0 +1,158 @@
+from urllib.parse import urlparse, parse_qs
+from network import default_ydl_pool
+from video_ids import is_video_id
+
+# Düz (flat) çıkarım: oynatma listesi girdileri tek tek çözülmez, yalnızca ID'leri okunur
+FLAT_YDL_OPTS = {
+    'skip_download': True,
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': 'in_playlist',
+    'lazy_playlist': True,
+}
+
+# Kanal ve oynatma listesi adreslerinin yol önekleri
+_COLLECTION_PATH_PREFIXES = ('/playlist', '/@', '/channel/', '/c/', '/user/')
+# Oynatma listesi ve kanal sayfası sunan alan adları (alt alan adları dahil değil)
+_COLLECTION_HOSTS = frozenset(('youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com'))
+# Otomatik üretilen, sonu olmayan karışık listeler (Mix, "yüklenenleri oynat")
+_MIX_LIST_PREFIXES = ('RD', 'UL')
+
+
+def is_collection_url(url, expand_watch_lists=False):
+    """
+    URL'nin açılması gereken bir oynatma listesi veya kanal adresi olup olmadığını kontrol eder
+
+    Bir videoyu izlerken kopyalanan adresler çoğunlukla `list=` de taşır;
+    `v=` içeren izleme adresleri bu yüzden tek video sayılır ve ancak
+    `expand_watch_lists` verildiğinde listeye açılır. YouTube'un otomatik
+    ürettiği karışık listeler (`RD`, `UL` önekli) hiçbir zaman açılmaz.
+
+    Args:
+        url (str): YouTube URL'si
+        expand_watch_lists (bool): `v=` ve `list=` birlikte varsa listeyi aç
+
+    Returns:
+        bool: Oynatma listesi veya kanal adresiyse True
+    """
+    parsed_url = urlparse(url)
+    try:
+        host = (parsed_url.hostname or '').lower()
+    except ValueError:
+        return False
+    if host not in _COLLECTION_HOSTS:
+        return False
+
+    query = parse_qs(parsed_url.query)
+    list_id = query.get('list', [''])[0]
+    if list_id.startswith(_MIX_LIST_PREFIXES):
+        return False
+    if parsed_url.path.startswith(_COLLECTION_PATH_PREFIXES):
+        return parsed_url.path != '/playlist' or bool(list_id)
+    if not list_id:
+        return False
+    return expand_watch_lists or 'v' not in query
+
+
+def iter_playlist_video_ids(url, ydl=None, max_depth=2):
+    """
+    Oynatma listesi veya kanal adresindeki video ID'lerini bulundukça üretir
+
+    yt_dlp'nin düz çıkarım modu kullanılır; videolar tek tek çözülmez ve
+    sayfalar tembel okunur. Böylece binlerce videolu bir kanalda da ilk ID'ler
+    listenin tamamı beklenmeden elde edilir. Kanal sekmeleri (videolar,
+    canlı yayınlar vb.) gibi iç içe listeler `max_depth` derinliğine kadar
+    açılır; aynı video birden fazla kez üretilmez. Hatalar yakalanmaz.
+
+    Args:
+        url (str): Oynatma listesi, kanal veya video adresi
+        ydl: `extract_info` metodu olan çıkarıcı; None ise paylaşılan havuzdan düz çıkarım örneği
+        max_depth (int): İzlenecek en fazla iç içe liste derinliği
+
+    Yields:
+        str: Video ID'si
+    """
+    # Havuz örneği iş parçacığına özel; üreteci tüketen iş parçacığında alınmalı
+    # (örn. `fetch_batch` girdiyi ayrı bir besleyici iş parçacığında okur)
+    if ydl is None:
+        ydl = default_ydl_pool.get(FLAT_YDL_OPTS)
+    yield from _walk_url(ydl, url, set(), 0, max_depth)
+
+
+def expand_urls(urls, ydl=None, max_depth=2, expand_watch_lists=False, on_error=None):
+    """
+    URL akışındaki oynatma listesi ve kanal adreslerini video ID'lerine açar
+
+    Diğer girdiler (video URL'leri, çıplak ID'ler) olduğu gibi geçirilir.
+    Çıktı doğrudan `YouTubeSubtitleFetcher.fetch_batch` metoduna verilebilir.
+
+    Args:
+        urls (iterable): URL'ler veya video ID'leri
+        ydl: `extract_info` metodu olan çıkarıcı; None ise paylaşılan havuzdan düz çıkarım örneği
+        max_depth (int): İzlenecek en fazla iç içe liste derinliği
+        expand_watch_lists (bool): `v=` ve `list=` taşıyan izleme adreslerini de listeye aç
+        on_error (callable): Açılamayan adres için `on_error(url, hata)` çağrılır ve
+                             sonraki girdiye geçilir; None ise hata yükseltilir
+
+    Yields:
+        str: Video URL'si veya video ID'si
+    """
+    for url in urls:
+        if not is_collection_url(url, expand_watch_lists):
+            yield url
+            continue
+        try:
+            yield from iter_playlist_video_ids(url, ydl=ydl, max_depth=max_depth)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(url, e)
+
+
+def fetch_playlist_subtitles(fetcher, url, language_codes, max_workers=8, ydl=None):
+    """
+    Oynatma listesi veya kanaldaki videoların altyazılarını paralel çeker
+
+    ID'ler bulundukça indirme havuzuna verilir; indirmeler listenin
+    tamamının okunmasını beklemeden başlar.
+
+    Args:
+        fetcher (YouTubeSubtitleFetcher): Altyazıları çekecek nesne
+        url (str): Oynatma listesi veya kanal adresi
+        language_codes (list): Tercih sırasına göre dil kodları
+        max_workers (int): Havuzdaki iş parçacığı sayısı
+        ydl: `extract_info` metodu olan çıkarıcı; None ise paylaşılan havuzdan düz çıkarım örneği
+
+    Yields:
+        SubtitleResult: Tamamlanma sırasına göre her videonun sonucu
+    """
+    video_ids = iter_playlist_video_ids(url, ydl=ydl)
+    return fetcher.fetch_batch(video_ids, language_codes, max_workers=max_workers)
+
+
+def _walk_url(ydl, url, seen, depth, max_depth):
+    info = ydl.extract_info(url, download=False, process=False)
+    if info:
+        yield from _walk_result(ydl, info, seen, depth, max_depth)
+
+
+def _walk_result(ydl, info, seen, depth, max_depth):
+    result_type = info.get('_type', 'video')
+
+    if result_type in ('playlist', 'multi_video'):
+        # `entries` tembel bir üreteç olabilir; sayfalar okundukça gelir
+        for entry in info.get('entries') or ():
+            if entry:
+                yield from _walk_result(ydl, entry, seen, depth, max_depth)
+        return
+
+    video_id = info.get('id')
+    if info.get('ie_key', 'Youtube') == 'Youtube' and video_id and is_video_id(video_id):
+        if video_id not in seen:
+            seen.add(video_id)
+            yield video_id
+        return
+
+    # Kanal sekmesi veya başka bir listeye yönlendirme
+    if result_type in ('url', 'url_transparent') and info.get('url') and depth < max_depth:
+        yield from _walk_url(ydl, info['url'], seen, depth + 1, max_depth)
@@ -0,0 +1,306 @@
+import threading
+import time
+
+# İstek sonuçları
+OK = 'ok'
+THROTTLED = 'throttled'
+FAILED = 'failed'
+
+# Sunucunun aşırı yüklendiğini gösteren durum kodları
+THROTTLE_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# yt_dlp hata mesajlarında hız sınırı / bot kontrolünü gösteren ifadeler
+_THROTTLE_MARKERS = ('http error 429', 'too many requests', 'rate-limit', 'rate limit',
+                     'try again later', 'captcha', 'not a bot')
+
+
+class ThrottledError(Exception):
+    """
+    Sunucu isteği hız sınırı veya bot kontrolü nedeniyle reddettiğinde yükseltilir.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def status_outcome(status):
+    """
+    HTTP durum kodunu istek sonucuna çevirir
+
+    Args:
+        status (int): HTTP durum kodu
+
+    Returns:
+        str: OK, THROTTLED (429/5xx) veya FAILED (diğer hatalar)
+    """
+    if status in THROTTLE_STATUSES:
+        return THROTTLED
+    return OK if status < 400 else FAILED
+
+
+def is_throttle_error(error):
+    """
+    İstisnanın hız sınırı, bot kontrolü veya sunucu aşırı yükünden kaynaklanıp kaynaklanmadığını döndürür
+
+    yt_dlp'nin `DownloadError`/`ExtractorError` sarmalayıcıları açılır; HTTP
+    durum kodu varsa ona, yoksa hata mesajına bakılır.
+
+    Args:
+        error (Exception): Yakalanan istisna
+
+    Returns:
+        bool: Sınırlama kaynaklıysa True
+    """
+    if isinstance(error, ThrottledError):
+        return True
+    from yt_dlp.utils import DownloadError, ExtractorError
+
+    if isinstance(error, DownloadError) and error.exc_info and error.exc_info[1] is not None:
+        error = error.exc_info[1]
+    if isinstance(error, ExtractorError) and error.exc_info and error.exc_info[1] is not None \
+            and error.exc_info[1] is not error:
+        if is_throttle_error(error.exc_info[1]):
+            return True
+
+    # yt_dlp HTTPError'da `status`, requests HTTPError'da `response.status_code`
+    status = getattr(error, 'status', None)
+    response = getattr(error, 'response', None)
+    if status is None and response is not None:
+        status = getattr(response, 'status_code', None)
+    if isinstance(status, int) and status in THROTTLE_STATUSES:
+        return True
+
+    message = str(error).lower()
+    return any(marker in message for marker in _THROTTLE_MARKERS)
+
+
+def raise_for_status(response):
+    """
+    `requests` yanıtındaki hata durumunu istisnaya çevirir; 429 için `ThrottledError` yükseltir
+
+    Args:
+        response (requests.Response): HTTP yanıtı
+    """
+    if response.status_code == 429:
+        raise ThrottledError(f"İstek sınırına takıldı (HTTP 429): {response.url}",
+                             response.headers.get('Retry-After'))
+    response.raise_for_status()
+
+
+def _parse_retry_after(retry_after):
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Saniyede `rate` isteğe izin veren, `burst` kadar birikebilen jeton kovası.
+
+    Jetonlar rezervasyonla alınır: `reserve` jetonu hemen düşer ve
+    beklenmesi gereken süreyi döndürür. Böylece aynı kova hem iş
+    parçacıklarından (`acquire`) hem asyncio'dan (`acquire_async`) kullanılabilir.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate (float): Saniyedeki jeton sayısı
+            burst (float): Kovanın kapasitesi; None ise `max(1, rate)`
+        """
+        if rate <= 0:
+            raise ValueError("rate pozitif olmalı")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """
+        Jeton ayırır ve kullanılmadan önce beklenecek süreyi döndürür
+
+        Args:
+            tokens (float): Ayrılacak jeton sayısı
+
+        Returns:
+            float: Bekleme süresi (saniye)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self, tokens=1):
+        """Jeton kullanılabilir olana kadar bekler."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1):
+        """`acquire`'ın asyncio karşılığı."""
+        import asyncio
+
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """
+        Kovayı verilen süre boyunca durdurur (örn. sunucunun `Retry-After` değeri)
+
+        Args:
+            seconds (float): Bekleme süresi (saniye)
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """
+    Tek bir sunucu grubu için jeton kovası ve AIMD eşzamanlılık denetimi.
+
+    Jeton kovası saniyedeki istek sayısına sabit bir üst sınır koyar.
+    Eşzamanlılık sınırı ise gözlemlenen yanıtlara göre ayarlanır: başarılı
+    her istekte yavaşça artar (toplamsal artış, her tur için `increase`),
+    429/5xx yanıtlarında veya gecikme `latency_target`'ı aştığında
+    `decrease` oranıyla düşer (çarpımsal azalış). Azalıştan önce başlamış
+    isteklerin sonuçları yeniden azalışa yol açmaz; böylece tek bir sınırlama
+    dalgası sınırı birden fazla kez yarıya indirmez.
+
+    Örnek:
+        limiter = RateLimiter(rate=20, max_concurrency=32)
+        start = limiter.acquire()
+        try:
+            response = session.get(url)
+        except Exception:
+            limiter.release(start, FAILED)
+            raise
+        limiter.release(start, status_outcome(response.status_code),
+                        response.headers.get('Retry-After'))
+    """
+
+    def __init__(self, rate=None, burst=None, initial_concurrency=4, min_concurrency=1,
+                 max_concurrency=64, increase=1.0, decrease=0.5, latency_target=None):
+        """
+        Args:
+            rate (float): Saniyedeki en fazla istek sayısı; None ise hız sınırı yok
+            burst (float): Jeton kovasının kapasitesi; None ise `max(1, rate)`
+            initial_concurrency (int): Başlangıçtaki eşzamanlılık sınırı
+            min_concurrency (int): Eşzamanlılığın inebileceği en düşük değer
+            max_concurrency (int): Eşzamanlılığın çıkabileceği en yüksek değer
+            increase (float): Her tam turda (sınır kadar başarılı istek) eklenecek miktar
+            decrease (float): Sınırlamada sınırın çarpılacağı oran (0-1)
+            latency_target (float): Bu süreyi (saniye) aşan yanıtlar da sınırlama sayılır; None ise kapalı
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+
+        self._limit = float(max(min_concurrency, min(initial_concurrency, max_concurrency)))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self._counts = {OK: 0, THROTTLED: 0, FAILED: 0}
+        self._decreases = 0
+
+    @property
+    def limit(self):
+        """Geçerli eşzamanlılık sınırı."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        """Şu anda süren istek sayısı."""
+        return self._in_flight
+
+    def _try_enter(self):
+        if self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return True
+        return False
+
+    def acquire(self):
+        """
+        Eşzamanlılık yuvası ve jeton alınana kadar bekler
+
+        Returns:
+            float: İsteğin başlangıç zamanı; `release`'e verilmelidir
+        """
+        with self._condition:
+            while not self._try_enter():
+                self._condition.wait()
+        if self.bucket is not None:
+            self.bucket.acquire()
+        return time.monotonic()
+
+    async def acquire_async(self):
+        """`acquire`'ın asyncio karşılığı; olay döngüsünü bloklamaz."""
+        import asyncio
+
+        delay = 0.005
+        while True:
+            with self._condition:
+                if self._try_enter():
+                    break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        if self.bucket is not None:
+            await self.bucket.acquire_async()
+        return time.monotonic()
+
+    def release(self, start, outcome=OK, retry_after=None):
+        """
+        İsteğin sonucunu bildirir ve yuvayı bırakır
+
+        Args:
+            start (float): `acquire`'dan dönen başlangıç zamanı
+            outcome (str): OK, THROTTLED veya FAILED
+            retry_after (str): Sunucunun `Retry-After` başlığı (varsa); kova bu süre boyunca durur
+        """
+        now = time.monotonic()
+        latency = now - start
+        if outcome == OK and self.latency_target is not None and latency > self.latency_target:
+            congested = True
+        else:
+            congested = outcome == THROTTLED
+
+        with self._condition:
+            self._in_flight -= 1
+            self._counts[outcome] += 1
+            if congested:
+                # Son azalıştan önce başlamış isteklerin sinyali zaten hesaba katıldı
+                if start >= self._last_decrease:
+                    self._limit = max(float(self.min_concurrency), self._limit * self.decrease)
+                    self._last_decrease = now
+                    self._decreases += 1
+            elif outcome == OK:
+                self._limit = min(float(self.max_concurrency), self._limit + self.increase / self._limit)
+            self._condition.notify_all()
+
+        pause = _parse_retry_after(retry_after) if outcome == THROTTLED else None
+        if pause and self.bucket is not None:
+            self.bucket.pause(pause)
+
+    def stats(self):
+        """
+        Sayaçları ve geçerli sınırı döndürür
+
+        Returns:
+            dict: limit, in_flight, ok, throttled, failed, decreases
+        """
+        with self._condition:
+            stats = {'limit': int(self._limit), 'in_flight': self._in_flight, 'decreases': self._decreases}
+            stats.update(self._counts)
+        return stats
@@ -0,0 +1,523 @@
+"""
+Çekilen altyazılar üzerinde zaman damgalı tam metin arama dizini.
+
+Dizin, her biri değişmez (immutable) parçalardan (segment) oluşur. Her parça:
+- `lexicon.bin` / `lexicon.idx`: sıralı terimler ve terim başına kayıt aralığı
+- `postings.bin`: (belge, konum) çiftleri; uint32 dizisi, bellek eşlemeyle (mmap) okunur
+- `cues.bin`: belge başına satır başlangıç konumları ve zamanları (milisaniye)
+- `docs.json`: belge listesi (video_id, dil, otomatik/manuel)
+
+Yeni videolar eklendiğinde yalnızca yeni bir parça yazılır; mevcut parçalar
+yeniden oluşturulmaz. Aynı video/dil birden fazla parçada varsa en yenisi
+kullanılır.
+
+Komut satırı:
+    python search_index.py add dizin/ --disk-cache
+    python search_index.py add dizin/ --export cikti/
+    python search_index.py query dizin/ "aranan ifade" --limit 20
+"""
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_right
+
+from caption_formats import parse_captions
+from vtt_parser import Cue, build_cue_list, iter_timed_text
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+MANIFEST_NAME = 'manifest.json'
+INDEX_VERSION = 1
+
+
+def tokenize(text):
+    """
+    Metni küçük harfli kelime belirteçlerine ayırır
+
+    Args:
+        text (str): Metin
+
+    Returns:
+        list: Belirteçler
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchHit:
+    """
+    Tek bir arama sonucu: ifadenin söylendiği video, dil ve zaman.
+    """
+
+    __slots__ = ('video_id', 'language', 'timestamp', 'is_auto')
+
+    def __init__(self, video_id, language, timestamp, is_auto):
+        self.video_id = video_id
+        self.language = language
+        self.timestamp = timestamp
+        self.is_auto = is_auto
+
+    @property
+    def url(self):
+        """Videoyu ilgili saniyeden açan adres."""
+        return f"https://youtu.be/{self.video_id}?t={int(self.timestamp)}"
+
+    def __repr__(self):
+        return f"SearchHit({self.video_id!r}, {self.language!r}, {self.timestamp:.3f})"
+
+
+class _Segment:
+    """Diskteki tek bir değişmez dizin parçası; terim ve kayıt dosyaları bellek eşlemeyle okunur."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'docs.json'), encoding='utf-8') as f:
+            self.docs = json.load(f)
+
+        self._files = []
+        self._views = []
+        self._lexicon = self._map('lexicon.bin')
+        self._terms = self._map_array('lexicon.idx', 'Q')
+        self._postings = self._map_array('postings.bin', 'I')
+        cues = self._map_array('cues.bin', 'I')
+        # cues.bin: önce tüm satır konumları, ardından aynı sırayla zamanlar
+        half = len(cues) // 2
+        self._cue_positions = cues[:half]
+        self._cue_times = cues[half:]
+        if isinstance(cues, memoryview):
+            self._views.extend((self._cue_positions, self._cue_times))
+        self.term_count = len(self._terms) // 4
+
+    def _map(self, name):
+        f = open(os.path.join(self.path, name), 'rb')
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._files.append(mapped)
+        return mapped
+
+    def _map_array(self, name, typecode):
+        data = self._map(name)
+        if not data:
+            return array(typecode)
+        view = memoryview(data).cast(typecode)
+        self._views.append(view)
+        return view
+
+    def postings(self, term):
+        """Terimin (belge, konum) çiftlerini düz bir uint32 dizisi olarak döndürür."""
+        key = term.encode('utf-8')
+        terms = self._terms
+        lexicon = self._lexicon
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            base = middle * 4
+            candidate = lexicon[terms[base]:terms[base + 1]]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                start = terms[base + 2]
+                return self._postings[start:start + 2 * terms[base + 3]]
+        return None
+
+    def timestamp(self, doc_id, position):
+        """Belgedeki belirteç konumunun ait olduğu satırın başlangıç zamanını (saniye) döndürür."""
+        offset, count = self.docs[doc_id][3], self.docs[doc_id][4]
+        positions = self._cue_positions[offset:offset + count]
+        index = bisect_right(positions, position) - 1
+        return self._cue_times[offset + max(index, 0)] / 1000
+
+    def close(self):
+        # Bellek eşlemesi, üzerindeki görünümler bırakılmadan kapatılamaz
+        for view in self._views:
+            view.release()
+        self._views = []
+        for f in reversed(self._files):
+            f.close()
+        self._files = []
+
+
+class SearchIndex:
+    """
+    Altyazılar üzerinde ifade araması yapan, artımlı güncellenebilen ters dizin.
+
+    Örnek:
+        index = SearchIndex('dizin/')
+        index.add_disk_cache(SubtitleDiskCache())
+        for hit in index.search("never gonna give you up"):
+            print(hit.video_id, hit.language, hit.timestamp, hit.url)
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Dizin klasörü; yoksa oluşturulur
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._segments = []
+        self._hidden = []
+        self._keys = set()
+        self._load()
+
+    def _manifest_path(self):
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path(), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {'version': INDEX_VERSION, 'byteorder': sys.byteorder, 'segments': []}
+
+        if manifest.get('byteorder') != sys.byteorder:
+            raise ValueError("Dizin farklı bayt sıralı bir sistemde oluşturulmuş")
+        return manifest
+
+    def _load(self):
+        self.close()
+        manifest = self._read_manifest()
+        self._segments = [_Segment(os.path.join(self.directory, name)) for name in manifest['segments']]
+
+        # Yeni parçadaki belge, eski parçalardaki aynı video/dil belgesini gizler
+        seen = set()
+        hidden = []
+        for segment in reversed(self._segments):
+            segment_hidden = set()
+            for doc_id, doc in enumerate(segment.docs):
+                key = (doc[0], doc[1])
+                if key in seen:
+                    segment_hidden.add(doc_id)
+                else:
+                    seen.add(key)
+            hidden.append(segment_hidden)
+        self._hidden = hidden[::-1]
+        self._keys = seen
+
+    def __contains__(self, key):
+        """(video_id, dil) çiftinin dizinde olup olmadığını kontrol eder."""
+        return tuple(key) in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, documents, skip_existing=True, max_segment_tokens=5000000):
+        """
+        Belgeleri yeni parça(lar) olarak dizine ekler
+
+        Args:
+            documents (iterable): (video_id, dil, is_auto, CueList) dörtlüleri
+            skip_existing (bool): Dizinde zaten olan video/dil çiftlerini atla
+            max_segment_tokens (int): Bir parçadaki en fazla belirteç sayısı; aşılırsa yeni parça açılır
+
+        Returns:
+            int: Eklenen belge sayısı
+        """
+        added = 0
+        builder = _SegmentBuilder()
+        for video_id, language, is_auto, cues in documents:
+            if skip_existing and (video_id, language) in self._keys:
+                continue
+            builder.add(video_id, language, is_auto, cues)
+            self._keys.add((video_id, language))
+            added += 1
+            if builder.token_count >= max_segment_tokens:
+                self._commit_segment(builder)
+                builder = _SegmentBuilder()
+
+        if builder.docs:
+            self._commit_segment(builder)
+        return added
+
+    def add_disk_cache(self, disk_cache, skip_existing=True):
+        """
+        Kalıcı önbellekteki tüm altyazıları dizine ekler
+
+        Args:
+            disk_cache (SubtitleDiskCache): Altyazı önbelleği
+            skip_existing (bool): Dizinde zaten olan video/dil çiftlerini atla
+
+        Returns:
+            int: Eklenen belge sayısı
+        """
+        def documents():
+            for entry in disk_cache.iter_entries():
+                if skip_existing and (entry.video_id, entry.language_code) in self._keys:
+                    continue
+                cues = parse_captions(entry.vtt, entry.ext, is_auto=entry.is_auto)
+                yield entry.video_id, entry.language_code, entry.is_auto, cues
+
+        return self.add(documents(), skip_existing)
+
+    def add_export(self, path, skip_existing=True):
+        """
+        Dışa aktarılmış JSONL parçalarındaki altyazıları dizine ekler
+
+        İpucu içermeyen kayıtlarda satırlar zaman bilgisi olmadan (0. saniye) dizinlenir.
+
+        Args:
+            path (str): Parça dizini veya tek bir parça dosyası
+            skip_existing (bool): Dizinde zaten olan video/dil çiftlerini atla
+
+        Returns:
+            int: Eklenen belge sayısı
+        """
+        from export_writer import iter_export_records
+
+        def documents():
+            for record in iter_export_records(path):
+                if record.get('cues') is not None:
+                    cue_iter = (Cue(start, end, text) for start, end, text in record['cues'])
+                    rolling = record.get('rolling', bool(record.get('is_auto')))
+                else:
+                    cue_iter = [Cue(0.0, 0.0, record['text'])]
+                    rolling = False
+                cues = build_cue_list(cue_iter, is_auto=bool(record.get('is_auto')), rolling=rolling)
+                yield record['video_id'], record['language'], record.get('is_auto'), cues
+
+        return self.add(documents(), skip_existing)
+
+    def _commit_segment(self, builder):
+        manifest = self._read_manifest()
+        name = f"seg-{int(time.time() * 1000):013d}-{len(manifest['segments']):05d}"
+        builder.write(os.path.join(self.directory, name))
+
+        manifest['segments'].append(name)
+        tmp_path = self._manifest_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path())
+        self._load()
+
+    def search(self, query, limit=100, language=None):
+        """
+        İfadenin geçtiği yerleri bulur
+
+        Sorgudaki kelimelerin belgede art arda geçmesi gerekir; satır (ipucu)
+        sınırlarını aşan ifadeler de bulunur. Zaman, ifadenin ilk kelimesinin
+        bulunduğu satırın başlangıcıdır.
+
+        Args:
+            query (str): Aranacak kelime veya ifade
+            limit (int): En fazla sonuç sayısı; None ise sınırsız
+            language (str): Yalnızca bu dildeki altyazılarda ara
+
+        Returns:
+            list: Dizine eklenme ve zaman sırasıyla `SearchHit` nesneleri
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        hits = []
+        for segment, hidden in zip(self._segments, self._hidden):
+            lists = []
+            for offset, token in enumerate(tokens):
+                postings = segment.postings(token)
+                if postings is None:
+                    break
+                lists.append((len(postings), offset, postings))
+            else:
+                last = None
+                for doc_id, position in self._match_phrase(lists):
+                    if doc_id in hidden:
+                        continue
+                    doc = segment.docs[doc_id]
+                    if language is not None and doc[1] != language:
+                        continue
+                    timestamp = segment.timestamp(doc_id, position)
+                    # Aynı satırdaki birden fazla eşleşme tek sonuç sayılır
+                    if last == (doc_id, timestamp):
+                        continue
+                    last = (doc_id, timestamp)
+                    hits.append(SearchHit(doc[0], doc[1], timestamp, doc[2]))
+                    if limit is not None and len(hits) >= limit:
+                        return hits
+        return hits
+
+    @staticmethod
+    def _match_phrase(lists):
+        """Kelimelerin art arda geçtiği (belge, ilk kelime konumu) çiftlerini belge ve konum sırasıyla üretir."""
+        if len(lists) == 1:
+            # Kayıtlar zaten sıralı; sonuç sınırına ulaşıldığında okuma erken biter
+            it = iter(lists[0][2])
+            yield from zip(it, it)
+            return
+
+        # En seyrek kelimenin kayıtları sırayla gezilir; diğer kelimelerde beklenen
+        # (belge, konum) çifti sıralı kayıtlarda ikili aramayla yoklanır. Adaylar
+        # sıralı geldiğinden her listede arama bir önceki bulunan yerden başlar ve
+        # sonuç sınırına ulaşıldığında okuma erken biter.
+        lists.sort(key=lambda item: item[0])
+        _, first_offset, first = lists[0]
+        others = [(offset, postings, len(postings) // 2) for _, offset, postings in lists[1:]]
+        cursors = [0] * len(others)
+
+        it = iter(first)
+        for doc, position in zip(it, it):
+            start = position - first_offset
+            if start < 0:
+                continue
+            for index, (offset, postings, count) in enumerate(others):
+                target = start + offset
+                low, high = cursors[index], count
+                while low < high:
+                    middle = (low + high) // 2
+                    base = middle * 2
+                    if postings[base] < doc or (postings[base] == doc and postings[base + 1] < target):
+                        low = middle + 1
+                    else:
+                        high = middle
+                cursors[index] = low
+                if low == count:
+                    # Bu kelimenin daha ileride kaydı yok; başka eşleşme olamaz
+                    return
+                if postings[2 * low] != doc or postings[2 * low + 1] != target:
+                    break
+            else:
+                yield doc, start
+
+    def close(self):
+        """Bellek eşlemelerini kapatır."""
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _SegmentBuilder:
+    """Bellekte bir dizin parçası oluşturup diske yazar."""
+
+    def __init__(self):
+        self.docs = []
+        self.token_count = 0
+        self._postings = {}
+        self._cue_positions = array('I')
+        self._cue_times = array('I')
+
+    def add(self, video_id, language, is_auto, cues):
+        doc_id = len(self.docs)
+        cue_offset = len(self._cue_positions)
+        position = 0
+        postings = self._postings
+        last_time = None
+
+        for start, line in iter_timed_text(cues, rolling=cues.rolling):
+            tokens = tokenize(line)
+            if not tokens:
+                continue
+            # Aynı zamanlı ardışık satırlar tek girdi olarak tutulur
+            start_ms = int(start * 1000)
+            if start_ms != last_time:
+                self._cue_positions.append(position)
+                self._cue_times.append(start_ms)
+                last_time = start_ms
+            for token in tokens:
+                entries = postings.get(token)
+                if entries is None:
+                    entries = postings[token] = array('I')
+                entries.append(doc_id)
+                entries.append(position)
+                position += 1
+
+        self.docs.append([video_id, language, is_auto, cue_offset, len(self._cue_positions) - cue_offset])
+        self.token_count += position
+
+    def write(self, path):
+        tmp_path = path + '.tmp'
+        os.makedirs(tmp_path)
+
+        lexicon = bytearray()
+        terms = array('Q')
+        postings_count = 0
+        with open(os.path.join(tmp_path, 'postings.bin'), 'wb') as f:
+            for term in sorted(self._postings, key=lambda t: t.encode('utf-8')):
+                entries = self._postings[term]
+                encoded = term.encode('utf-8')
+                terms.extend((len(lexicon), len(lexicon) + len(encoded), postings_count, len(entries) // 2))
+                lexicon += encoded
+                entries.tofile(f)
+                postings_count += len(entries)
+
+        with open(os.path.join(tmp_path, 'lexicon.bin'), 'wb') as f:
+            f.write(lexicon)
+        with open(os.path.join(tmp_path, 'lexicon.idx'), 'wb') as f:
+            terms.tofile(f)
+        with open(os.path.join(tmp_path, 'cues.bin'), 'wb') as f:
+            self._cue_positions.tofile(f)
+            self._cue_times.tofile(f)
+        with open(os.path.join(tmp_path, 'docs.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.docs, f, ensure_ascii=False)
+
+        os.replace(tmp_path, path)
+
+
+def _format_timestamp(seconds):
+    total = int(seconds)
+    return f"{total // 3600:02d}:{total // 60 % 60:02d}:{total % 60:02d}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Altyazılar üzerinde zaman damgalı tam metin arama")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = commands.add_parser('add', help="Altyazıları dizine ekle (yalnızca yeni video/diller)")
+    add_parser.add_argument('index', help="Dizin klasörü")
+    add_parser.add_argument('--disk-cache', nargs='?', const='', default=None, metavar='YOL',
+                            help="Kalıcı önbellekteki altyazıları ekle (yol verilmezse varsayılan önbellek)")
+    add_parser.add_argument('--export', action='append', default=[], metavar='YOL',
+                            help="Dışa aktarılmış JSONL parçalarını ekle (birden fazla verilebilir)")
+    add_parser.add_argument('--reindex', action='store_true',
+                            help="Dizinde olan video/dilleri de yeniden ekle")
+
+    query_parser = commands.add_parser('query', help="İfade ara")
+    query_parser.add_argument('index', help="Dizin klasörü")
+    query_parser.add_argument('text', help="Aranacak kelime veya ifade")
+    query_parser.add_argument('--limit', type=int, default=50, help="En fazla sonuç sayısı")
+    query_parser.add_argument('--language', help="Yalnızca bu dilde ara")
+    query_parser.add_argument('--json', action='store_true', help="Sonuçları JSON satırları olarak yaz")
+
+    args = parser.parse_args(argv)
+
+    with SearchIndex(args.index) as index:
+        if args.command == 'add':
+            added = 0
+            if args.disk_cache is not None:
+                from subtitle_store import SubtitleDiskCache
+                with SubtitleDiskCache(args.disk_cache or None) as disk_cache:
+                    added += index.add_disk_cache(disk_cache, skip_existing=not args.reindex)
+            for path in args.export:
+                added += index.add_export(path, skip_existing=not args.reindex)
+            print(f"{added} altyazı eklendi; dizinde toplam {len(index)} altyazı var.")
+            return
+
+        start = time.perf_counter()
+        hits = index.search(args.text, limit=args.limit, language=args.language)
+        elapsed = time.perf_counter() - start
+
+        for hit in hits:
+            if args.json:
+                print(json.dumps({'video_id': hit.video_id, 'language': hit.language,
+                                  'timestamp': hit.timestamp, 'is_auto': hit.is_auto, 'url': hit.url},
+                                 ensure_ascii=False))
+            else:
+                print(f"{hit.video_id}\t{hit.language}\t{_format_timestamp(hit.timestamp)}\t{hit.url}")
+        if not args.json:
+            print(f"{len(hits)} sonuç ({elapsed * 1000:.1f} ms)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+# Okumalarda biriken son erişim zamanlarının diske yazılma aralığı (saniye)
+ACCESS_FLUSH_INTERVAL = 30.0
+
+
+def default_cache_path():
+    """
+    Kalıcı önbellek dosyasının varsayılan konumunu döndürür
+
+    Returns:
+        str: $XDG_CACHE_HOME (yoksa ~/.cache) altındaki SQLite dosya yolu
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'youtube-subtitle-fetcher', 'subtitles.sqlite3')
+
+
+class CachedSubtitle:
+    """
+    Kalıcı önbellekten okunan tek bir altyazı kaydı.
+    """
+
+    __slots__ = ('video_id', 'language_code', 'is_auto', 'vtt', 'text', 'fetched_at', 'ext')
+
+    def __init__(self, video_id, language_code, is_auto, vtt, text, fetched_at, ext='vtt'):
+        self.video_id = video_id
+        self.language_code = language_code
+        self.is_auto = is_auto
+        # Ham altyazı içeriği; biçimi `ext` alanında (vtt, json3, srv3, ttml)
+        self.vtt = vtt
+        self.text = text
+        self.fetched_at = fetched_at
+        self.ext = ext
+
+    def __repr__(self):
+        kind = 'auto' if self.is_auto else 'manual'
+        return f"CachedSubtitle({self.video_id!r}, {self.language_code!r}, {kind})"
+
+
+class SubtitleDiskCache:
+    """
+    Çekilen altyazıları diskte saklayan SQLite tabanlı kalıcı önbellek.
+
+    Kayıtlar (video_id, dil, manuel/otomatik) üçlüsüyle anahtarlanır ve hem
+    ham altyazı içeriğini (zaman damgalarıyla birlikte, biçimiyle) hem de
+    dönüştürülmüş metni içerir. Toplam boyut `max_bytes` sınırını aştığında en uzun süre
+    okunmamış kayıtlar silinir (LRU).
+
+    Son erişim zamanları her okumada değil, bellekte biriktirilip
+    `ACCESS_FLUSH_INTERVAL` saniyede bir (ve silme öncesinde, kapanışta) tek
+    işlemle yazılır; böylece okumalar yazma kilidi için sıraya girmez.
+    """
+
+    def __init__(self, path=None, max_bytes=256 * 1024 * 1024, timeout=60, track_access=None):
+        """
+        Args:
+            path (str): SQLite dosya yolu; None ise `default_cache_path()` kullanılır
+            max_bytes (int): Önbellekte tutulacak en fazla içerik boyutu (bayt)
+            timeout (float): Başka bağlantının yazma kilidi için beklenecek en uzun süre (saniye)
+            track_access (bool): Son erişim zamanlarını kaydet; None ise yalnızca
+                                 `max_bytes` sınırlıysa (sys.maxsize değilse) kaydedilir
+        """
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.track_access = max_bytes < sys.maxsize if track_access is None else track_access
+        self._lock = threading.Lock()
+        self._pending_access = {}
+        self._access_flushed_at = time.monotonic()
+
+        if self.path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS subtitles (
+                video_id TEXT NOT NULL,
+                language_code TEXT NOT NULL,
+                is_auto INTEGER NOT NULL,
+                vtt TEXT NOT NULL,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                ext TEXT NOT NULL DEFAULT 'vtt',
+                PRIMARY KEY (video_id, language_code, is_auto)
+            )
+        """)
+        # Biçim sütunu olmayan eski önbellek dosyalarını yükselt
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(subtitles)')}
+        if 'ext' not in columns:
+            self._conn.execute("ALTER TABLE subtitles ADD COLUMN ext TEXT NOT NULL DEFAULT 'vtt'")
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS subtitles_accessed_at ON subtitles (accessed_at)')
+        self._total_bytes = self._sum_sizes()
+
+    def get(self, video_id, language_code, is_auto=None):
+        """
+        Önbellekteki altyazıyı okur ve son erişim zamanını kaydeder
+
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+            is_auto (bool): True/False ile yalnızca otomatik/manuel kayıt aranır;
+                            None ise önce manuel, sonra otomatik kayıt döner
+
+        Returns:
+            CachedSubtitle: Kayıt veya None (önbellekte yoksa)
+        """
+        query = ('SELECT is_auto, vtt, text, fetched_at, ext FROM subtitles '
+                 'WHERE video_id = ? AND language_code = ?')
+        params = [video_id, language_code]
+        if is_auto is not None:
+            query += ' AND is_auto = ?'
+            params.append(int(is_auto))
+        query += ' ORDER BY is_auto LIMIT 1'
+
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+
+            if self.track_access:
+                self._pending_access[(video_id, language_code, row[0])] = time.time()
+                if time.monotonic() - self._access_flushed_at >= ACCESS_FLUSH_INTERVAL:
+                    try:
+                        self._flush_access()
+                    except sqlite3.OperationalError:
+                        # Erişim zamanı yalnızca LRU sırası için; kilit alınamazsa okuma başarısız olmasın
+                        pass
+
+        return CachedSubtitle(video_id, language_code, bool(row[0]), row[1], row[2], row[3], row[4])
+
+    def put(self, video_id, language_code, is_auto, vtt, text, ext='vtt'):
+        """
+        Altyazıyı önbelleğe yazar; gerekirse eski kayıtları siler
+
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+            is_auto (bool): Otomatik altyazı ise True
+            vtt (str): Ham altyazı içeriği
+            text (str): Dönüştürülmüş metin
+            ext (str): Ham içeriğin biçimi (vtt, json3, srv3, ttml)
+        """
+        size = len(vtt.encode('utf-8')) + len(text.encode('utf-8'))
+        now = time.time()
+        key = (video_id, language_code, int(is_auto))
+
+        with self._lock:
+            # Yeni kaydın erişim zamanı zaten `now`; eski bekleyen değer onu ezmesin
+            self._pending_access.pop(key, None)
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                old = self._conn.execute(
+                    'SELECT size FROM subtitles WHERE video_id = ? AND language_code = ? AND is_auto = ?',
+                    key).fetchone()
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO subtitles '
+                    '(video_id, language_code, is_auto, vtt, text, size, fetched_at, accessed_at, ext) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    key + (vtt, text, size, now, now, ext))
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def iter_entries(self, batch_size=500):
+        """
+        Önbellekteki tüm kayıtları sırayla okur; erişim zamanları güncellenmez
+
+        Kayıtlar küçük gruplar halinde okunur, bu sırada başka iş parçacıkları
+        önbelleği kullanmaya devam edebilir.
+
+        Args:
+            batch_size (int): Tek sorguda okunacak kayıt sayısı
+
+        Yields:
+            CachedSubtitle: Önbellek kaydı
+        """
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT rowid, video_id, language_code, is_auto, vtt, text, fetched_at, ext '
+                    'FROM subtitles WHERE rowid > ? ORDER BY rowid LIMIT ?',
+                    (last_rowid, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield CachedSubtitle(row[1], row[2], bool(row[3]), row[4], row[5], row[6], row[7])
+            last_rowid = rows[-1][0]
+
+    def invalidate(self, video_id=None):
+        """
+        Önbellekten kayıt siler
+
+        Args:
+            video_id (str): Kayıtları silinecek video ID'si; None ise tüm önbellek temizlenir
+        """
+        with self._lock:
+            if video_id is None:
+                self._conn.execute('DELETE FROM subtitles')
+            else:
+                self._conn.execute('DELETE FROM subtitles WHERE video_id = ?', (video_id,))
+            self._total_bytes = self._sum_sizes()
+
+    @property
+    def total_bytes(self):
+        """Önbellekteki içeriğin yaklaşık toplam boyutu (bayt)."""
+        return self._total_bytes
+
+    def close(self):
+        """Bekleyen erişim zamanlarını yazar ve veritabanı bağlantısını kapatır."""
+        with self._lock:
+            try:
+                self._flush_access()
+            finally:
+                self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _flush_access(self):
+        """Biriken son erişim zamanlarını tek işlemle yazar; `_lock` tutulurken çağrılır."""
+        self._access_flushed_at = time.monotonic()
+        if not self._pending_access:
+            return
+
+        pending = [(accessed_at,) + key for key, accessed_at in self._pending_access.items()]
+        self._pending_access.clear()
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Arada silinen kayıtlar için UPDATE hiçbir satırı etkilemez
+            self._conn.executemany(
+                'UPDATE subtitles SET accessed_at = ? '
+                'WHERE video_id = ? AND language_code = ? AND is_auto = ?',
+                pending)
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def _evict(self):
+        """Toplam boyut sınırın altına inene kadar en eski erişilen kayıtları siler."""
+        # Silinecekler seçilmeden önce bekleyen erişim zamanları yazılmalı
+        self._flush_access()
+        # Başka süreçler de aynı dosyaya yazmış olabilir; gerçek toplamla başla
+        self._total_bytes = self._sum_sizes()
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        excess = self._total_bytes - self.max_bytes
+        rows = self._conn.execute('SELECT rowid, size FROM subtitles ORDER BY accessed_at')
+        victims = []
+        freed = 0
+        for rowid, size in rows:
+            if freed >= excess:
+                break
+            victims.append((rowid,))
+            freed += size
+
+        rows.close()
+
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._conn.executemany('DELETE FROM subtitles WHERE rowid = ?', victims)
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._total_bytes -= freed
+
+    def _sum_sizes(self):
+        return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM subtitles').fetchone()[0]
@@ -0,0 +1,185 @@
+"""
+YouTube URL'lerinden video ID'si çıkarma ve toplu URL normalleştirme.
+
+Tanınan biçimler (şema, `www.`/`m.`/`music.` önekleri ve sorgu dizeleri isteğe bağlı):
+    dQw4w9WgXcQ                                   (çıplak video ID'si)
+    https://www.youtube.com/watch?v=dQw4w9WgXcQ
+    https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ
+    https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RDAMVM
+    https://www.youtube.com/shorts/dQw4w9WgXcQ
+    https://www.youtube.com/embed/dQw4w9WgXcQ?start=30
+    https://www.youtube.com/live/dQw4w9WgXcQ?si=abc
+    https://www.youtube.com/v/dQw4w9WgXcQ
+    https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ
+    https://youtu.be/dQw4w9WgXcQ?si=abc&t=42
+
+Yaygın biçimler önceden derlenmiş tek bir düzenli ifadeyle tanınır; bu hızlı
+yolun kaçırdığı, içinde `youtu` geçen girdiler (büyük harf, port, yüzde
+kodlaması vb.) `urlsplit` ile ayrıştırılır. Örnek:
+    for video_id in iter_video_ids(open('erisim.log')):
+        ...
+"""
+import re
+from urllib.parse import parse_qs, unquote, urlsplit
+
+_VIDEO_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{11}')
+_BARE_ID_PATTERN = re.compile(r'\s*([A-Za-z0-9_-]{11})\s*$')
+
+# Video ID'si ve ardından ID'ye ait olmayan bir karakter (veya girdinin sonu)
+_ID = r'([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])'
+
+# Hızlı yol: küçük harfli yaygın biçimler. Her alternatif tam olarak bir ID grubu
+# içerir; eşleşen grup `lastindex` ile bulunur. `v=` ilk parametreyse doğrudan
+# eşleşir; diğer parametreler ancak o zaman atlanır (isteğe bağlı bir grupla
+# önce atlamaya çalışmak her satırda satır sonuna kadar geri izlemeye yol açar).
+_URL_PATTERN = re.compile(
+    r'\s*(?:https?:)?(?://)?(?:'
+    r'(?:www\.|m\.|music\.)?youtube\.com/(?:'
+    r'watch/?\?(?:v=|[^#\s]*?[&;]v=)' + _ID +
+    r'|(?:shorts|embed|live|v|e)/' + _ID +
+    r')'
+    r'|(?:www\.)?youtube-nocookie\.com/embed/' + _ID +
+    r'|(?:www\.)?youtu\.be/' + _ID +
+    r')'
+)
+
+_YOUTUBE_HOSTS = frozenset(('youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com',
+                            'youtube-nocookie.com', 'www.youtube-nocookie.com'))
+_SHORT_HOSTS = frozenset(('youtu.be', 'www.youtu.be'))
+_ID_PATH_PREFIXES = frozenset(('shorts', 'embed', 'live', 'v', 'e'))
+
+CANONICAL_URL = 'https://www.youtube.com/watch?v={}'
+
+
+def is_video_id(text):
+    """
+    Metnin geçerli biçimde bir video ID'si olup olmadığını kontrol eder
+
+    Args:
+        text (str): Kontrol edilecek metin
+
+    Returns:
+        bool: 11 karakterlik `[A-Za-z0-9_-]` dizisiyse True
+    """
+    return _VIDEO_ID_PATTERN.fullmatch(text) is not None
+
+
+def extract_video_id(url):
+    """
+    URL'den veya doğrudan verilmiş video ID'sinden video ID'sini çıkarır
+
+    Args:
+        url (str): YouTube URL'si veya 11 karakterlik video ID'si
+
+    Returns:
+        str: Video ID'si veya None (tanınmayan girdi ise)
+    """
+    if 'youtu' in url:
+        match = _URL_PATTERN.match(url)
+        if match is not None:
+            return match.group(match.lastindex)
+    match = _BARE_ID_PATTERN.match(url)
+    if match is not None:
+        return match.group(1)
+    return _extract_slow(url)
+
+
+def _extract_slow(url):
+    """Hızlı yolun kaçırdığı YouTube URL'lerini (büyük harf, port, yüzde kodlaması vb.) `urlsplit` ile ayrıştırır."""
+    if 'youtu' not in url.lower():
+        return None
+
+    url = url.strip()
+    parts = urlsplit(url if '//' in url else '//' + url)
+    try:
+        host = (parts.hostname or '').lower()
+    except ValueError:
+        return None
+    segments = unquote(parts.path).split('/')
+
+    if host in _YOUTUBE_HOSTS:
+        if len(segments) >= 2 and segments[1].lower() == 'watch':
+            candidates = parse_qs(parts.query).get('v', ())
+        elif len(segments) >= 3 and segments[1].lower() in _ID_PATH_PREFIXES:
+            candidates = segments[2:3]
+        else:
+            return None
+    elif host in _SHORT_HOSTS:
+        candidates = segments[1:2]
+    else:
+        return None
+
+    for candidate in candidates:
+        candidate = candidate.strip()
+        if is_video_id(candidate):
+            return candidate
+    return None
+
+
+def canonical_url(video_id):
+    """
+    Video ID'sinin standart izleme adresini döndürür
+
+    Args:
+        video_id (str): Video ID'si
+
+    Returns:
+        str: https://www.youtube.com/watch?v=VIDEO_ID
+    """
+    return CANONICAL_URL.format(video_id)
+
+
+def iter_video_ids(urls, unique=True, seen=None):
+    """
+    URL akışındaki video ID'lerini sırayla üretir; tanınmayan girdiler atlanır
+
+    Girdi akış halinde işlenir; tek bir liste veya dosya nesnesi (satır
+    sonları dahil) verilebilir. `unique` açıkken aynı video yalnızca ilk
+    görüldüğünde üretilir. Görülen ID'ler `seen` içinde tutulur; çok büyük
+    girdilerde bellek kullanımını sınırlamak için `add` ve `in` destekleyen
+    başka bir kap verilebilir.
+
+    Args:
+        urls (iterable): YouTube URL'leri veya video ID'leri
+        unique (bool): Tekrarlanan videoları atlar
+        seen (set): Daha önce görülmüş ID'ler; None ise yeni bir küme kullanılır
+
+    Yields:
+        str: Video ID'si
+    """
+    if not unique:
+        seen = None
+    elif seen is None:
+        seen = set()
+    for url in urls:
+        # `extract_video_id` ile aynı adımlar; satır başına bir işlev çağrısı tasarrufu için burada açık yazılır
+        found = _URL_PATTERN.match(url) if 'youtu' in url else None
+        if found is None:
+            found = _BARE_ID_PATTERN.match(url)
+        if found is not None:
+            video_id = found.group(found.lastindex)
+        else:
+            video_id = _extract_slow(url)
+            if video_id is None:
+                continue
+        if seen is not None:
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+        yield video_id
+
+
+def normalize_urls(urls, unique=True, seen=None):
+    """
+    URL akışını standart izleme adreslerine çevirir; tanınmayan girdiler atlanır
+
+    Args:
+        urls (iterable): YouTube URL'leri veya video ID'leri
+        unique (bool): Tekrarlanan videoları atlar
+        seen (set): Daha önce görülmüş ID'ler; None ise yeni bir küme kullanılır
+
+    Yields:
+        str: https://www.youtube.com/watch?v=VIDEO_ID
+    """
+    for video_id in iter_video_ids(urls, unique, seen):
+        yield CANONICAL_URL.format(video_id)
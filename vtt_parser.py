@@ -0,0 +1,371 @@
+import html
+import io
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Satır içi biçim etiketleri: <c>, <i>, <00:00:01.000> vb.
+_TAG_PATTERN = re.compile(r'<[^>]*>')
+
+
+class Cue:
+    """
+    Tek bir altyazı ipucu (cue): başlangıç, bitiş (saniye) ve temiz metin.
+    """
+
+    __slots__ = ('start', 'end', 'text')
+
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def __repr__(self):
+        return f"Cue({self.start:.3f}, {self.end:.3f}, {self.text!r})"
+
+
+class CueList:
+    """
+    Zaman damgalı altyazı ipuçlarının sıkıştırılmış listesi.
+
+    Başlangıç ve bitiş süreleri `array('d')` sütunlarında, metinler ayrı bir
+    listede tutulur; `Cue` nesneleri yalnızca erişildiğinde oluşturulur.
+    Zaman aralığı sorguları bisect ile O(log n) sürede yanıtlanır.
+
+    Örnek:
+        cues = parse_vtt(vtt_content)
+        for cue in cues.between(720, 750):
+            print(cue.start, cue.text)
+    """
+
+    def __init__(self, is_auto=False, rolling=None):
+        """
+        Args:
+            is_auto (bool): Otomatik altyazıdan oluşturulduysa True
+            rolling (bool): İpuçları kayan (bir önceki satırı tekrar eden) gösterimse True;
+                            None ise `is_auto` değeri kullanılır
+        """
+        self.is_auto = is_auto
+        self.rolling = is_auto if rolling is None else rolling
+        self.starts = array('d')
+        self.ends = array('d')
+        self.texts = []
+        # max_ends[i]: ilk i+1 ipucunun en geç bitiş zamanı (monoton artan)
+        self._max_ends = array('d')
+
+    def append(self, start, end, text):
+        """
+        Listeye bir ipucu ekler; ipuçları başlangıç sırasıyla eklenmelidir
+
+        Args:
+            start (float): Başlangıç (saniye)
+            end (float): Bitiş (saniye)
+            text (str): Temizlenmiş ipucu metni
+        """
+        if self.starts and start < self.starts[-1]:
+            raise ValueError("İpuçları başlangıç zamanına göre sıralı eklenmelidir")
+
+        self.starts.append(start)
+        self.ends.append(end)
+        self.texts.append(text)
+        self._max_ends.append(max(end, self._max_ends[-1]) if self._max_ends else end)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, index):
+        return Cue(self.starts[index], self.ends[index], self.texts[index])
+
+    def __iter__(self):
+        for start, end, text in zip(self.starts, self.ends, self.texts):
+            yield Cue(start, end, text)
+
+    def between(self, start, end):
+        """
+        Verilen zaman aralığıyla kesişen ipuçlarını döndürür
+
+        Args:
+            start (float): Aralık başlangıcı (saniye)
+            end (float): Aralık bitişi (saniye)
+
+        Returns:
+            list: Başlangıç sırasına göre `Cue` nesneleri
+        """
+        # start'tan sonra bitebilecek ilk ipucu ile end'den önce başlayan son ipucu arası
+        first = bisect_right(self._max_ends, start)
+        last = bisect_left(self.starts, end)
+        ends = self.ends
+        return [self[i] for i in range(first, last) if ends[i] > start]
+
+    def at(self, position):
+        """
+        Verilen anda ekranda olan ipuçlarını döndürür
+
+        Args:
+            position (float): Oynatma konumu (saniye)
+
+        Returns:
+            list: `Cue` nesneleri
+        """
+        first = bisect_right(self._max_ends, position)
+        last = bisect_right(self.starts, position)
+        ends = self.ends
+        return [self[i] for i in range(first, last) if ends[i] > position]
+
+    def to_text(self, rolling=False):
+        """
+        İpuçlarını düz metne dönüştürür
+
+        Args:
+            rolling (bool): True ise otomatik altyazılara özgü kayan tekrar ayıklama kullanılır
+
+        Returns:
+            str: Temizlenmiş metin
+        """
+        return '\n'.join(iter_cue_text(self.texts, rolling=rolling))
+
+
+def parse_timestamp(value):
+    """
+    VTT zaman damgasını saniyeye çevirir
+
+    Args:
+        value (str): 'SS:DD:ss.mmm' veya 'DD:ss.mmm' biçiminde zaman damgası
+
+    Returns:
+        float: Saniye
+    """
+    seconds = 0.0
+    for part in value.split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def iter_cues(lines):
+    """
+    VTT satırlarını okuyup ipuçlarını tek tek üretir
+
+    Zaman satırından önce gelen başlık, ipucu kimliği ve NOTE/STYLE blokları
+    atlanır. Girdi tamamen belleğe alınmaz; HTTP yanıtının `iter_lines()`
+    çıktısı veya açık bir dosya nesnesi doğrudan verilebilir.
+
+    Args:
+        lines (iterable): VTT içeriğinin satırları (str)
+
+    Yields:
+        Cue: Metni etiketlerden arındırılmış, boş olmayan ipucu
+    """
+    tag_sub = _TAG_PATTERN.sub
+    cue_lines = None
+    start = end = 0.0
+
+    for line in lines:
+        if '-->' in line:
+            if cue_lines:
+                yield Cue(start, end, '\n'.join(cue_lines))
+            left, _, right = line.partition('-->')
+            try:
+                start = parse_timestamp(left.strip())
+                end = parse_timestamp(right.split(None, 1)[0])
+            except (ValueError, IndexError):
+                # Bozuk zaman satırı; ipucu metni olarak da kullanılmaz
+                cue_lines = None
+                continue
+            cue_lines = []
+            continue
+
+        if cue_lines is None:
+            continue
+
+        # Yalnızca gerçekten boş satır ipucunu bitirir; boşluk içeren satırlar ipucuna aittir
+        if not line.rstrip('\r\n'):
+            if cue_lines:
+                yield Cue(start, end, '\n'.join(cue_lines))
+            cue_lines = None
+            continue
+
+        # HTML etiketlerini temizle ve karakter varlıklarını (&amp; vb.) çöz
+        line = tag_sub('', line).strip()
+        if '&' in line:
+            line = html.unescape(line)
+        if line:
+            cue_lines.append(line)
+
+    if cue_lines:
+        yield Cue(start, end, '\n'.join(cue_lines))
+
+
+def parse_vtt(vtt_content, is_auto=False):
+    """
+    VTT içeriğini zaman damgalı ipucu listesine dönüştürür
+
+    Args:
+        vtt_content (str veya iterable): VTT içeriği ya da satırları
+        is_auto (bool): Otomatik altyazı ise True
+
+    Returns:
+        CueList: Ayrıştırılmış ipuçları
+    """
+    if isinstance(vtt_content, str):
+        vtt_content = io.StringIO(vtt_content)
+    return build_cue_list(iter_cues(vtt_content), is_auto=is_auto)
+
+
+def build_cue_list(cues, is_auto=False, rolling=None):
+    """
+    İpuçlarından başlangıç zamanına göre sıralı bir `CueList` oluşturur
+
+    Args:
+        cues (iterable): `Cue` nesneleri
+        is_auto (bool): Otomatik altyazı ise True
+        rolling (bool): Kayan gösterim ise True; None ise `is_auto` değeri kullanılır
+
+    Returns:
+        CueList: Sıralı ipucu listesi
+    """
+    cue_list = CueList(is_auto=is_auto, rolling=rolling)
+    out_of_order = []
+    for cue in cues:
+        if out_of_order or (cue_list.starts and cue.start < cue_list.starts[-1]):
+            out_of_order.append(cue)
+        else:
+            cue_list.append(cue.start, cue.end, cue.text)
+
+    # Nadiren ipuçları dosyada sırasız gelir; dizin için başlangıca göre sırala
+    if out_of_order:
+        ordered = sorted(list(cue_list) + out_of_order, key=lambda cue: cue.start)
+        cue_list = CueList(is_auto=is_auto, rolling=rolling)
+        for cue in ordered:
+            cue_list.append(cue.start, cue.end, cue.text)
+    return cue_list
+
+
+def iter_cue_text(texts, rolling=False):
+    """
+    İpucu metinlerinden tekrarları ayıklanmış metin satırları üretir
+
+    Normal modda ardışık aynı satırlar bir kez yazılır. Kayan (rolling) modda
+    YouTube otomatik altyazılarındaki örtüşmeler ayıklanır: her ipucunun
+    kelimeleri bir önceki ipucuyla karşılaştırılır, önceki ipucunun sonu ile
+    yeni ipucunun başı arasındaki en uzun örtüşme (KMP önek fonksiyonu ile
+    doğrusal zamanda) atılır ve yalnızca yeni kelimeler üretilir.
+
+    Args:
+        texts (iterable): İpucu metinleri (str)
+        rolling (bool): Kayan tekrar ayıklama kullanılsın mı
+
+    Yields:
+        str: Metin satırı
+    """
+    return (line for _, line in _iter_deduped(((None, text) for text in texts), rolling))
+
+
+def iter_timed_text(cues, rolling=False):
+    """
+    `iter_cue_text` gibi tekrarları ayıklar, ancak her satırı ait olduğu
+    ipucunun başlangıç zamanıyla birlikte üretir
+
+    Args:
+        cues (iterable): `Cue` nesneleri (örn. CueList)
+        rolling (bool): Kayan tekrar ayıklama kullanılsın mı
+
+    Yields:
+        tuple: (başlangıç saniyesi, metin satırı)
+    """
+    return _iter_deduped(((cue.start, cue.text) for cue in cues), rolling)
+
+
+def _iter_deduped(tagged_texts, rolling):
+    """
+    `iter_cue_text` ve `iter_timed_text` için ortak tekrar ayıklama döngüsü
+
+    Args:
+        tagged_texts (iterable): (etiket, ipucu metni) çiftleri
+        rolling (bool): Kayan tekrar ayıklama kullanılsın mı
+
+    Yields:
+        tuple: (ipucunun etiketi, metin satırı)
+    """
+    if rolling:
+        previous_words = []
+        for tag, text in tagged_texts:
+            words = text.split()
+            overlap = _rolling_overlap(previous_words, words)
+            if overlap < len(words):
+                yield tag, ' '.join(words[overlap:])
+            previous_words = words
+        return
+
+    previous_line = None
+    for tag, text in tagged_texts:
+        for line in text.split('\n'):
+            # Ardışık tekrar eden satırları engelle
+            if line != previous_line:
+                yield tag, line
+                previous_line = line
+
+
+def iter_vtt_text(lines, rolling=False):
+    """
+    VTT satırlarını okuyup temizlenmiş metin satırlarını tek tek üretir
+
+    Args:
+        lines (iterable): VTT içeriğinin satırları (str)
+        rolling (bool): True ise otomatik altyazılara özgü kayan tekrar ayıklama kullanılır
+
+    Yields:
+        str: Zaman damgaları ve etiketlerden arındırılmış metin satırı
+    """
+    return iter_cue_text((cue.text for cue in iter_cues(lines)), rolling=rolling)
+
+
+def _rolling_overlap(previous_words, words):
+    """
+    Önceki ipucunun sonuyla yeni ipucunun başı arasındaki örtüşme uzunluğunu bulur
+
+    Yeni ipucu önceki ipucunun içinde tamamen geçiyorsa tüm uzunluğu döndürür.
+
+    Args:
+        previous_words (list): Önceki ipucunun kelimeleri
+        words (list): Yeni ipucunun kelimeleri
+
+    Returns:
+        int: Yeni ipucunun başından atılacak kelime sayısı
+    """
+    if not previous_words or not words:
+        return 0
+
+    # Yeni ipucunun kelimeleri üzerinde KMP önek fonksiyonu
+    prefix = [0] * len(words)
+    k = 0
+    for i in range(1, len(words)):
+        while k and words[i] != words[k]:
+            k = prefix[k - 1]
+        if words[i] == words[k]:
+            k += 1
+        prefix[i] = k
+
+    # Önceki ipucunu tarayarak sonunda eşleşen en uzun öneki bul
+    k = 0
+    for word in previous_words:
+        while k and word != words[k]:
+            k = prefix[k - 1]
+        if word == words[k]:
+            k += 1
+            if k == len(words):
+                return k
+    return k
+
+
+def convert_vtt_to_text(vtt_content, rolling=False):
+    """
+    VTT formatındaki altyazıyı temiz metne dönüştürür
+
+    Args:
+        vtt_content (str): VTT formatındaki altyazı içeriği
+        rolling (bool): True ise otomatik altyazılara özgü kayan tekrar ayıklama kullanılır
+
+    Returns:
+        str: Temizlenmiş metin
+    """
+    return '\n'.join(iter_vtt_text(io.StringIO(vtt_content), rolling=rolling))
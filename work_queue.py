@@ -0,0 +1,549 @@
+"""
+Birden fazla süreç ve makine arasında paylaşılan, kiralamalı altyazı iş kuyruğu.
+
+Kuyruk tek bir SQLite dosyasıdır; dış bir servis gerekmez. Video ID'leri
+eklenirken karma (hash) ile parçalara (shard) ayrılır, her işçi önce kendi
+parçasından öğe kiralar ve kendi parçası bitince diğerlerinden alır. Kiralar
+süreye bağlıdır; ölen bir işçinin öğeleri süre dolunca başka işçiye geçer.
+Sonuçlar ortak bir kalıcı altyazı önbelleğinde (SubtitleDiskCache) birleşir.
+
+Komut satırı:
+    python work_queue.py enqueue kuyruk.sqlite3 idler.txt --shards 8
+    python work_queue.py work kuyruk.sqlite3 --cache sonuc.sqlite3 --languages tr,en --processes 4
+    python work_queue.py status kuyruk.sqlite3
+    python work_queue.py merge sonuc.sqlite3 makine1.sqlite3 makine2.sqlite3
+
+Ortak dosya sistemi olmayan makinelerde her makine aynı ID listesini
+`--only-shard` ile kendi yerel kuyruğuna ekler, kendi önbelleğine yazar ve
+önbellekler sonunda `merge` ile birleştirilir.
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import socket
+import sqlite3
+import sys
+import time
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Queue
+from video_ids import iter_video_ids
+
+# Kuyruk öğesi durumları
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def shard_of(video_id, shards):
+    """
+    Video ID'sinin ait olduğu parçayı döndürür; tüm süreç ve makinelerde aynıdır
+
+    Args:
+        video_id (str): Video ID'si
+        shards (int): Parça sayısı
+
+    Returns:
+        int: 0 ile `shards - 1` arasında parça numarası
+    """
+    return zlib.crc32(video_id.encode('utf-8')) % shards
+
+
+def default_worker_id():
+    """Makine adı ve süreç numarasından işçi kimliği üretir."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    SQLite tabanlı, parçalı ve kiralamalı iş kuyruğu.
+
+    Aynı dosya birden fazla süreçten açılabilir; kiralama işlemleri
+    `BEGIN IMMEDIATE` ile yazma kilidi altında yapıldığından bir öğe aynı
+    anda yalnızca bir işçiye verilir. Bir öğe her kiralandığında deneme
+    sayısı artar; `max_attempts` denemede bitmeyen öğeler başarısız sayılır.
+    """
+
+    def __init__(self, path, shards=None, lease_timeout=600, max_attempts=3):
+        """
+        Args:
+            path (str): SQLite dosya yolu
+            shards (int): Yeni kuyruk için parça sayısı; var olan kuyrukta kayıtlı değer kullanılır
+            lease_timeout (float): Kiralamanın geçerli kalacağı süre (saniye)
+            max_attempts (int): Bir öğenin en fazla kiralanma sayısı
+        """
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+
+        if self.path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+
+        # Diğer süreçlerin yazma kilidi için beklenir
+        self._conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS queue_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS queue_items (
+                video_id TEXT PRIMARY KEY,
+                shard INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS queue_items_shard_status '
+            'ON queue_items (shard, status, lease_expires)')
+        # Parça verilmeden yapılan seçim ve süre taraması tam tablo taraması yapmasın
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS queue_items_status '
+            'ON queue_items (status, lease_expires)')
+
+        self._conn.execute('INSERT OR IGNORE INTO queue_meta (key, value) VALUES (?, ?)',
+                           ('shards', str(shards or 1)))
+        self.shards = int(self._conn.execute(
+            "SELECT value FROM queue_meta WHERE key = 'shards'").fetchone()[0])
+
+    def enqueue(self, video_ids, only_shard=None, batch_size=1000):
+        """
+        Video ID'lerini bekleyen öğe olarak ekler; kuyrukta olanlar değişmez
+
+        Args:
+            video_ids (iterable): Video ID'leri
+            only_shard (int): Verilirse yalnızca bu parçaya düşen ID'ler eklenir
+            batch_size (int): Tek işlemde eklenecek ID sayısı
+
+        Returns:
+            int: Yeni eklenen öğe sayısı
+        """
+        added = 0
+        batch = []
+        now = time.time()
+        for video_id in video_ids:
+            shard = shard_of(video_id, self.shards)
+            if only_shard is not None and shard != only_shard:
+                continue
+            batch.append((video_id, shard, PENDING, now))
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        if batch:
+            added += self._insert(batch)
+        return added
+
+    def _insert(self, rows):
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO queue_items (video_id, shard, status, updated_at) VALUES (?, ?, ?, ?)',
+                rows)
+            added = self._conn.total_changes - before
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return added
+
+    def lease(self, worker_id, shard=None, count=16, steal=True):
+        """
+        Bekleyen veya kirası dolmuş öğeleri işçiye kiralar
+
+        Args:
+            worker_id (str): İşçi kimliği
+            shard (int): Öncelikli parça; None ise tüm parçalar
+            count (int): En fazla öğe sayısı
+            steal (bool): Öncelikli parça boşsa diğer parçalardan al
+
+        Returns:
+            list: Kiralanan video ID'leri (kuyruk boşsa boş liste)
+        """
+        now = time.time()
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            video_ids = []
+            if shard is not None:
+                video_ids = self._select_available(now, count, shard)
+            if shard is None or (steal and not video_ids):
+                video_ids = self._select_available(now, count, None)
+
+            self._conn.executemany(
+                'UPDATE queue_items SET status = ?, lease_owner = ?, lease_expires = ?, '
+                'attempts = attempts + 1, updated_at = ? WHERE video_id = ?',
+                [(LEASED, worker_id, now + self.lease_timeout, now, video_id) for video_id in video_ids])
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return video_ids
+
+    def _select_available(self, now, count, shard):
+        shard_filter = 'shard = ? AND ' if shard is not None else ''
+        shard_params = (shard,) if shard is not None else ()
+        # Deneme hakkı biten ve kirası dolan öğeler (ör. işçiyi çökerten videolar) bırakılır;
+        # tarama yalnızca seçimin yapılacağı parçada, indeks üzerinden yapılır
+        self._conn.execute(
+            f'UPDATE queue_items SET status = ?, error = ?, lease_owner = NULL, updated_at = ? '
+            f'WHERE {shard_filter}status = ? AND lease_expires < ? AND attempts >= ?',
+            (FAILED, "Kiralama süresi doldu", now) + shard_params + (LEASED, now, self.max_attempts))
+        rows = self._conn.execute(
+            f'SELECT video_id FROM queue_items WHERE {shard_filter}status = ? LIMIT ?',
+            shard_params + (PENDING, count)).fetchall()
+        if len(rows) < count:
+            rows += self._conn.execute(
+                f'SELECT video_id FROM queue_items WHERE {shard_filter}status = ? AND lease_expires < ? LIMIT ?',
+                shard_params + (LEASED, now, count - len(rows))).fetchall()
+        return [row[0] for row in rows]
+
+    def renew(self, worker_id, video_ids):
+        """
+        İşçinin elindeki öğelerin kira süresini uzatır
+
+        Kirası başka bir işçiye geçmiş veya başka şekilde sonlanmış öğelere
+        dokunulmaz ve bunlar sonuçta yer almaz.
+
+        Args:
+            worker_id (str): İşçi kimliği
+            video_ids (iterable): Kirası uzatılacak video ID'leri
+
+        Returns:
+            list: Kirası uzatılan (hâlâ işçide olan) video ID'leri
+        """
+        expires = time.time() + self.lease_timeout
+        renewed = []
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            for video_id in video_ids:
+                cursor = self._conn.execute(
+                    'UPDATE queue_items SET lease_expires = ? '
+                    'WHERE video_id = ? AND status = ? AND lease_owner = ?',
+                    (expires, video_id, LEASED, worker_id))
+                if cursor.rowcount > 0:
+                    renewed.append(video_id)
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return renewed
+
+    def complete(self, worker_id, video_id):
+        """
+        Öğeyi tamamlandı olarak işaretler; kira başka işçiye geçtiyse bir şey yapılmaz
+
+        Args:
+            worker_id (str): İşçi kimliği
+            video_id (str): Video ID'si
+
+        Returns:
+            bool: Öğe işaretlendiyse True
+        """
+        return self._finish(worker_id, video_id, DONE, None)
+
+    def fail(self, worker_id, video_id, error, retryable=True):
+        """
+        Öğenin başarısız olduğunu bildirir
+
+        Yeniden denenebilir hatalarda deneme hakkı kalmışsa öğe tekrar
+        bekleyen duruma alınır.
+
+        Args:
+            worker_id (str): İşçi kimliği
+            video_id (str): Video ID'si
+            error (Exception): Yakalanan istisna
+            retryable (bool): Öğe yeniden denenebilirse True
+
+        Returns:
+            bool: Öğe işaretlendiyse True
+        """
+        if retryable:
+            row = self._conn.execute(
+                'SELECT attempts FROM queue_items WHERE video_id = ?', (video_id,)).fetchone()
+            if row is not None and row[0] < self.max_attempts:
+                return self._finish(worker_id, video_id, PENDING, str(error))
+        return self._finish(worker_id, video_id, FAILED, str(error))
+
+    def _finish(self, worker_id, video_id, status, error):
+        cursor = self._conn.execute(
+            'UPDATE queue_items SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, '
+            'updated_at = ? WHERE video_id = ? AND status = ? AND lease_owner = ?',
+            (status, error, time.time(), video_id, LEASED, worker_id))
+        return cursor.rowcount > 0
+
+    def counts(self):
+        """
+        Durum bazında öğe sayılarını döndürür
+
+        Returns:
+            dict: {durum: öğe sayısı}
+        """
+        rows = self._conn.execute('SELECT status, COUNT(*) FROM queue_items GROUP BY status').fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class QueueWorker:
+    """
+    Kuyruktan video kiralayıp altyazılarını çeken işçi.
+
+    Kiralanan öğeler fetcher'ın `fetch_batch` metoduyla paralel çekilir;
+    başarılı sonuçlar fetcher'ın kalıcı önbelleğine yazıldıktan sonra kuyrukta
+    tamamlandı olarak işaretlenir. Sonuçlar ayrı bir iş parçacığında
+    toplanır; kiralar, sonuç gelip gelmemesinden bağımsız olarak her
+    `lease_timeout / 2` saniyede bir uzatılır (ör. hız sınırı beklemesinde).
+    Kirası kaybedilen öğeler bir daha uzatılmaz.
+    """
+
+    def __init__(self, queue, fetcher, language_codes, worker_id=None, shard=None,
+                 batch_size=16, max_workers=8):
+        """
+        Args:
+            queue (WorkQueue): İş kuyruğu
+            fetcher (YouTubeSubtitleFetcher): Altyazıları çekecek nesne; sonuçların birleşmesi için
+                                              ortak bir `disk_cache` ile oluşturulmalıdır
+            language_codes (list): Tercih sırasına göre dil kodları
+            worker_id (str): İşçi kimliği; None ise makine adı ve süreç numarası
+            shard (int): Öncelikli parça; None ise tüm parçalar
+            batch_size (int): Tek seferde kiralanacak öğe sayısı
+            max_workers (int): Bir kiralama grubundaki paralel çekim sayısı
+        """
+        self.queue = queue
+        self.fetcher = fetcher
+        self.language_codes = language_codes
+        self.worker_id = worker_id or default_worker_id()
+        self.shard = shard
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.processed = 0
+
+    def run(self, poll_interval=5.0, exit_when_idle=True):
+        """
+        Kuyruk boşalana kadar (veya sonsuza dek) öğe işler
+
+        Args:
+            poll_interval (float): Kuyruk boşken yeniden deneme aralığı (saniye)
+            exit_when_idle (bool): True ise kiralanacak öğe kalmadığında döner
+
+        Returns:
+            int: İşlenen öğe sayısı
+        """
+        # Havuz işçi boyunca açık kalır; iş parçacıklarına bağlı YoutubeDL
+        # örnekleri her kiralamada yeniden kurulmaz
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                video_ids = self.queue.lease(self.worker_id, self.shard, self.batch_size)
+                if not video_ids:
+                    # Başka işçilerin kirası dolabilir; yalnızca bekleyen kira da yoksa çık
+                    if exit_when_idle and not self.queue.counts().get(LEASED):
+                        return self.processed
+                    time.sleep(poll_interval)
+                    continue
+
+                self._process_lease(executor, video_ids)
+
+    def _process_lease(self, executor, video_ids):
+        """Kiralanan öğeleri çeker; sonuç beklenirken kiraları zamanlayıcıyla uzatır."""
+        from job_journal import is_retryable
+
+        results = Queue()
+        end = object()
+
+        def consume():
+            try:
+                for result in self.fetcher.fetch_batch(video_ids, self.language_codes, self.max_workers,
+                                                       executor):
+                    results.put(result)
+            except BaseException as e:
+                results.put(e)
+            finally:
+                results.put(end)
+
+        threading.Thread(target=consume, name='queue-worker-results', daemon=True).start()
+
+        # Kuyruk bağlantısı yalnızca bu iş parçacığından kullanılır
+        held = set(video_ids)
+        interval = self.queue.lease_timeout / 2
+        renew_at = time.monotonic() + interval
+        while True:
+            try:
+                item = results.get(timeout=max(0.0, renew_at - time.monotonic()))
+            except Empty:
+                item = None
+            if time.monotonic() >= renew_at:
+                held = set(self.queue.renew(self.worker_id, held))
+                renew_at = time.monotonic() + interval
+            if item is None:
+                continue
+            if item is end:
+                return
+            if isinstance(item, BaseException):
+                raise item
+
+            if item.ok:
+                self.queue.complete(self.worker_id, item.video_id)
+            else:
+                self.queue.fail(self.worker_id, item.video_id, item.error, is_retryable(item.error))
+            held.discard(item.video_id)
+            self.processed += 1
+
+
+def _worker_main(queue_path, cache_path, language_codes, shard, batch_size, max_workers,
+                 lease_timeout, exit_when_idle):
+    """Ayrı süreçte çalışan işçinin giriş noktası."""
+    from subtitle_store import SubtitleDiskCache
+    from youtube_subtitle_fetcher import YouTubeSubtitleFetcher
+
+    with WorkQueue(queue_path, lease_timeout=lease_timeout) as queue, \
+            SubtitleDiskCache(cache_path, max_bytes=sys.maxsize) as disk_cache:
+        fetcher = YouTubeSubtitleFetcher(disk_cache=disk_cache)
+        worker = QueueWorker(queue, fetcher, language_codes, shard=shard,
+                             batch_size=batch_size, max_workers=max_workers)
+        worker.run(exit_when_idle=exit_when_idle)
+
+
+def run_workers(queue_path, cache_path, language_codes, processes=4, first_shard=0,
+                batch_size=16, max_workers=8, lease_timeout=600, exit_when_idle=True):
+    """
+    Bu makinede `processes` işçi süreci başlatır ve bitmelerini bekler
+
+    Süreç `i`, `(first_shard + i) % parça sayısı` parçasına önceliklidir.
+    Tüm süreçler sonuçları aynı önbellek dosyasına yazar.
+
+    Args:
+        queue_path (str): Kuyruk dosyası
+        cache_path (str): Sonuçların birleşeceği SubtitleDiskCache dosyası
+        language_codes (list): Tercih sırasına göre dil kodları
+        processes (int): Süreç sayısı
+        first_shard (int): Bu makinedeki ilk sürecin parçası
+        batch_size (int): Tek seferde kiralanacak öğe sayısı
+        max_workers (int): Süreç başına paralel çekim sayısı
+        lease_timeout (float): Kira süresi (saniye)
+        exit_when_idle (bool): Kuyruk boşalınca süreçler sonlanır
+
+    Returns:
+        list: Süreçlerin çıkış kodları
+    """
+    with WorkQueue(queue_path) as queue:
+        shards = queue.shards
+
+    workers = []
+    for i in range(processes):
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(queue_path, cache_path, list(language_codes), (first_shard + i) % shards,
+                  batch_size, max_workers, lease_timeout, exit_when_idle))
+        process.start()
+        workers.append(process)
+
+    for process in workers:
+        process.join()
+    return [process.exitcode for process in workers]
+
+
+def merge_disk_caches(target_path, source_paths):
+    """
+    Farklı makinelerde üretilmiş önbellek dosyalarını tek bir önbellekte birleştirir
+
+    Args:
+        target_path (str): Hedef SubtitleDiskCache dosyası
+        source_paths (list): Kaynak önbellek dosyaları
+
+    Returns:
+        int: Kopyalanan kayıt sayısı
+    """
+    from subtitle_store import SubtitleDiskCache
+
+    copied = 0
+    with SubtitleDiskCache(target_path, max_bytes=sys.maxsize) as target:
+        for source_path in source_paths:
+            with SubtitleDiskCache(source_path, max_bytes=sys.maxsize) as source:
+                for entry in source.iter_entries():
+                    target.put(entry.video_id, entry.language_code, entry.is_auto,
+                               entry.vtt, entry.text, entry.ext)
+                    copied += 1
+    return copied
+
+
+_ID_LINE_PATTERN = re.compile(r'\S+')
+
+
+def _read_ids(path):
+    """Dosyadaki (veya '-' ile stdin'deki) her satırın ilk kelimesini URL/ID olarak okur."""
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        # Kuyruk aynı ID'yi iki kez eklemediğinden burada tekrar ayıklanmaz (bellek sınırsız büyümesin)
+        words = (match.group(0) for match in map(_ID_LINE_PATTERN.search, stream) if match)
+        yield from iter_video_ids(words, unique=False)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Çok süreçli / çok makineli altyazı toplama kuyruğu")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = commands.add_parser('enqueue', help="Video ID'lerini kuyruğa ekle")
+    enqueue_parser.add_argument('queue', help="Kuyruk dosyası")
+    enqueue_parser.add_argument('ids', help="Satır başına bir URL veya video ID'si içeren dosya ('-' ise stdin)")
+    enqueue_parser.add_argument('--shards', type=int, help="Yeni kuyruğun parça sayısı")
+    enqueue_parser.add_argument('--only-shard', type=int, help="Yalnızca bu parçaya düşen ID'leri ekle")
+
+    work_parser = commands.add_parser('work', help="Bu makinede işçi süreçlerini çalıştır")
+    work_parser.add_argument('queue', help="Kuyruk dosyası")
+    work_parser.add_argument('--cache', required=True, help="Sonuçların yazılacağı önbellek dosyası")
+    work_parser.add_argument('--languages', default='tr,en', help="Virgülle ayrılmış, tercih sıralı dil kodları")
+    work_parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help="İşçi süreç sayısı")
+    work_parser.add_argument('--first-shard', type=int, default=0, help="Bu makinedeki ilk sürecin parçası")
+    work_parser.add_argument('--batch-size', type=int, default=16, help="Tek seferde kiralanacak öğe sayısı")
+    work_parser.add_argument('--threads', type=int, default=8, help="Süreç başına paralel çekim sayısı")
+    work_parser.add_argument('--lease-timeout', type=float, default=600, help="Kira süresi (saniye)")
+    work_parser.add_argument('--forever', action='store_true', help="Kuyruk boşalınca çıkma, yeni öğe bekle")
+
+    status_parser = commands.add_parser('status', help="Kuyruk durumunu göster")
+    status_parser.add_argument('queue', help="Kuyruk dosyası")
+
+    merge_parser = commands.add_parser('merge', help="Önbellek dosyalarını birleştir")
+    merge_parser.add_argument('target', help="Hedef önbellek dosyası")
+    merge_parser.add_argument('sources', nargs='+', help="Kaynak önbellek dosyaları")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'enqueue':
+        with WorkQueue(args.queue, shards=args.shards) as queue:
+            added = queue.enqueue(_read_ids(args.ids), only_shard=args.only_shard)
+            print(f"{added} video eklendi ({queue.shards} parça).")
+    elif args.command == 'work':
+        exit_codes = run_workers(args.queue, args.cache, args.languages.split(','), args.processes,
+                                 args.first_shard, args.batch_size, args.threads, args.lease_timeout,
+                                 not args.forever)
+        if any(exit_codes):
+            sys.exit(1)
+    elif args.command == 'status':
+        with WorkQueue(args.queue) as queue:
+            counts = queue.counts()
+            for status in (PENDING, LEASED, DONE, FAILED):
+                print(f"{status}\t{counts.get(status, 0)}")
+    else:
+        print(f"{merge_disk_caches(args.target, args.sources)} kayıt birleştirildi.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,297 @@
-import re
-from urllib.parse import urlparse, parse_qs
-import yt_dlp
-import requests
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from metadata_cache import default_metadata_cache
+from negative_cache import NO_CAPTIONS, CachedFailureError
+from network import default_http_client, default_ydl_pool
+from rate_limit import FAILED, OK, THROTTLED, ThrottledError, is_throttle_error, raise_for_status
+from subtitle_store import SubtitleDiskCache
+from caption_formats import DEFAULT_FORMAT_PREFERENCE, get_parser, parse_captions
+from vtt_parser import convert_vtt_to_text, iter_timed_text, iter_vtt_text
+from video_ids import extract_video_id
+
+
+# Tam çıkarım: tüm video/ses formatları ve oynatıcı imzaları çözülür
+FULL_YDL_OPTS = {
+    'skip_download': True,
+    'quiet': True,
+    'no_warnings': True
+}
+
+# Yalnızca altyazı tabloları için hafif çıkarım: oynatıcı JS'i indirilip
+# imzalar çözülmez, DASH/HLS manifestoları ve çeviri altyazıları atlanır
+CAPTIONS_ONLY_YDL_OPTS = {
+    'skip_download': True,
+    'quiet': True,
+    'no_warnings': True,
+    'extractor_args': {
+        'youtube': {
+            'player_skip': ['js'],
+            'skip': ['dash', 'hls', 'translated_subs'],
+        },
+    },
+}
+
+
+def extract_caption_tracks(video_id, metadata_cache=default_metadata_cache, metrics=None,
+                           captions_only=True, negative_cache=None, rate_limiter=None):
+    """
+    Videonun manuel ve otomatik altyazı tablolarını çeker
+
+    Aynı video için tekrar eden yt_dlp çıkarımlarını önlemek amacıyla sonuç
+    önbellekte tutulur. Hatalar yakalanmaz, çağırana iletilir.
+
+    `captions_only` açıkken çıkarım hafif modda yapılır ve yt_dlp'nin format
+    seçimi/işleme adımı (`process=False`) atlanır; altyazı tabloları tam
+    çıkarımdakiyle aynı biçimde döndürülür.
+
+    `negative_cache` verilirse altyazısı olmayan veya sınıflandırılabilen bir
+    hata veren videolar kaydedilir; kaydı geçerli olan videolar için yt_dlp
+    hiç çağrılmaz. Hız sınırı ve tanınmayan hatalar kaydedilmez.
+    `rate_limiter` verilirse her çıkarım bir yuva ve jeton bekler; hız sınırı
+    ve bot kontrolü hataları sınırlayıcıya bildirilir ve `ThrottledError`
+    olarak yükseltilir.
+
+    Args:
+        video_id (str): Video ID'si
+        metadata_cache (MetadataCache): Kullanılacak önbellek; None ise önbelleksiz çalışır
+        metrics (MetricsCollector): Ölçüm nesnesi; None ise ölçüm yapılmaz
+        captions_only (bool): True ise yalnızca altyazı tablolarına yönelik hafif çıkarım yapılır
+        negative_cache (NegativeCache): Olumsuz sonuç önbelleği; None ise kullanılmaz
+        rate_limiter (RateLimiter): Çıkarım istekleri için sınırlayıcı; None ise sınırlama yapılmaz
+
+    Returns:
+        tuple: (subtitles, automatic_captions) sözlükleri
+
+    Raises:
+        CachedFailureError: Video için önbellekte geçerli bir hata kaydı varsa
+        ThrottledError: YouTube isteği hız sınırı veya bot kontrolüyle reddettiyse
+    """
+    if metadata_cache is not None:
+        tracks = metadata_cache.get(video_id)
+        if metrics is not None:
+            if tracks is not None:
+                metrics.cache_hit('metadata')
+            else:
+                metrics.cache_miss('metadata')
+        if tracks is not None:
+            return tracks
+
+    if negative_cache is not None:
+        negative = negative_cache.get(video_id)
+        if metrics is not None:
+            if negative is not None:
+                metrics.cache_hit('negative')
+            else:
+                metrics.cache_miss('negative')
+        if negative is not None:
+            if negative.outcome == NO_CAPTIONS:
+                return {}, {}
+            raise CachedFailureError(negative)
+
+    video_url = f"https://www.youtube.com/watch?v={video_id}"
+    ydl_opts = CAPTIONS_ONLY_YDL_OPTS if captions_only else FULL_YDL_OPTS
+    process = not captions_only
+
+    # Her iş parçacığı bu seçenekler için kendi uzun ömürlü YoutubeDL örneğini kullanır
+    ydl = default_ydl_pool.get(ydl_opts)
+    slot = rate_limiter.acquire() if rate_limiter is not None else None
+    start = time.perf_counter() if metrics is not None else 0.0
+    try:
+        info = ydl.extract_info(video_url, download=False, process=process)
+    except Exception as e:
+        throttled = is_throttle_error(e)
+        if rate_limiter is not None:
+            rate_limiter.release(slot, THROTTLED if throttled else FAILED)
+        # Hız sınırı videoya değil isteğe bağlıdır; geri çekilme sınırlayıcıya bırakılır
+        if negative_cache is not None and not throttled:
+            negative_cache.record_error(video_id, e)
+        error = ThrottledError(str(e)) if throttled and not isinstance(e, ThrottledError) else e
+        if metrics is not None:
+            metrics.failure('extract', error)
+        if error is e:
+            raise
+        raise error from e
+    if rate_limiter is not None:
+        rate_limiter.release(slot, OK)
+    if metrics is not None:
+        metrics.observe_phase('extract', time.perf_counter() - start)
+
+    subtitles = info.get('subtitles') or {}
+    automatic_captions = info.get('automatic_captions') or {}
+    if not process:
+        _normalize_tracks(subtitles)
+        _normalize_tracks(automatic_captions)
+
+    if negative_cache is not None and not subtitles and not automatic_captions:
+        negative_cache.put(video_id, NO_CAPTIONS, "Videoda altyazı bulunmuyor")
+
+    if metadata_cache is not None:
+        metadata_cache.put(video_id, subtitles, automatic_captions)
+    return subtitles, automatic_captions
+
+
+def _normalize_tracks(tracks):
+    """
+    İşlenmemiş çıkarım sonucundaki altyazı formatlarını yt_dlp'nin işleme
+    adımındaki gibi tamamlar (URL düzeltme ve eksik `ext` alanı)
+
+    Args:
+        tracks (dict): {dil_kodu: [format, ...]} sözlüğü; yerinde güncellenir
+    """
+    from yt_dlp.utils import determine_ext, sanitize_url
+
+    for formats in tracks.values():
+        for track in formats:
+            if track.get('url'):
+                track['url'] = sanitize_url(track['url'])
+            if track.get('ext') is None and track.get('url'):
+                track['ext'] = determine_ext(track['url']).lower()
+
+
+def build_language_map(subtitles, automatic_captions):
+    """
+    Altyazı tablolarından {dil_kodu: dil_adı} sözlüğü oluşturur
+    
+    Args:
+        subtitles (dict): Manuel altyazı tablosu
+        automatic_captions (dict): Otomatik altyazı tablosu
+        
+    Returns:
+        dict: Örnek: {'en': 'English', 'tr': 'Turkish (Oto)'}
+    """
+    all_langs = {}
+    
+    # Manuel altyazıları ekle
+    for lang_code, lang_list in subtitles.items():
+        all_langs[lang_code] = lang_list[0]['name']
+    
+    # Otomatik altyazıları ekle (duplicates olmamak şartıyla)
+    for lang_code, lang_list in automatic_captions.items():
+        if lang_code not in all_langs:
+            all_langs[lang_code] = f"{lang_list[0]['name']} (Oto)"
+    
+    return all_langs
+
+
+def select_caption_track(subtitles, automatic_captions, language_code, formats=DEFAULT_FORMAT_PREFERENCE):
+    """
+    Dil için altyazı izini seçer (önce manuel, sonra otomatik)
+
+    Her tür içinde biçimler `formats` sırasıyla denenir; ayrıştırıcısı
+    kayıtlı olmayan biçimler atlanır.
+
+    Args:
+        subtitles (dict): Manuel altyazı tablosu
+        automatic_captions (dict): Otomatik altyazı tablosu
+        language_code (str): Dil kodu
+        formats (tuple): Tercih sırasına göre biçim uzantıları
+
+    Returns:
+        tuple: (url, is_auto, ext) veya (None, None, None) (bu dilde altyazı yoksa)
+    """
+    for tracks, is_auto in ((subtitles, False), (automatic_captions, True)):
+        available = {}
+        for sub in tracks.get(language_code, []):
+            ext = sub.get('ext')
+            if sub.get('url') and ext not in available:
+                available[ext] = sub['url']
+
+        for ext in formats:
+            if ext in available and get_parser(ext) is not None:
+                return available[ext], is_auto, ext
+
+    return None, None, None
+
+
+def iter_completed(executor, func, items, max_pending):
+    """
+    Her öğe için `func`'ı havuzda çalıştırır ve sonuçları tamamlanma sırasına göre üretir
+
+    Girdi ayrı bir besleyici iş parçacığında okunur; böylece girdi yavaş
+    geldiğinde (örn. boru hattından okunan stdin) biten sonuçlar yeni öğe
+    beklenmeden hemen üretilir. Aynı anda en fazla `max_pending` iş bekletilir.
+    Girdinin okunması sırasında oluşan hata çağırana iletilir.
+
+    Args:
+        executor (Executor): İşlerin gönderileceği havuz
+        func (callable): Tek argümanlı iş fonksiyonu
+        items (iterable): İşlenecek öğeler
+        max_pending (int): Aynı anda bekletilecek en fazla iş sayısı
+
+    Yields:
+        object: `func`'ın dönüş değerleri, tamamlanma sırasına göre
+    """
+    finished = queue.Queue()
+    slots = threading.Semaphore(max_pending)
+    stop = threading.Event()
+    state = {'submitted': 0, 'error': None}
+
+    def feed():
+        try:
+            for item in items:
+                while not slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                future = executor.submit(func, item)
+                state['submitted'] += 1
+                future.add_done_callback(finished.put)
+        except BaseException as e:
+            state['error'] = e
+        finally:
+            # Girdinin bittiğini bildirir; bu noktadan sonra `submitted` değişmez
+            finished.put(None)
+
+    # Girdi (örn. stdin) süresiz bloklayabileceğinden besleyici çıkışı bekletmez
+    threading.Thread(target=feed, name='iter-completed-feeder', daemon=True).start()
+    yielded = 0
+    total = None
+    try:
+        while total is None or yielded < total:
+            future = finished.get()
+            if future is None:
+                if state['error'] is not None:
+                    raise state['error']
+                total = state['submitted']
+                continue
+            yielded += 1
+            slots.release()
+            yield future.result()
+    finally:
+        stop.set()
+
+
+class SubtitleResult:
+    """
+    Toplu veya çoklu dil çekiminde tek bir video/dil çiftinin sonucu.
+    
+    Başarılı sonuçlarda `text`, `language_code` ve `is_auto` dolu, `error`
+    None olur; başarısız sonuçlarda `error` yakalanan istisnayı taşır.
+    """
+    
+    __slots__ = ('url', 'video_id', 'language_code', 'text', 'error', 'is_auto')
+    
+    def __init__(self, url, video_id, language_code, text=None, error=None, is_auto=None):
+        self.url = url
+        self.video_id = video_id
+        self.language_code = language_code
+        self.text = text
+        self.error = error
+        self.is_auto = is_auto
+    
+    @property
+    def ok(self):
+        """Sonuç başarılıysa True döner."""
+        return self.error is None
+    
+    def __repr__(self):
+        status = 'ok' if self.ok else f"error={self.error!r}"
+        return f"SubtitleResult({self.video_id!r}, {self.language_code!r}, {status})"
+
 
 class YouTubeSubtitleFetcher:
     """
@@ -11,13 +301,43 @@ class YouTubeSubtitleFetcher:
     - YouTube URL'sinden video ID'sini çıkarır
     - Mevcut altyazı dillerini listeler
     - Belirtilen dildeki altyazı metnini çeker
+    - Birden fazla videonun altyazısını paralel çeker (`fetch_batch`)
     """
     
-    def __init__(self):
-        """Modül başlatılırken gerekli değişkenleri hazırlar"""
+    def __init__(self, metadata_cache=default_metadata_cache, disk_cache=None,
+                 dedupe_auto_captions=True, http_client=default_http_client, metrics=None,
+                 captions_only=True, formats=DEFAULT_FORMAT_PREFERENCE, negative_cache=None,
+                 rate_limiter=None):
+        """
+        Modül başlatılırken gerekli değişkenleri hazırlar
+
+        Args:
+            metadata_cache (MetadataCache): Altyazı tablosu önbelleği; None ise önbellek kullanılmaz
+            disk_cache (SubtitleDiskCache): Kalıcı altyazı önbelleği; verilirse altyazılar
+                                            önce buradan okunur (read-through)
+            dedupe_auto_captions (bool): Otomatik altyazılardaki kayan tekrarları ayıklar
+            http_client (HttpClient): VTT indirmeleri için paylaşılan, yeniden denemeli HTTP istemcisi
+            metrics (MetricsCollector): Aşama süreleri, önbellek ve hata ölçümleri; None ise kapalı
+            captions_only (bool): Altyazı tabloları hafif çıkarımla alınır; False ise tam çıkarım yapılır
+            formats (tuple): Tercih sırasına göre altyazı biçimleri (örn. ('json3', 'srv3', 'vtt'));
+                             varsayılan ('vtt',)
+            negative_cache (NegativeCache): Altyazısı olmayan / hata veren videoların önbelleği;
+                                            kaydı geçerli videolar yeniden çıkarılmaz
+            rate_limiter (RateLimiter): yt_dlp çıkarımları için hız ve eşzamanlılık sınırlayıcısı;
+                                        indirmeler `http_client`'ın kendi sınırlayıcısıyla sınırlanır
+        """
         self.video_url = None
         self.video_id = None
         self.available_languages = {}
+        self.metadata_cache = metadata_cache
+        self.disk_cache = disk_cache
+        self.dedupe_auto_captions = dedupe_auto_captions
+        self.http_client = http_client
+        self.metrics = metrics
+        self.captions_only = captions_only
+        self.formats = tuple(formats)
+        self.negative_cache = negative_cache
+        self.rate_limiter = rate_limiter
     
     def set_video_url(self, url):
         """
@@ -30,170 +350,608 @@ class YouTubeSubtitleFetcher:
             bool: URL geçerliyse True, değilse False
         """
         self.video_url = url
-        self.video_id = self._extract_video_id(url)
+        self.video_id = extract_video_id(url)
         return self.video_id is not None
     
-    def _extract_video_id(self, url):
+    def get_available_languages(self):
+        """
+        Videoda mevcut olan altyazı dillerini çeker
+        
+        Returns:
+            dict: {dil_kodu: dil_adı} formatında sözlük
+                  Örnek: {'en': 'English', 'tr': 'Turkish (Oto)'}
+                  Hata durumunda None döner
+        """
+        if not self.video_id:
+            return None
+        
+        try:
+            all_langs = self.list_languages(self.video_id)
+            self.available_languages = all_langs
+            return all_langs
+                
+        except Exception as e:
+            print(f"Hata: {str(e)}")
+            return None
+    
+    def list_languages(self, video_id):
         """
-        URL'den video ID'sini çıkarır
+        Verilen videonun altyazı dillerini listeler; nesnenin durumunu değiştirmez
+        
+        Altyazı tabloları nesnenin önbellekleri, ölçümleri ve hız sınırlayıcısı
+        üzerinden çıkarılır. `get_available_languages`'ın aksine hatalar
+        yakalanmaz, çağırana iletilir.
         
         Args:
-            url (str): YouTube video URL'si
+            video_id (str): Video ID'si
             
         Returns:
-            str: Video ID'si veya None (geçersiz URL ise)
+            dict: {dil_kodu: dil_adı} formatında sözlük
+        """
+        subtitles, auto_subtitles = extract_caption_tracks(
+            video_id, self.metadata_cache, self.metrics, self.captions_only, self.negative_cache,
+            self.rate_limiter)
+        return build_language_map(subtitles, auto_subtitles)
+    
+    def get_subtitle_text(self, language_code):
         """
-        parsed_url = urlparse(url)
+        Belirtilen dildeki altyazı metnini çeker
         
-        # Standart YouTube URL formatı: https://www.youtube.com/watch?v=VIDEO_ID
-        if parsed_url.netloc in ['www.youtube.com', 'youtube.com'] and parsed_url.path == '/watch':
-            query_params = parse_qs(parsed_url.query)
-            return query_params.get('v', [None])[0]
+        Args:
+            language_code (str): Dil kodu (örn: 'en', 'tr')
+            
+        Returns:
+            str: Altyazı metni veya None (hata durumunda)
+        """
+        if not self.video_id or not language_code:
+            return None
         
-        # Kısa URL formatı: https://youtu.be/VIDEO_ID
-        elif parsed_url.netloc == 'youtu.be':
-            return parsed_url.path[1:]
+        try:
+            return self.fetch_subtitle(self.video_id, language_code)
             
-        return None
+        except Exception as e:
+            print(f"Hata: {str(e)}")
+            return None
     
-    def get_available_languages(self):
+    def get_subtitle_texts(self, language_codes=None, max_workers=8):
         """
-        Videoda mevcut olan altyazı dillerini çeker
+        Birden fazla dildeki altyazıyı tek çıkarımla ve paralel indirmeyle çeker
         
+        Args:
+            language_codes (list): Dil kodları; None ise tüm manuel altyazılar
+            max_workers (int): Aynı anda yapılacak en fazla indirme sayısı
+            
         Returns:
-            dict: {dil_kodu: dil_adı} formatında sözlük
-                  Örnek: {'en': 'English', 'tr': 'Turkish (Oto)'}
-                  Hata durumunda None döner
+            dict: {dil_kodu: SubtitleResult} veya None (çıkarım hatasında)
         """
         if not self.video_id:
             return None
         
         try:
-            video_url = f"https://www.youtube.com/watch?v={self.video_id}"
-            ydl_opts = {
-                'skip_download': True,
-                'quiet': True,
-                'no_warnings': True
-            }
+            return self.fetch_subtitles(self.video_id, language_codes, max_workers)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                subtitles = info.get('subtitles', {})
-                auto_subtitles = info.get('automatic_captions', {})
-                all_langs = {}
-                
-                # Manuel altyazıları ekle
-                for lang_code, lang_list in subtitles.items():
-                    all_langs[lang_code] = lang_list[0]['name']
-                
-                # Otomatik altyazıları ekle (duplicates olmamak şartıyla)
-                for lang_code, lang_list in auto_subtitles.items():
-                    if lang_code not in all_langs:
-                        all_langs[lang_code] = f"{lang_list[0]['name']} (Oto)"
-                
-                self.available_languages = all_langs
-                return all_langs
-                
         except Exception as e:
             print(f"Hata: {str(e)}")
             return None
     
-    def get_subtitle_text(self, language_code):
+    def get_subtitle_cues(self, language_code):
         """
-        Belirtilen dildeki altyazı metnini çeker
+        Belirtilen dildeki altyazıyı zaman damgalı ipuçları olarak çeker
         
         Args:
             language_code (str): Dil kodu (örn: 'en', 'tr')
             
         Returns:
-            str: Altyazı metni veya None (hata durumunda)
+            CueList: İpuçları veya None (hata durumunda);
+                     `between(başlangıç, bitiş)` ile zaman aralığı sorgulanabilir
         """
         if not self.video_id or not language_code:
             return None
         
         try:
-            video_url = f"https://www.youtube.com/watch?v={self.video_id}"
-            ydl_opts = {
-                'writesubtitles': True,
-                'subtitleslangs': [language_code],
-                'skip_download': True,
-                'quiet': True,
-                'no_warnings': True
-            }
+            return self.fetch_subtitle_cues(self.video_id, language_code)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                manual_subtitles = info.get('subtitles', {}).get(language_code, [])
-                auto_subtitles = info.get('automatic_captions', {}).get(language_code, [])
-                subtitle_url = None
-                
-                # Önce manuel altyazıları dene
-                for sub in manual_subtitles:
-                    if sub.get('ext') == 'vtt':
-                        subtitle_url = sub['url']
-                        break
-                
-                # Manuel altyazı yoksa otomatik altyazıları dene
-                if not subtitle_url:
-                    for sub in auto_subtitles:
-                        if sub.get('ext') == 'vtt':
-                            subtitle_url = sub['url']
-                            break
-                
-                if subtitle_url:
-                    response = requests.get(subtitle_url, timeout=10)
-                    if response.status_code == 200:
-                        return self._convert_vtt_to_text(response.text)
-                
-                return None
-                
         except Exception as e:
             print(f"Hata: {str(e)}")
             return None
     
-    def _convert_vtt_to_text(self, vtt_content):
+    def iter_subtitle_text(self, language_code):
         """
-        VTT formatındaki altyazıyı temiz metne dönüştürür
+        Belirtilen dildeki altyazıyı indirirken satır satır üretir
+        
+        Altyazının tamamı hiçbir zaman bellekte tutulmaz; bellek kullanımı
+        altyazı uzunluğundan bağımsızdır. İndirme sırasında oluşan ağ hataları
+        yineleme (iteration) sırasında yükseltilir. Satır bazlı ayrıştırma
+        yalnızca VTT ile yapılabildiğinden `formats` yok sayılır; nesne başka
+        bir biçimi tercih edecek şekilde kurulduysa metin `get_subtitle_text`
+        sonucundan farklı olabilir.
         
         Args:
-            vtt_content (str): VTT formatındaki altyazı içeriği
+            language_code (str): Dil kodu (örn: 'en', 'tr')
+            
+        Returns:
+            iterator: Metin satırları üreteci veya None (hata durumunda)
+        """
+        if not self.video_id or not language_code:
+            return None
+        
+        try:
+            return self.stream_subtitle(self.video_id, language_code)
+            
+        except Exception as e:
+            print(f"Hata: {str(e)}")
+            return None
+    
+    def write_subtitle_text(self, language_code, file_obj):
+        """
+        Belirtilen dildeki altyazıyı indirirken doğrudan dosyaya yazar
+        
+        Args:
+            language_code (str): Dil kodu (örn: 'en', 'tr')
+            file_obj: `write` metodu olan metin dosyası nesnesi
+            
+        Returns:
+            bool: Altyazı yazıldıysa True, bulunamadıysa veya hata oluştuysa False
+        """
+        if not self.video_id or not language_code:
+            return False
+        
+        try:
+            lines = self.stream_subtitle(self.video_id, language_code)
+            if lines is None:
+                return False
+            
+            for count, line in enumerate(lines):
+                if count:
+                    file_obj.write('\n')
+                file_obj.write(line)
+            return True
+            
+        except Exception as e:
+            print(f"Hata: {str(e)}")
+            return False
+    
+    def fetch_batch(self, urls, language_codes, max_workers=8, executor=None):
+        """
+        Birden fazla videonun altyazısını iş parçacığı havuzunda paralel çeker
+        
+        Her iş yalnızca kendi video ID'si ile çalışır; nesnenin `video_id`
+        durumu değiştirilmez. Girdi akış olarak okunur ve aynı anda en fazla
+        `max_workers * 2` iş bekletilir. Biten sonuçlar, girdinin sonraki
+        öğesi beklenmeden hemen üretilir.
+        
+        Art arda çok sayıda küçük grup çeken çağıranlar kendi havuzlarını
+        `executor` ile verebilir; böylece her grupta yeni iş parçacıkları ve
+        bunlara ait YoutubeDL örnekleri oluşturulmaz.
+        
+        Args:
+            urls (iterable): YouTube URL'leri veya video ID'leri
+            language_codes (list): Tercih sırasına göre dil kodları (örn: ['tr', 'en'])
+            max_workers (int): Havuzdaki iş parçacığı sayısı
+            executor (ThreadPoolExecutor): Kullanılacak havuz; None ise geçici bir havuz
+                                           açılır. Verilen havuz kapatılmaz.
+            
+        Yields:
+            SubtitleResult: Tamamlanma sırasına göre her videonun sonucu
+        """
+        if isinstance(language_codes, str):
+            language_codes = [language_codes]
+        language_codes = list(language_codes)
+        
+        def fetch(url):
+            return self._fetch_batch_item(url, language_codes)
+        
+        if executor is not None:
+            yield from iter_completed(executor, fetch, urls, max_workers * 2)
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            yield from iter_completed(executor, fetch, urls, max_workers * 2)
+    
+    def _fetch_batch_item(self, url, language_codes):
+        """
+        Toplu çekimdeki tek bir videoyu işler; hatalar sonuç nesnesine yazılır
+        
+        Args:
+            url (str): YouTube URL'si veya video ID'si
+            language_codes (list): Tercih sırasına göre dil kodları
+            
+        Returns:
+            SubtitleResult: İşlem sonucu
+        """
+        video_id = extract_video_id(url)
+        if not video_id:
+            return SubtitleResult(url, None, None, error=ValueError(f"Geçersiz YouTube URL'si: {url}"))
+        
+        try:
+            for language_code in language_codes:
+                text, is_auto = self._fetch_text(video_id, language_code)
+                if text is not None:
+                    return SubtitleResult(url, video_id, language_code, text=text, is_auto=is_auto)
+            
+            raise LookupError(f"İstenen dillerde altyazı bulunamadı: {', '.join(language_codes)}")
+            
+        except Exception as e:
+            return SubtitleResult(url, video_id, None, error=e)
+    
+    def fetch_subtitle(self, video_id, language_code):
+        """
+        Verilen videonun altyazısını çeker; nesnenin durumunu değiştirmez
+        
+        Kalıcı önbellek tanımlıysa önce oraya bakılır, bulunamazsa altyazı
+        indirilip önbelleğe yazılır. `get_subtitle_text`'in aksine hatalar
+        yakalanmaz, çağırana iletilir.
+        
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu (örn: 'en', 'tr')
+            
+        Returns:
+            str: Altyazı metni veya None (bu dilde altyazı yoksa)
+        """
+        cached = self.read_disk_cache(video_id, language_code)
+        if cached is not None:
+            return cached.text
+        
+        _, text = self._download_subtitle(video_id, language_code)
+        return text
+    
+    def _fetch_text(self, video_id, language_code):
+        """
+        `fetch_subtitle` gibi çalışır, ayrıca altyazının türünü döndürür
+        
+        Returns:
+            tuple: (metin, is_auto) veya (None, None) (bu dilde altyazı yoksa)
+        """
+        cached = self.read_disk_cache(video_id, language_code)
+        if cached is not None:
+            return cached.text, cached.is_auto
+        
+        cues, text = self._download_subtitle(video_id, language_code)
+        return text, (cues.is_auto if cues is not None else None)
+    
+    def fetch_subtitles(self, video_id, language_codes=None, max_workers=8):
+        """
+        Verilen videonun birden fazla dildeki altyazısını çeker
+        
+        Her dil önce kalıcı önbellekte aranır. Yalnızca önbellekte olmayan
+        diller için altyazı tabloları bir kez çıkarılır, her dil için önce
+        manuel sonra otomatik iz `formats` tercih sırasıyla seçilir ve gövdeler
+        paralel indirilir.
+        Tüm diller önbellekteyse çıkarım yapılmaz. Dil bazındaki hatalar sonuç
+        nesnelerine yazılır; yalnızca çıkarım hatası yükseltilir.
+        
+        Args:
+            video_id (str): Video ID'si
+            language_codes (list): Dil kodları; None ise tüm manuel altyazılar
+            max_workers (int): Aynı anda yapılacak en fazla indirme sayısı
+            
+        Returns:
+            dict: İstek sırasıyla {dil_kodu: SubtitleResult}
+        """
+        tables = None
+        if language_codes is None:
+            tables = extract_caption_tracks(
+                video_id, self.metadata_cache, self.metrics, self.captions_only, self.negative_cache,
+                self.rate_limiter)
+            language_codes = list(tables[0])
+        elif isinstance(language_codes, str):
+            language_codes = [language_codes]
+        # Tekrar eden kodları sırayı koruyarak ayıkla
+        language_codes = list(dict.fromkeys(language_codes))
+        
+        results = {}
+        missing = []
+        for language_code in language_codes:
+            cached = self.read_disk_cache(video_id, language_code)
+            if cached is not None:
+                results[language_code] = SubtitleResult(video_id, video_id, language_code,
+                                                        text=cached.text, is_auto=cached.is_auto)
+            else:
+                results[language_code] = None
+                missing.append(language_code)
+        if not missing:
+            return results
+        
+        if tables is None:
+            tables = extract_caption_tracks(
+                video_id, self.metadata_cache, self.metrics, self.captions_only, self.negative_cache,
+                self.rate_limiter)
+        subtitles, automatic_captions = tables
+        
+        tracks = {}
+        for language_code in missing:
+            track = select_caption_track(subtitles, automatic_captions, language_code, self.formats)
+            if track[0]:
+                tracks[language_code] = track
+            results[language_code] = SubtitleResult(
+                video_id, video_id, language_code,
+                error=LookupError(f"'{language_code}' dilinde altyazı bulunamadı"))
+        
+        if tracks:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tracks)))) as executor:
+                futures = {
+                    executor.submit(self._fetch_track_item, video_id, language_code, *track): language_code
+                    for language_code, track in tracks.items()
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        return results
+    
+    def _fetch_track_item(self, video_id, language_code, subtitle_url, is_auto, ext):
+        """
+        Çoklu dil çekimindeki tek bir izi indirir; hatalar sonuç nesnesine yazılır
+        
+        Returns:
+            SubtitleResult: İşlem sonucu
+        """
+        try:
+            _, text = self._download_track(video_id, language_code, subtitle_url, is_auto, ext)
+            return SubtitleResult(video_id, video_id, language_code, text=text, is_auto=is_auto)
+        
+        except Exception as e:
+            return SubtitleResult(video_id, video_id, language_code, error=e)
+    
+    def fetch_subtitle_cues(self, video_id, language_code):
+        """
+        Verilen videonun altyazısını zaman damgalı ipuçları olarak çeker
+        
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu (örn: 'en', 'tr')
+            
+        Returns:
+            CueList: İpuçları veya None (bu dilde altyazı yoksa)
+        """
+        cached = self.read_disk_cache(video_id, language_code)
+        if cached is not None:
+            return parse_captions(cached.vtt, cached.ext, is_auto=cached.is_auto)
+        
+        cues, _ = self._download_subtitle(video_id, language_code)
+        return cues
+    
+    def format_cues(self, cues):
+        """
+        İpuçlarını altyazı türüne uygun tekrar ayıklama ile düz metne çevirir
+        
+        Args:
+            cues (CueList): Altyazı ipuçları
             
         Returns:
             str: Temizlenmiş metin
         """
-        lines = vtt_content.split('\n')
-        text_lines = []
-        previous_line = None
+        return cues.to_text(rolling=self._use_rolling(cues.rolling))
+    
+    def iter_timed_lines(self, cues):
+        """
+        `format_cues` ile aynı satırları, ait oldukları ipucunun başlangıç zamanıyla üretir
         
-        for line in lines:
-            # Z damgaları ve boş satırları atla
-            if '-->' in line or line.strip() == '' or line.startswith('WEBVTT'):
-                continue
+        Args:
+            cues (CueList): Altyazı ipuçları
+            
+        Yields:
+            tuple: (başlangıç saniyesi, metin satırı)
+        """
+        return iter_timed_text(cues, rolling=self._use_rolling(cues.rolling))
+    
+    def read_disk_cache(self, video_id, language_code):
+        """
+        Kalıcı önbellekteki kaydı okur ve isabet/ıskalama ölçümünü kaydeder
+        
+        Önbellek tanımlı değilse None döner. Ağ erişimi yapmaz; bu yüzden
+        asenkron sürüm de önbellek okumalarında bu metodu kullanır. Önbellekteki
+        metin her zaman varsayılan tekrar ayıklamayla yazılır; nesne kayan
+        tekrarları ayıklamayacak şekilde kurulduysa otomatik altyazıların metni
+        ham içerikten yeniden üretilir.
+        
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
             
-            # HTML etiketlerini temizle
-            line = re.sub(r'<.*?>', '', line)
-            line = line.strip()
+        Returns:
+            CachedSubtitle: Kayıt (önce manuel, yoksa otomatik) veya None
+        """
+        if self.disk_cache is None:
+            return None
+        
+        cached = self.disk_cache.get(video_id, language_code)
+        if self.metrics is not None:
+            if cached is not None:
+                self.metrics.cache_hit('disk')
+            else:
+                self.metrics.cache_miss('disk')
+        if cached is not None and cached.is_auto and not self.dedupe_auto_captions:
+            cues = parse_captions(cached.vtt, cached.ext, is_auto=True)
+            if cues.rolling:
+                cached.text = self.format_cues(cues)
+        return cached
+    
+    def write_disk_cache(self, video_id, language_code, cues, raw, text, ext='vtt'):
+        """
+        İndirilen altyazıyı kalıcı önbelleğe yazar; önbellek tanımlı değilse bir şey yapmaz
+        
+        Önbellek, ayarları farklı nesneler (ve asenkron sürüm) arasında
+        paylaşılabildiği için metin her zaman varsayılan tekrar ayıklamayla
+        yazılır; `text` bundan farklıysa ipuçlarından yeniden üretilir.
+        
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+            cues (CueList): Ham içerikten ayrıştırılan ipuçları
+            raw (str): Ham altyazı içeriği
+            text (str): `format_cues` ile üretilen metin
+            ext (str): Ham içeriğin biçimi
+        """
+        if self.disk_cache is None:
+            return
+        
+        if cues.rolling and not self.dedupe_auto_captions:
+            text = cues.to_text(rolling=True)
+        self.disk_cache.put(video_id, language_code, cues.is_auto, raw, text, ext)
+    
+    def find_subtitle_track(self, video_id, language_code, formats=None):
+        """
+        Dil için altyazı izini bulur (önce manuel, sonra otomatik)
+        
+        Altyazı tabloları nesnenin önbellekleri, ölçümleri ve hız sınırlayıcısı
+        üzerinden çıkarılır; her tür içinde biçimler `formats` sırasıyla denenir.
+        Bloklayan bir çağrıdır.
+        
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+            formats (tuple): Biçim tercihi; None ise nesnenin tercihi kullanılır
             
-            # Ardışık tekrar eden satırları engelle
-            if line and line != previous_line:
-                text_lines.append(line)
-                previous_line = line
-                
-        return '\n'.join(text_lines)
-
+        Returns:
+            tuple: (url, is_auto, ext) veya (None, None, None) (bu dilde altyazı yoksa)
+        """
+        subtitles, automatic_captions = extract_caption_tracks(
+            video_id, self.metadata_cache, self.metrics, self.captions_only, self.negative_cache,
+            self.rate_limiter)
+        return select_caption_track(subtitles, automatic_captions, language_code, formats or self.formats)
+    
+    def _download_subtitle(self, video_id, language_code):
+        """
+        Altyazıyı indirir, ipuçlarına ayrıştırır ve kalıcı önbelleğe yazar
+        
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+            
+        Returns:
+            tuple: (CueList, metin) veya (None, None) (bu dilde altyazı yoksa)
+        """
+        subtitle_url, is_auto, ext = self.find_subtitle_track(video_id, language_code)
+        if not subtitle_url:
+            return None, None
+        return self._download_track(video_id, language_code, subtitle_url, is_auto, ext)
+    
+    def _download_track(self, video_id, language_code, subtitle_url, is_auto, ext='vtt'):
+        """
+        URL'si bilinen altyazıyı indirir, ipuçlarına ayrıştırır ve kalıcı önbelleğe yazar
+        
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+            subtitle_url (str): Altyazı adresi
+            is_auto (bool): Otomatik altyazı ise True
+            ext (str): Altyazı biçimi
+            
+        Returns:
+            tuple: (CueList, metin)
+        """
+        metrics = self.metrics
+        start = time.perf_counter() if metrics is not None else 0.0
+        try:
+            response = self.http_client.get(subtitle_url)
+            raise_for_status(response)
+        except Exception as e:
+            if metrics is not None:
+                metrics.failure('download', e)
+            raise
+        
+        if metrics is not None:
+            metrics.observe_phase('download', time.perf_counter() - start)
+            metrics.add_bytes(len(response.content))
+            start = time.perf_counter()
+        
+        cues = parse_captions(response.text, ext, is_auto=is_auto)
+        text = self.format_cues(cues)
+        
+        if metrics is not None:
+            metrics.observe_phase('convert', time.perf_counter() - start)
+        
+        self.write_disk_cache(video_id, language_code, cues, response.text, text, ext)
+        return cues, text
+    
+    def stream_subtitle(self, video_id, language_code):
+        """
+        Verilen videonun altyazısını akış olarak indirip satır satır çevirir
+        
+        VTT gövdesi `iter_lines` ile okunur ve temizlenen satırlar hemen
+        üretilir. Kalıcı önbellekteki kayıtlar okunur, ancak akış modunda
+        indirilen altyazılar önbelleğe yazılmaz. Akış her zaman VTT izini
+        kullanır ve `formats` tercihini yok sayar; nesne başka bir biçimi
+        tercih edecek şekilde kurulduysa metin `fetch_subtitle` ve
+        `fetch_batch` sonucundan farklı olabilir.
+        
+        Args:
+            video_id (str): Video ID'si
+            language_code (str): Dil kodu
+            
+        Returns:
+            iterator: Metin satırları üreteci veya None (bu dilde altyazı yoksa)
+        """
+        cached = self.read_disk_cache(video_id, language_code)
+        if cached is not None:
+            return iter(cached.text.splitlines())
+        
+        # Satır satır ayrıştırma yalnızca VTT için yapılabilir
+        subtitle_url, is_auto, _ = self.find_subtitle_track(video_id, language_code, formats=('vtt',))
+        if not subtitle_url:
+            return None
+        
+        try:
+            response = self.http_client.get(subtitle_url, stream=True)
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.failure('download', e)
+            raise
+        
+        try:
+            raise_for_status(response)
+        except Exception as e:
+            response.close()
+            if self.metrics is not None:
+                self.metrics.failure('download', e)
+            raise
+        
+        if response.encoding is None:
+            response.encoding = 'utf-8'
+        return self._iter_response_text(response, self._use_rolling(is_auto))
+    
+    def _iter_response_text(self, response, rolling):
+        """Akış halindeki HTTP yanıtını temizlenmiş satırlara çevirir ve sonunda kapatır."""
+        try:
+            yield from iter_vtt_text(response.iter_lines(decode_unicode=True), rolling=rolling)
+        finally:
+            response.close()
+    
+    def _use_rolling(self, rolling):
+        """Kayan gösterimli altyazılarda tekrar ayıklamanın kullanılıp kullanılmayacağını döndürür."""
+        return bool(rolling) and self.dedupe_auto_captions
+    
+    def _convert_vtt_to_text(self, vtt_content, rolling=False):
+        """
+        VTT formatındaki altyazıyı temiz metne dönüştürür
+        
+        Args:
+            vtt_content (str): VTT formatındaki altyazı içeriği
+            rolling (bool): True ise otomatik altyazı tekrarları ipucu bazında ayıklanır
+            
+        Returns:
+            str: Temizlenmiş metin
+        """
+        return convert_vtt_to_text(vtt_content, rolling=rolling)
 
 def main():
     """
     Modülün kullanımını gösteren demo fonksiyonu
+
+    Argüman verilirse veya stdin bir terminal değilse `youtubesub` modülünün
+    etkileşimsiz NDJSON moduna geçilir.
     """
+    if len(sys.argv) > 1 or not sys.stdin.isatty():
+        from youtubesub import run_cli
+        sys.exit(run_cli(sys.argv[1:]))
+    
     print("YouTube Altyazı Çekici Demo")
     print("=" * 40)
     
     # Örnek YouTube URL'si (Rick Astley - Never Gonna Give You Up)
     demo_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
     
-    # 1. Modülü başlat
-    fetcher = YouTubeSubtitleFetcher()
+    # 1. Modülü başlat (daha önce çekilen altyazılar diskten okunur)
+    fetcher = YouTubeSubtitleFetcher(disk_cache=SubtitleDiskCache())
     
     # 2. Video URL'sini ayarla
     print(f"Video URL'si: {demo_url}")
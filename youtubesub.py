@@ -1,18 +1,23 @@
+import argparse
+import json
+import os
 import sys
-import re
-from urllib.parse import urlparse, parse_qs
-import yt_dlp
-import requests
+from youtube_subtitle_fetcher import YouTubeSubtitleFetcher
+from subtitle_store import SubtitleDiskCache
+from vtt_parser import convert_vtt_to_text
+from video_ids import extract_video_id
 
 class YouTubeSubtitleModel:
     """
     YouTube videolarından altyazı çekmek için kullanılan model sınıfı.
     Form arayüzü olmadan doğrudan konsoldan çalışır.
     """
-    def __init__(self):
+    def __init__(self, disk_cache=None):
         self.video_url = None
         self.video_id = None
         self.available_languages = {}
+        # Kalıcı önbellek verilirse daha önce çekilen altyazılar diskten okunur
+        self.fetcher = YouTubeSubtitleFetcher(disk_cache=disk_cache)
     
     def set_video_url(self, url):
         """Video URL'sini ayarlar ve video ID'sini çıkarır."""
@@ -22,16 +27,7 @@ class YouTubeSubtitleModel:
     
     def get_video_id_from_url(self, url):
         """URL'den video ID'sini bulur ve döndürür."""
-        parsed_url = urlparse(url)
-        
-        if parsed_url.netloc in ['www.youtube.com', 'youtube.com'] and parsed_url.path == '/watch':
-            query_params = parse_qs(parsed_url.query)
-            return query_params.get('v', [None])[0]
-        
-        elif parsed_url.netloc == 'youtu.be':
-            return parsed_url.path[1:]
-            
-        return None
+        return extract_video_id(url)
     
     def fetch_available_languages(self):
         """Mevcut altyazı dillerini çeker ve sözlük olarak döndürür."""
@@ -39,25 +35,9 @@ class YouTubeSubtitleModel:
             return False
         
         try:
-            video_url = f"https://www.youtube.com/watch?v={self.video_id}"
-            ydl_opts = {'skip_download': True, 'quiet': True, 'no_warnings': True}
+            self.available_languages = self.fetcher.list_languages(self.video_id)
+            return True
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                subtitles = info.get('subtitles', {})
-                auto_subtitles = info.get('automatic_captions', {})
-                all_langs = {}
-                
-                for lang_code, lang_list in subtitles.items():
-                    all_langs[lang_code] = lang_list[0]['name']
-                
-                for lang_code, lang_list in auto_subtitles.items():
-                    if lang_code not in all_langs:
-                        all_langs[lang_code] = lang_list[0]['name'] + " (Oto)"
-                
-                self.available_languages = all_langs
-                return True
-                
         except Exception as e:
             print(f"Altyazı dillerini çekme hatası: {str(e)}")
             return False
@@ -68,58 +48,15 @@ class YouTubeSubtitleModel:
             return None
         
         try:
-            video_url = f"https://www.youtube.com/watch?v={self.video_id}"
-            ydl_opts = {'writesubtitles': True, 'subtitleslangs': [lang_code], 
-                        'skip_download': True, 'quiet': True, 'no_warnings': True}
+            return self.fetcher.fetch_subtitle(self.video_id, lang_code)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                manual_subtitles = info.get('subtitles', {}).get(lang_code, [])
-                auto_subtitles = info.get('automatic_captions', {}).get(lang_code, [])
-                subtitle_url = None
-                
-                # Önce manuel altyazılara bak
-                for sub in manual_subtitles:
-                    if sub.get('ext') == 'vtt':
-                        subtitle_url = sub['url']
-                        break
-                
-                # Manuel altyazı yoksa otomatik altyazılara bak
-                if not subtitle_url:
-                    for sub in auto_subtitles:
-                        if sub.get('ext') == 'vtt':
-                            subtitle_url = sub['url']
-                            break
-                
-                if subtitle_url:
-                    response = requests.get(subtitle_url, timeout=10)
-                    if response.status_code == 200:
-                        return self.convert_vtt_to_text(response.text)
-                
-                return None
-                
         except Exception as e:
             print(f"Altyazı çekme hatası: {str(e)}")
             return None
     
     def convert_vtt_to_text(self, vtt_content):
         """VTT formatını temiz metne dönüştürür ve ardışık tekrarları filtreler."""
-        lines = vtt_content.split('\n')
-        text_lines = []
-        previous_line = None
-        
-        for line in lines:
-            if '-->' in line or line.strip() == '' or line.startswith('WEBVTT'):
-                continue
-            line = re.sub(r'<.*?>', '', line)
-            line = line.strip()
-            
-            # Aynı satır ardışık olarak geliyorsa, eklemiyoruz
-            if line and line != previous_line:
-                text_lines.append(line)
-                previous_line = line
-                
-        return '\n'.join(text_lines)
+        return convert_vtt_to_text(vtt_content)
     
     def list_languages(self):
         """Mevcut dilleri kullanıcıya listeler."""
@@ -134,11 +71,12 @@ class YouTubeSubtitleModel:
         
         return True
 
-def main():
+def interactive_main():
+    """Kullanıcıya sorarak tek bir videonun altyazısını çeken etkileşimli mod."""
     print("YouTube Altyazı Çekici")
     print("=" * 30)
     
-    model = YouTubeSubtitleModel()
+    model = YouTubeSubtitleModel(disk_cache=SubtitleDiskCache())
     
     # Kullanıcıdan video URL'sini al
     while True:
@@ -195,5 +133,173 @@ def main():
     else:
         print("Seçilen dilde altyazı bulunamadı veya çekilemedi.")
 
+def iter_inputs(urls, input_path=None):
+    """
+    Komut satırındaki ve dosyadaki (veya stdin'deki) URL/ID'leri sırayla okur
+
+    Dosya satır satır, akış halinde okunur; boş satırlar ve `#` ile başlayan
+    satırlar atlanır, her satırın yalnızca ilk kelimesi kullanılır.
+
+    Args:
+        urls (list): Komut satırında verilen URL'ler veya video ID'leri
+        input_path (str): Satır başına bir URL/ID içeren dosya; '-' ise stdin, None ise okunmaz
+
+    Yields:
+        str: URL veya video ID'si
+    """
+    yield from urls
+    if input_path is None:
+        return
+
+    stream = sys.stdin if input_path == '-' else open(input_path, encoding='utf-8')
+    try:
+        for line in stream:
+            fields = line.split(None, 1)
+            if fields and not fields[0].startswith('#'):
+                yield fields[0]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def result_record(result, include_text=True):
+    """
+    Toplu çekim sonucunu NDJSON satırına yazılacak sözlüğe çevirir
+
+    Args:
+        result (SubtitleResult): Çekim sonucu
+        include_text (bool): False ise altyazı metni yerine yalnızca uzunluğu yazılır
+
+    Returns:
+        dict: input, video_id ve başarılıysa language, is_auto, text (veya chars);
+              başarısızsa error ve error_type alanları
+    """
+    record = {'input': result.url, 'video_id': result.video_id}
+    if result.ok:
+        record['language'] = result.language_code
+        record['is_auto'] = result.is_auto
+        if include_text:
+            record['text'] = result.text
+        else:
+            record['chars'] = len(result.text)
+    else:
+        record['error'] = str(result.error)
+        record['error_type'] = type(result.error).__name__
+    return record
+
+
+def run_cli(argv=None):
+    """
+    Etkileşimsiz mod: URL'leri çeker ve sonuçları tamamlandıkça NDJSON olarak stdout'a yazar
+
+    Girdi bellekte toplanmadan akış halinde okunur ve aynı anda en fazla
+    `2 * --jobs` video bekletilir; bu nedenle milyonlarca satırlık girdilerde
+    de bellek kullanımı sabit kalır. Her satır yazıldığında çıktı boşaltılır,
+    böylece boru hattındaki sonraki komut sonuçları beklemeden alır.
+    `--expand` verilirse oynatma listesi ve kanal adresleri okunurken
+    videolarına açılır; indirmeler listenin tamamı beklenmeden başlar.
+
+    Args:
+        argv (list): Komut satırı argümanları; None ise `sys.argv[1:]`
+
+    Returns:
+        int: Çıkış kodu; tüm videolar başarılıysa 0, en az biri başarısızsa
+             veya bir liste açılamadıysa 1
+    """
+    parser = argparse.ArgumentParser(
+        description="YouTube altyazılarını etkileşimsiz çeker ve sonuçları NDJSON olarak yazar")
+    parser.add_argument('urls', nargs='*', help="YouTube URL'leri veya video ID'leri")
+    parser.add_argument('-i', '--input', metavar='DOSYA',
+                        help="Satır başına bir URL/ID içeren dosya ('-' ise stdin). "
+                             "URL verilmezse stdin okunur")
+    parser.add_argument('-l', '--languages', default='tr,en',
+                        help="Virgülle ayrılmış, tercih sıralı dil kodları; ilk bulunan dil yazılır")
+    parser.add_argument('-j', '--jobs', type=int, default=8, help="Paralel çekim sayısı")
+    parser.add_argument('--cache', metavar='YOL', help="Kalıcı önbellek dosyası (varsayılan konum yerine)")
+    parser.add_argument('--no-cache', action='store_true', help="Kalıcı önbelleği kullanma")
+    parser.add_argument('--negative-cache', nargs='?', const='', default=None, metavar='YOL',
+                        help="Altyazısı olmayan / hata veren videoları önbelleğe al "
+                             "(yol verilmezse varsayılan konum)")
+    parser.add_argument('--rate', type=float, help="Saniyedeki en fazla çıkarım sayısı")
+    parser.add_argument('--no-text', action='store_true', help="Metin yerine yalnızca karakter sayısını yaz")
+    parser.add_argument('--expand', action='store_true',
+                        help="Oynatma listesi ve kanal adreslerini videolarına aç; "
+                             "açılamayan adresler stderr'e yazılır")
+    args = parser.parse_args(argv)
+
+    language_codes = [code.strip() for code in args.languages.split(',') if code.strip()]
+    if not language_codes:
+        parser.error("en az bir dil kodu gerekli")
+    if args.jobs < 1:
+        parser.error("--jobs en az 1 olmalı")
+
+    input_path = args.input
+    if input_path is None and not args.urls:
+        input_path = '-'
+
+    disk_cache = None if args.no_cache else SubtitleDiskCache(args.cache)
+    negative_cache = None
+    rate_limiter = None
+    if args.negative_cache is not None:
+        from negative_cache import NegativeCache
+        negative_cache = NegativeCache(args.negative_cache or None)
+    if args.rate:
+        from rate_limit import RateLimiter
+        rate_limiter = RateLimiter(rate=args.rate, max_concurrency=args.jobs)
+
+    fetcher = YouTubeSubtitleFetcher(disk_cache=disk_cache, negative_cache=negative_cache,
+                                     rate_limiter=rate_limiter)
+    out = sys.stdout
+    if hasattr(out, 'reconfigure'):
+        out.reconfigure(encoding='utf-8')
+
+    inputs = iter_inputs(args.urls, input_path)
+    expand_errors = []
+    if args.expand:
+        from playlist import expand_urls
+
+        def report_expand_error(url, error):
+            # Besleyici iş parçacığında çağrılır; stdout'taki NDJSON satırlarına karışmasın
+            expand_errors.append(url)
+            print(f"Hata: {url} açılamadı: {error}", file=sys.stderr)
+
+        inputs = expand_urls(inputs, on_error=report_expand_error)
+
+    failed = 0
+    results = fetcher.fetch_batch(inputs, language_codes, args.jobs)
+    try:
+        for result in results:
+            if not result.ok:
+                failed += 1
+            out.write(json.dumps(result_record(result, not args.no_text), ensure_ascii=False) + '\n')
+            out.flush()
+    except BrokenPipeError:
+        # Okuyan taraf kapandı (örn. `| head`); çıkışta stdout'un yeniden boşaltılması hata vermesin
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, out.fileno())
+        return 1
+    finally:
+        # Önbellekler kapanmadan önce havuzdaki işlerin bitmesi beklenir
+        results.close()
+        if disk_cache is not None:
+            disk_cache.close()
+        if negative_cache is not None:
+            negative_cache.close()
+
+    return 1 if failed or expand_errors else 0
+
+
+def main(argv=None):
+    """
+    Argüman verilmezse ve stdin bir terminalse etkileşimli modu, aksi halde etkileşimsiz modu çalıştırır
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv and sys.stdin.isatty():
+        interactive_main()
+        return
+    sys.exit(run_cli(argv))
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()